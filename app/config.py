@@ -2,3 +2,153 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 DATA_FILE = os.path.join(BASE_DIR, "data", "full_articles.csv")
+# Article HTML is stored here, one file per article id, and loaded on demand
+CONTENT_DIR = os.path.join(BASE_DIR, "data", "content")
+# Compress stored article content with zlib
+COMPRESS_CONTENT = True
+
+# Delay after the last edit before the article list is autosaved, so bursts of edits become one write
+AUTOSAVE_DELAY_MS = 2000
+
+# Per-stage timing metrics (set NEWS_METRICS=0 to disable)
+METRICS_ENABLED = os.getenv("NEWS_METRICS", "1") != "0"
+METRICS_DIR = os.path.join(BASE_DIR, "data", "metrics")
+# Days of daily metrics logs kept on disk
+METRICS_RETENTION_DAYS = 14
+
+# Opt-in profiling of hot operations (set NEWS_PROFILE=1, or toggle with Ctrl+Shift+P in the app)
+PROFILING_ENABLED = os.getenv("NEWS_PROFILE") == "1"
+PROFILES_DIR = os.path.join(BASE_DIR, "profiles")
+
+# Remote endpoints. Override them to point the app at a local stand-in (see benchmarks/replay_server.py)
+CSE_ENDPOINT = os.getenv("NEWS_CSE_ENDPOINT", "https://www.googleapis.com/customsearch/v1")
+HOUSE_SCHEDULE_URL = os.getenv("NEWS_HOUSE_SCHEDULE_URL", "https://www.majorityleader.gov/schedule/default.aspx")
+SENATE_URL = os.getenv("NEWS_SENATE_URL", "https://www.senate.gov/")
+# When set, article pages are fetched from <base>/<host>/<path> instead of the article URL itself
+SCRAPE_BASE_URL = os.getenv("NEWS_SCRAPE_BASE_URL", "")
+# Seconds to wait for a search or article response before giving up
+REQUEST_TIMEOUT = 15
+
+# Map domain names to source titles. These are the priority outlets: search results from them rank higher
+SOURCE_MAP = {
+    "apnews": "Associated Press",
+    "nytimes": "New York Times",
+    "wsj": "Wall Street Journal",
+    "politico": "POLITICO",
+    "ft": "Financial Times",
+    "cnbc": "CNBC",
+    "scmp": "South China Morning Post",
+    "foxnews": "Fox News",
+    "washingtonpost": "Washington Post",
+    "cnn": "CNN",
+    "bloomberglaw": "Bloomberg"
+}
+
+# Concurrent scraping (see services/scrape_scheduler.py)
+SCRAPE_MAX_WORKERS = 6 # Articles fetched at once across all sites
+SCRAPE_PER_HOST_LIMIT = 1 # Articles fetched at once from the same site
+SCRAPE_MIN_DELAY_S = 2.0 # Minimum gap between requests to the same site
+SCRAPE_MAX_RETRIES = 2 # Retries after a 429/503 before giving up on an article
+# Wait used when a 429/503 has no usable Retry-After header, and the longest wait honoured
+RETRY_AFTER_DEFAULT_S = 30
+RETRY_AFTER_MAX_S = 300
+
+# Per-site failure memory (see services/domain_health.py)
+DOMAIN_HEALTH_FILE = os.getenv("NEWS_DOMAIN_HEALTH_FILE", os.path.join(BASE_DIR, "data", "domain_health.json"))
+# Consecutive login/bot-block failures after which a site is skipped without fetching
+DOMAIN_FAILURE_THRESHOLD = 3
+# How long a site is skipped the first time; doubles each time it fails again afterwards, up to the max
+DOMAIN_COOLDOWN_S = 6 * 60 * 60
+DOMAIN_MAX_COOLDOWN_S = 7 * 24 * 60 * 60
+# Outcomes are saved at most this often, rather than on every scrape; pending ones are saved at exit
+DOMAIN_HEALTH_SAVE_DELAY_S = 5.0
+
+# Custom Search quota accounting (see services/search_quota.py)
+CSE_QUOTA_FILE = os.path.join(BASE_DIR, "data", "cse_quota.json")
+# Queries per day allowed by the API plan (100 on the free tier); the quota resets at midnight Pacific time
+CSE_DAILY_QUOTA = int(os.getenv("NEWS_CSE_DAILY_QUOTA", "100"))
+# Days of per-day call counts kept in the ledger
+CSE_QUOTA_HISTORY_DAYS = 30
+# A keyword whose results came back identical this many searches in a row is skipped...
+CSE_SKIP_UNCHANGED_RUNS = 2
+# ...until this many hours have passed since it was last searched
+CSE_RECHECK_HOURS = 12
+
+# Batched search: OR several single-phrase keywords into one Custom Search query (set NEWS_CSE_BATCH=1 to default on)
+CSE_BATCH_QUERIES = os.getenv("NEWS_CSE_BATCH") == "1"
+# A batched query still returns 10 results per page, shared by its keywords, so it only keeps every keyword's
+# results by fetching about one page per keyword. The defaults keep recall: on the benchmark corpus, where
+# every keyword fills its 10 results, 2 keywords x 2 pages finds all of them with the same number of calls as
+# per-keyword search. Calls are saved when keywords have fewer results, as a short page ends the query early.
+# 4 x 1 makes 5 calls instead of 12 there but finds only 43% of the results (bench_query_batching.py).
+CSE_BATCH_SIZE = 2 # Keywords per query
+CSE_BATCH_PAGES = 2 # Result pages fetched for a batched query at most (each page is one API call)
+# The API rejects queries over 2048 characters and ignores words past the 32nd
+CSE_MAX_QUERY_CHARS = 2048
+CSE_MAX_QUERY_WORDS = 32
+
+# Every result URL ever shown, with when it was first shown (see services/result_history.py)
+# Set NEWS_SEARCH_INCREMENTAL=1 to have searches show only new results by default
+SEARCH_INCREMENTAL = os.getenv("NEWS_SEARCH_INCREMENTAL") == "1"
+RESULT_HISTORY_FILE = os.getenv("NEWS_RESULT_HISTORY_FILE", os.path.join(BASE_DIR, "data", "result_history.tsv"))
+# Results first shown longer ago than this are forgotten. Searches look back 7 days at most, so older ones
+# hardly ever come up again
+RESULT_HISTORY_DAYS = 30
+# "New since last search" mode: result pages fetched per query at most, stopping early once
+# at least CSE_SEEN_STOP_SHARE of a page was shown before
+CSE_INCREMENTAL_PAGES = 3
+CSE_SEEN_STOP_SHARE = 0.5
+
+# Keyword tagging of article content (see services/keyword_tagger.py)
+KEYWORDS_FILE = os.path.join(BASE_DIR, "keywords.json")
+TAG_MAX_POSITIONS = 20 # Word positions stored per keyword; the hit count covers all of them
+TAG_FOOTER_MAX_CHARS = 200 # Longer paragraphs are never taken for an outlet's footer, however they start
+
+# Email output (see services/email_optimizer.py). Set NEWS_EMAIL_MINIFY=0 to write the template output as is.
+EMAIL_MINIFY = os.getenv("NEWS_EMAIL_MINIFY", "1") != "0"
+# Words of article content kept per article in the email; 0 keeps all of it (set with NEWS_EMAIL_WORD_CAP)
+EMAIL_WORD_CAP = int(os.getenv("NEWS_EMAIL_WORD_CAP", "0"))
+
+# Relevance ranking of search results (see services/result_ranker.py): BM25 over title and snippet against
+# all keywords, times (1 + source boost + recency boost)
+RANK_BM25_K1 = 1.2 # How quickly repeated keyword words stop adding to the score
+RANK_BM25_B = 0.75 # How much longer titles and snippets are penalized
+RANK_SOURCE_BOOST = 0.3 # For SOURCE_MAP outlets
+RANK_RECENCY_BOOST = 0.5 # For a result published just now; halves every RANK_RECENCY_HALF_LIFE_H hours
+RANK_RECENCY_HALF_LIFE_H = 24
+
+# Articles sent in earlier emails (see services/sent_registry.py)
+SENT_REGISTRY_FILE = os.getenv("NEWS_SENT_REGISTRY_FILE", os.path.join(BASE_DIR, "data", "sent_registry.json"))
+SENT_RECENT_DAYS = 30 # Sends remembered exactly, with their date; older ones only in the Bloom filter
+SENT_FILTER_CAPACITY = 2000 # Keys in the first Bloom filter; each article adds up to three (URL, title, content)
+SENT_FILTER_ERROR_RATE = 0.001 # Overall false positive rate the Bloom filter stays under
+
+# RSS/Atom feeds searched alongside Custom Search (see services/feed_reader.py)
+FEEDS_FILE = os.path.join(BASE_DIR, "feeds.json")
+# Validators for conditional GET and the index of entries already seen
+FEED_STATE_FILE = os.path.join(BASE_DIR, "data", "feed_state.json")
+FEED_MAX_WORKERS = 8 # Feeds fetched at once
+# Days seen entries are kept; at least the longest search window
+FEED_RETENTION_DAYS = 8
+
+# News sitemaps of the SOURCE_MAP outlets, crawled alongside the feeds (see services/sitemap_crawler.py)
+SITEMAPS_FILE = os.path.join(BASE_DIR, "sitemaps.json")
+# Validators, sitemap index lastmods and the index of article URLs already seen
+SITEMAP_STATE_FILE = os.path.join(BASE_DIR, "data", "sitemap_state.json")
+SITEMAP_MAX_WORKERS = 4 # Outlets crawled at once; each outlet's sitemaps are fetched one after another
+# Child sitemaps followed per sitemap index, newest first; news indexes list a few current ones among archives
+SITEMAP_MAX_CHILDREN = 5
+# Days seen articles and sitemap records are kept; at least the longest search window
+SITEMAP_RETENTION_DAYS = FEED_RETENTION_DAYS
+
+# Shared article collection (see services/collection_server.py). Set NEWS_COLLECTION_URL, e.g. http://127.0.0.1:8770,
+# to have the app work on a collection server's articles instead of its own data file.
+COLLECTION_URL = os.getenv("NEWS_COLLECTION_URL", "")
+COLLECTION_HOST = "127.0.0.1" # Localhost only unless the server is started with --host
+COLLECTION_PORT = 8770
+# The server's own article file and content store, apart from the app's
+COLLECTION_DIR = os.path.join(BASE_DIR, "data", "shared")
+# Seconds a change request waits for a change before the client asks again
+COLLECTION_POLL_WAIT_S = 20
+# Changes kept for clients catching up; one further behind reloads the whole collection
+COLLECTION_CHANGE_LOG = 500
@@ -1,45 +1,71 @@
 from ..models.article import Article
-from ..services.web_scraper import scrape_url
-from PySide6.QtWidgets import QMessageBox
-from PySide6.QtCore import Slot, QObject
+from ..models.article_list_model import ArticleListModel
+from ..profiling import profiled
+from PySide6.QtWidgets import QMessageBox, QApplication
+from PySide6.QtCore import Slot, QObject, Signal
+from functools import partial
 from typing import Optional
 
 class ArticleController(QObject):
     """
     Controls logic to perform CRUD operations on Articles. Communicates with ArticleManager
     """
+    # Emitted from scrape worker threads when one article of a batch is done; delivered on the GUI thread
+    _batch_scrape_finished = Signal(object, object, object) # batch, result data, Future
+
     def __init__(self, model, view):
         super().__init__()
         self.model = model
         self.view = view
+        self.scrape_scheduler = None # Created on the first multi-article add
+        self._quitting = False # Set once the app starts quitting; batch results arriving after that are dropped
         self._connect_signals()
 
-        # Load existing articles to article management page
-        self._refresh_articles_view()
-
     def _connect_signals(self):
-        # Search results page signals
-        self.view.search_results_page.article_addition_requested.connect(self.handle_search_result_add)
-
-        # Article management page signals
-        self.view.article_management_page.url_scrape_requested.connect(self._handle_manual_url_add)
-        self.view.article_management_page.article_preview_requested.connect(self._show_article_preview)
-        self.view.article_management_page.reorder_articles_requested.connect(self._handle_article_reorder_request)
-        self.view.article_management_page.edit_article_requested.connect(self._handle_article_edit_request)
-        self.view.article_management_page.delete_article_requested.connect(self._handle_article_delete_request)
-        self.view.article_management_page.delete_all_requested.connect(self._handle_delete_all_request)
-
-        # Manual input page signals
-        self.view.manual_input_page.submission_completed.connect(self._handle_manual_submission)
-
-        # Article manager model signals
-        self.model.articles_changed.connect(self._refresh_articles_view)
+        # Pages are wired up when the main window first builds them
+        self.view.page_created.connect(self._on_page_created)
+
+        # Article manager model signals. Row-level changes reach the list through ArticleListModel.
+        self.model.articles_reset.connect(self._on_articles_reset)
         self.model.article_updated.connect(self._update_single_article_view)
 
+        self._batch_scrape_finished.connect(self._on_batch_scrape_finished)
+
+    @Slot(str)
+    def _on_page_created(self, page):
+        """
+        Connects signals from a newly constructed page and binds its data.
+        @param page (str): The name of the page that was created.
+        """
+        if page == "search_results":
+            # Search results page signals
+            self.view.pages[page].article_addition_requested.connect(self.handle_search_result_add)
+            self.view.pages[page].articles_addition_requested.connect(self.handle_search_results_add)
+
+        elif page == "article_management":
+            # Article management page signals
+            article_management_page = self.view.pages[page]
+            article_management_page.url_scrape_requested.connect(self._handle_manual_url_add)
+            article_management_page.article_preview_requested.connect(self._show_article_preview)
+            article_management_page.edit_article_requested.connect(self._handle_article_edit_request)
+            article_management_page.delete_article_requested.connect(self._handle_article_delete_request)
+            article_management_page.delete_all_requested.connect(self._handle_delete_all_request)
+
+            # Bind existing articles to the article management page on first show
+            self.list_model = ArticleListModel(self.model, self)
+            article_management_page.set_model(self.list_model)
+
+        elif page == "manual_input":
+            # Manual input page signals
+            self.view.pages[page].submission_completed.connect(self._handle_manual_submission)
+
     @Slot()
-    def _refresh_articles_view(self):
-        articles = self.model.get_all_articles()
-        self.view.article_management_page.populate_list(articles)
+    def _on_articles_reset(self):
+        """
+        Clears the preview pane when the whole collection is replaced (e.g. delete all).
+        """
+        if self.view.has_page("article_management"):
+            self.view.article_management_page.reset_view()
 
     @Slot(Article)
     def _update_single_article_view(self, article):
@@ -47,11 +73,11 @@ class ArticleController(QObject):
         Updates the display text of edited article in the preview pane
         @param article: edited Article object
         """
-        # Refresh display
-        self.view.article_management_page.update_preview(article)
+        if not self.view.has_page("article_management"):
+            return
 
-        # Refresh listbox
-        self._refresh_articles_view()
+        # Refresh display. The list row itself is updated by ArticleListModel.
+        self.view.article_management_page.update_preview(article, self.model.get_content(article))
 
     @Slot(dict)
     def handle_search_result_add(self, result_data: dict):
@@ -65,10 +91,19 @@ class ArticleController(QObject):
         keyword = result_data.get("keyword")
         if not (url and keyword): return
 
+        # Stories sent in an earlier email are caught before spending a scrape on them
+        sent = self.model.sent_registry.sent_match(url=url, title=result_data.get("title"))
+        if sent and not self._confirm_sent(sent, result_data.get("title")):
+            return
+
         # Call the helper, which returns the article and its addition status
-        article, was_added = self._scrape_url_and_add(url, keyword)
+        article, was_added = self._scrape_url_and_add(url, keyword, allow_sent=bool(sent))
 
         if article and was_added:
+            # Count towards the keyword's yield, which orders future searches
+            from ..services.search_quota import ledger as quota_ledger
+            quota_ledger.record_accepted([keyword])
+
             # Success dialog
             QMessageBox.information(
                 self.view, 
@@ -83,6 +118,91 @@ class ArticleController(QObject):
                 f"'{article.title}' is already in your collection."
             )
 
+    @Slot(list)
+    def handle_search_results_add(self, results: list):
+        """
+        Scrapes and adds several search results chosen with "Add Selected to Email".
+        The scrapes run in the background through the politeness scheduler; the articles are added
+        together once all of them have finished, followed by one summary dialog.
+
+        @param results (list): Dictionaries of the articles' data so far (title, url, source, keyword)
+        """
+        # Stories sent in an earlier email are left out without scraping them
+        to_scrape, already_sent = [], []
+        for result in results:
+            if not (result.get("url") and result.get("keyword")):
+                continue
+            sent = self.model.sent_registry.sent_match(url=result["url"], title=result.get("title"))
+            (already_sent if sent else to_scrape).append(result)
+        results = to_scrape
+
+        if already_sent:
+            titles = "\n".join(f"- {result.get('title')}" for result in already_sent)
+            QMessageBox.information(self.view, "Already Sent",
+                                    f"Skipped {len(already_sent)} articles sent in an earlier email:\n{titles}")
+        if not results:
+            return
+
+        if self.scrape_scheduler is None:
+            # Imported here to keep newspaper3k out of startup
+            from ..services.scrape_scheduler import ScrapeScheduler
+            self.scrape_scheduler = ScrapeScheduler()
+            QApplication.instance().aboutToQuit.connect(self._stop_scraping)
+
+        batch = {"total": len(results), "done": 0, "articles": [], "failures": []}
+        for result in results:
+            future = self.scrape_scheduler.submit(result["url"])
+            future.add_done_callback(partial(self._batch_scrape_finished.emit, batch, result))
+
+        self.view.search_results_page.show_scrape_progress(0, batch["total"], self.scrape_scheduler.queue_depths())
+
+    @Slot()
+    def _stop_scraping(self):
+        """
+        Stops the scrape scheduler when the app quits. Its cancelled futures still report back, but by then the
+        autosave has stopped, so whatever a batch scraped would be added without being saved: batches are dropped.
+        """
+        self._quitting = True
+        self.scrape_scheduler.shutdown()
+
+    @Slot(object, object, object)
+    def _on_batch_scrape_finished(self, batch, result_data, future):
+        """
+        Collects one finished scrape of a multi-article add. Adds the batch when the last one comes in.
+        """
+        if self._quitting:
+            return
+        if future.cancelled():
+            batch["failures"].append((result_data.get("title"), "Cancelled"))
+        elif future.exception() is not None:
+            batch["failures"].append((result_data.get("title"), str(future.exception())))
+        else:
+            article_dict = future.result()
+            article_dict['keyword'] = result_data["keyword"]
+            batch["articles"].append(Article(**article_dict))
+
+        batch["done"] += 1
+        self.view.search_results_page.show_scrape_progress(batch["done"], batch["total"],
+                                                           self.scrape_scheduler.queue_depths())
+        if batch["done"] < batch["total"]:
+            return
+
+        self._refresh_search_result_flags()
+        added = self.model.add_many(batch["articles"])
+        from ..services.search_quota import ledger as quota_ledger
+        quota_ledger.record_accepted([article.keyword for article in added])
+        duplicates = len(batch["articles"]) - len(added)
+
+        summary = f"{len(added)} of {batch['total']} articles were added."
+        if duplicates:
+            summary += f"\n{duplicates} already in your collection or sent in an earlier email."
+        if batch["failures"]:
+            failed_lines = "\n".join(f"- {title}: {error}" for title, error in batch["failures"])
+            summary += f"\n\nScrape failed for:\n{failed_lines}\n\nPlease add these articles manually."
+            QMessageBox.warning(self.view, "Articles Added", summary)
+        else:
+            QMessageBox.information(self.view, "Articles Added", summary)
+
     @Slot(str)
     def _handle_manual_url_add(self, url: str):
         """
@@ -90,7 +210,11 @@ class ArticleController(QObject):
 
         @param url (str): The url of the article
         """
-        article, was_added = self._scrape_url_and_add(url)
+        sent = self.model.sent_registry.sent_match(url=url)
+        if sent and not self._confirm_sent(sent, url):
+            return
+
+        article, was_added = self._scrape_url_and_add(url, allow_sent=bool(sent))
 
         if article and was_added:
             # Success dialog
@@ -122,11 +246,13 @@ class ArticleController(QObject):
                 QMessageBox.warning(
                     self.view,
                     "Update Failed",
-                    f"Failed to update '{article.title}'. Article not found."
+                    f"Failed to update '{article.title}'. Article not found, or changed by someone else."
                 )
         
         else:
             successful_add = self.model.add_article(article)
+            if not successful_add and self._confirm_sent(self.model.sent_match(article), article.title):
+                successful_add = self.model.add_article(article, allow_sent=True)
             if not successful_add:
                 # Duplicate error dialog
                 QMessageBox.warning(
@@ -138,12 +264,17 @@ class ArticleController(QObject):
         # Upon success or fail, switch back to article management page
         self.view.switch_page("article_management")
 
-    def _scrape_url_and_add(self, url: str, keyword: Optional[str] = None):
+    @profiled("scrape_url_and_add")
+    def _scrape_url_and_add(self, url: str, keyword: Optional[str] = None, allow_sent: bool = False):
         """
         Private helper: Tries to scrape and add an article.
 
+        @param allow_sent (bool): The user already chose to add the article again although it was sent before.
         @return tuple: (status, article_obj)
         """
+        # Import the scraper on first use to keep newspaper3k out of startup
+        from ..services.web_scraper import scrape_url
+
         try:
             # Attempt to scrape, pass keyword in if coming from search results page
             article_dict = scrape_url(url)
@@ -154,7 +285,11 @@ class ArticleController(QObject):
             article = Article(**article_dict)
 
             # Attempt to add article to the model. Model returns status of article addition.
-            was_added = self.model.add_article(article)
+            was_added = self.model.add_article(article, allow_sent=allow_sent)
+
+            # The link wasn't known, but the same story may have been sent under another one
+            if not was_added and not allow_sent and self._confirm_sent(self.model.sent_match(article), article.title):
+                was_added = self.model.add_article(article, allow_sent=True)
 
             return article, was_added
         except Exception as e:
@@ -168,21 +303,41 @@ class ArticleController(QObject):
                 f"Scrape failed: {e}\n\n{user_prompt}"
             )
             return None, None
+        finally:
+            # The scrape may have put the site on (or taken it off) the skip list
+            self._refresh_search_result_flags()
         
-    def _show_article_preview(self, article):
+    def _confirm_sent(self, sent, title):
         """
-        Retrieves article from view. Updates preview pane with that article.
+        Asks whether to add an article that went out in an earlier email anyway.
+        @param sent (dict): The registry's sent_match result; None means there is nothing to ask.
+        @return bool: True if the user chose to add it.
         """
-        if article:
-            self.view.article_management_page.update_preview(article)
+        if not sent:
+            return False
+        from ..services.sent_registry import describe_sent
+        answer = QMessageBox.question(
+            self.view,
+            "Already Sent",
+            f"{describe_sent(sent)}:\n'{title}'\n\nAdd it anyway?"
+        )
+        return answer == QMessageBox.StandardButton.Yes
 
-    def _handle_article_reorder_request(self, titles):
+    def _refresh_search_result_flags(self):
         """
-        Retrieves title list representing the new title order from view.
-        Passes new title list to model for model state updating.
+        Re-marks search results from sites that keep refusing scrapers, after scrapes may have changed that.
         """
-        if titles:
-            self.model.reorder_articles(titles)
+        if self.view.has_page("search_results"):
+            from ..services.domain_health import health as domain_health
+            self.view.search_results_page.set_flagged_domains(domain_health.flagged_domains())
+
+    def _show_article_preview(self, article):
+        """
+        Retrieves article from view. Updates preview pane with that article.
+        """
+        if article:
+            # Content is loaded from the store only for the article being previewed
+            self.view.article_management_page.update_preview(article, self.model.get_content(article))
 
     @Slot(Article)
     def _handle_article_edit_request(self, article: Article):
@@ -193,7 +348,7 @@ class ArticleController(QObject):
             return
         
         # Prepare the manual input widget for editing
-        self.view.manual_input_page.set_article_data(article)
+        self.view.manual_input_page.set_article_data(article, self.model.get_content(article))
         
         # Switch to the manual input page
         self.view.switch_page("manual_input")
@@ -201,7 +356,8 @@ class ArticleController(QObject):
     @Slot(Article)
     def _handle_article_delete_request(self, article: Article):
         """Calls function on model to delete article"""
-        self.model.delete_article(article)
+        if self.model.delete_article(article):
+            self.view.article_management_page.clear_preview_if_showing(article)
 
     @Slot()
     def _handle_delete_all_request(self):
@@ -1,12 +1,15 @@
 from .article_controller import ArticleController
 from ..models.article_manager import ArticleManager
+from ..models.autosave_writer import AutosaveWriter
 from ..views.widgets.search_dialog import SearchDialog
-from ..services.google_searcher import search_articles
-from ..services.email_builder import build_email
+from ..views.widgets.stats_dialog import StatsDialog
+from ..config import CSE_BATCH_QUERIES, SEARCH_INCREMENTAL, COLLECTION_URL
+from .. import metrics
+from .. import profiling
 import os
 from dotenv import load_dotenv
 import json
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Slot, QCoreApplication
 from PySide6.QtWidgets import QMessageBox
 
 class MainController:
@@ -17,8 +20,20 @@ class MainController:
         # Store main window as instance attribute
         self.view = view
 
-        # Create article manager
-        self.model = ArticleManager()
+        # Create article manager. With a collection server the articles are shared with other copies of the app.
+        app = QCoreApplication.instance()
+        if COLLECTION_URL:
+            from ..models.remote_article_manager import RemoteArticleManager
+            self.model = RemoteArticleManager(COLLECTION_URL)
+            if app:
+                app.aboutToQuit.connect(self.model.stop)
+        else:
+            self.model = ArticleManager()
+
+        # Persist article changes in the background; write anything pending when the app quits
+        self.autosave = AutosaveWriter(self.model)
+        if app:
+            app.aboutToQuit.connect(self.autosave.stop)
 
         # Create article controller
         self.controller = ArticleController(self.model, self.view)
@@ -30,76 +45,188 @@ class MainController:
         # Connect signals
         self._connect_signals()
 
-        # Load cached search results if available
-        self._load_cached_results()
+        # Show the main menu now that page signals are wired up.
+        # Other pages are built (and their data loaded) the first time they are shown.
+        self.view.switch_page("main_menu")
 
     def _connect_signals(self):
         """
-        Connects signals from the view to controller methods.
+        Connects the view's page creation signal so each page is wired up when it is first built.
+        """
+        self.view.page_created.connect(self._on_page_created)
+        self.view.profiling_toggle_requested.connect(self._toggle_profiling)
+
+    @Slot(str)
+    def _on_page_created(self, page):
+        """
+        Connects signals from a newly constructed page to controller methods and binds its data.
+        @param page (str): The name of the page that was created.
         """
-        # Main menu page signals
-        self.view.main_menu_page.search_requested.connect(self._show_search_dialog)
-        self.view.main_menu_page.search_results_page_requested.connect(lambda: self.view.switch_page("search_results"))
-        self.view.main_menu_page.articles_page_requested.connect(lambda: self.view.switch_page("article_management"))
+        if page == "main_menu":
+            # Main menu page signals
+            main_menu_page = self.view.pages[page]
+            main_menu_page.search_requested.connect(self._show_search_dialog)
+            main_menu_page.search_results_page_requested.connect(lambda: self.view.switch_page("search_results"))
+            main_menu_page.articles_page_requested.connect(lambda: self.view.switch_page("article_management"))
+            main_menu_page.stats_requested.connect(self._show_stats_dialog)
 
-        # Search results page signals
-        self.view.search_results_page.rerun_search_requested.connect(self._show_search_dialog)
-        self.view.search_results_page.main_menu_requested.connect(lambda: self.view.switch_page("main_menu"))
-        self.view.search_results_page.articles_page_requested.connect(lambda: self.view.switch_page("article_management"))
+        elif page == "search_results":
+            # Search results page signals
+            search_results_page = self.view.pages[page]
+            search_results_page.rerun_search_requested.connect(self._show_search_dialog)
+            search_results_page.main_menu_requested.connect(lambda: self.view.switch_page("main_menu"))
+            search_results_page.articles_page_requested.connect(lambda: self.view.switch_page("article_management"))
 
-        # Article management page signals
-        self.view.article_management_page.main_menu_requested.connect(self._handle_main_menu_request_from_articles)
-        self.view.article_management_page.manual_input_requested.connect(lambda: self.view.switch_page("manual_input"))
-        self.view.article_management_page.save_articles_requested.connect(self._save_articles)
+            # Load cached search results if available
+            self._load_cached_results()
 
-        # Manual input page signals
-        self.view.manual_input_page.submission_cancelled.connect(lambda: self.view.switch_page("article_management"))
+        elif page == "article_management":
+            # Article management page signals
+            article_management_page = self.view.pages[page]
+            article_management_page.main_menu_requested.connect(self._handle_main_menu_request_from_articles)
+            article_management_page.manual_input_requested.connect(lambda: self.view.switch_page("manual_input"))
+            article_management_page.save_articles_requested.connect(self._save_articles)
+
+        elif page == "manual_input":
+            # Manual input page signals
+            self.view.pages[page].submission_cancelled.connect(lambda: self.view.switch_page("article_management"))
 
     def _show_search_dialog(self):
         """Displays the search dialog for Google search."""
-        dialog = SearchDialog(self.view)
+        # Import the quota ledger on first use to keep it (and pytz) out of startup
+        from ..services.search_quota import ledger as quota_ledger
+
+        dialog = SearchDialog(self.view, batched=CSE_BATCH_QUERIES, incremental=SEARCH_INCREMENTAL)
+
+        # Show the quota ledger and the keyword plan for the selected options
+        keywords = self._load_keywords()
+        def show_plan():
+            dialog.display_quota(quota_ledger.summary(keywords, dialog.get_selected_days(), dialog.is_batched()))
+        show_plan()
+        dialog.plan_changed.connect(show_plan)
     
         # Show the dialog and waits for the user to click OK or Cancel
         if dialog.exec(): 
             days_back = dialog.get_selected_days() # Get the value from the dialog
-            # Pass the selected days back to the search handler
-            self._handle_search(days_back)
+            # Pass the selected options back to the search handler
+            self._handle_search(days_back, dialog.is_batched(), dialog.is_incremental())
 
-    def _handle_search(self, days_back):
+    @Slot()
+    def _toggle_profiling(self):
+        """Turns profiling of hot operations on or off (hidden Ctrl+Shift+P action)."""
+        profiling.set_enabled(not profiling.is_enabled())
+        state = "on" if profiling.is_enabled() else "off"
+        self.view.statusBar().showMessage(f"Profiling {state}", 3000)
+
+    @Slot()
+    def _show_stats_dialog(self):
+        """Displays p50/p95 timings for each pipeline stage and domain."""
+        dialog = StatsDialog(self.view)
+        dialog.display_stats(
+            metrics.recorder.summarize(("stage",)),
+            metrics.recorder.summarize(("stage", "domain"))
+        )
+        dialog.exec()
+
+    @profiling.profiled("handle_search")
+    def _handle_search(self, days_back, batched=False, incremental=False):
         """
         Handles the search operation by calling the search service and updating the view.
+        @param incremental (bool): Only show results that no earlier search has shown.
         """
+        # Import the search services on first use to keep them out of startup
+        from ..services.search_providers import CseProvider, search_all
+        from ..services.feed_reader import FeedProvider
+        from ..services.sitemap_crawler import SitemapProvider
+        from ..services.result_ranker import rank_results
+        from ..services.search_quota import ledger as quota_ledger
+        from ..services.result_history import history as result_history
+        from ..services.sent_registry import registry as sent_registry
+        from ..services.domain_health import health as domain_health
+
         # Load API key and CSE ID from environment variables
         load_dotenv()
         api_key = os.getenv("API_KEY")
         cse_id = os.getenv("CSE_ID")
 
-        # Load keywords from JSON file
-        with open("keywords.json", "r") as f:
-            keywords = json.load(f)["keywords"]
-
+        keywords = self._load_keywords()
         if not keywords:
             print("No keywords provided for search.")
             return
 
-        # Call the search service
-        articles = search_articles(api_key, cse_id, keywords, days_back)
+        # Search Custom Search (spending the daily quota on the most productive keywords),
+        # then the outlets' feeds and news sitemaps
+        providers = [
+            CseProvider(api_key, cse_id, ledger=quota_ledger, batched=batched,
+                        history=result_history if incremental else None),
+            FeedProvider(),
+            SitemapProvider(),
+        ]
+        # Cleared first, so a Custom Search that fails before planning doesn't report the previous search's plan
+        quota_ledger.last_plan = None
+        articles = search_all(providers, keywords, days_back)
+
+        # Mark results sent in earlier emails and results shown by earlier searches (or leave the latter out),
+        # then remember this search's results
+        sent_registry.annotate(articles)
+        result_history.annotate(articles)
+        new_articles = [article for article in articles if not article["first_seen"]]
+        seen_count = len(articles) - len(new_articles)
+        if incremental:
+            articles = new_articles
+        result_history.record(article["url"] for article in new_articles)
+        self._show_search_plan(quota_ledger.last_plan, len(new_articles), seen_count, incremental)
+
+        # Most relevant first: keyword words in the title and snippet, priority outlets, recency
+        articles = rank_results(articles, keywords)
 
         # Save results to cache file
         with open("data/last_search_cache.json", "w") as f:
             json.dump(articles, f, indent=4)
 
-        # Update the search results widget with the new articles
-        self.view.search_results_page.display_results(articles)
-        
+        # Update the search results widget with the new articles.
+        # A page that hasn't been built yet loads the fresh cache when it is first shown.
+        if self.view.has_page("search_results"):
+            self.view.search_results_page.set_flagged_domains(domain_health.flagged_domains())
+            self.view.search_results_page.display_results(articles)
+
         # Switch to the search results page
         self.view.switch_page("search_results")
 
+    def _load_keywords(self):
+        """Returns the search keywords from keywords.json."""
+        with open("keywords.json", "r") as f:
+            return json.load(f)["keywords"]
+
+    def _show_search_plan(self, plan, new_count, seen_count, seen_hidden):
+        """
+        Reports in the status bar how many keywords were searched, why any were skipped,
+        and how many results are new since the last search.
+        @param plan (SearchPlan): The Custom Search plan, or None if that search failed before planning.
+        """
+        message = f"{new_count} new results, {seen_count} seen before"
+        if seen_hidden and seen_count:
+            message += " (hidden)"
+        if plan is not None:
+            message = f"Searched {len(plan.to_run)} keywords in {len(plan.queries)} queries; " + message
+            if plan.skipped_unchanged:
+                message += f"; {len(plan.skipped_unchanged)} skipped with unchanged results"
+            if plan.skipped_budget:
+                message += f"; {len(plan.skipped_budget)} skipped, out of search quota for today"
+        self.view.statusBar().showMessage(message + ".", 10000)
+
     def _load_cached_results(self):
         try:
             with open("data/last_search_cache.json", "r") as f:
                 articles = json.load(f)
                 if articles:
+                    # Imported here to keep the registries' files from being read at startup
+                    from ..services.sent_registry import registry as sent_registry
+                    from ..services.domain_health import health as domain_health
+
+                    # An email may have gone out since the search
+                    sent_registry.annotate(articles)
+                    self.view.search_results_page.set_flagged_domains(domain_health.flagged_domains())
                     self.view.search_results_page.display_results(articles)
         except (FileNotFoundError, json.JSONDecodeError):
             # If file doesn't exist or is empty, do nothing
@@ -112,9 +239,15 @@ class MainController:
         Calls email formatter service to build email.
         """
         print("Saving articles...")
+        # Let any queued autosave finish first so it can't overwrite this save with an older snapshot
+        self.autosave.flush()
+
         # Save articles to .csv file
         save_success = self.model.save_articles()
         if save_success:
+            # Import the email service on first use to keep it out of startup
+            from ..services.email_builder import build_email
+
             # Build the email
             email_build_success = build_email()
             if not email_build_success:
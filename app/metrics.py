@@ -0,0 +1,192 @@
+"""
+Lightweight per-stage tracing.
+
+Wrap a unit of work in a span to record how long it took:
+
+    with span("html_fetch", domain="politico.com") as s:
+        response = requests.get(url)
+        s.tag(bytes=len(response.content))
+
+Each finished span becomes one JSON line in data/metrics/metrics-YYYY-MM-DD.jsonl and is kept in
+memory for summarize(), which the stats dialog uses to show p50/p95 per stage and per domain.
+When metrics are disabled, span() returns a shared no-op object, so the cost is one function call.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import date, timedelta
+from app.config import METRICS_ENABLED, METRICS_DIR, METRICS_RETENTION_DAYS
+
+# Number of finished spans buffered before they are appended to the log file
+FLUSH_EVERY = 50
+
+# Number of recent spans kept in memory for summaries
+MAX_RECENT = 20_000
+
+
+class _NullSpan:
+    """Span used when metrics are disabled. Does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def tag(self, **tags):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times one stage of work and reports it to the recorder when it ends."""
+    __slots__ = ("recorder", "stage", "tags", "start")
+
+    def __init__(self, recorder, stage, tags):
+        self.recorder = recorder
+        self.stage = stage
+        self.tags = tags
+        self.start = None
+
+    def tag(self, **tags):
+        """Adds tags discovered during the work, e.g. the number of bytes received."""
+        self.tags.update(tags)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration_ms = (time.perf_counter() - self.start) * 1000
+        if exc_type is not None:
+            self.tags["error"] = exc_type.__name__
+        self.recorder.record(self.stage, duration_ms, self.tags)
+        return False # Never swallow exceptions
+
+
+class MetricsRecorder:
+    """
+    Collects finished spans in memory and appends them to a rolling daily JSONL log.
+    """
+    def __init__(self, directory=METRICS_DIR, enabled=METRICS_ENABLED, retention_days=METRICS_RETENTION_DAYS):
+        """
+        @param directory (str): Directory for the daily log files.
+        @param enabled (bool): When False, span() returns a no-op span and nothing is recorded.
+        @param retention_days (int): Log files older than this are deleted.
+        """
+        self.directory = directory
+        self.enabled = enabled
+        self.retention_days = retention_days
+        self._recent = deque(maxlen=MAX_RECENT)
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._loaded_today = False
+
+    def span(self, stage, **tags):
+        """
+        Returns a context manager that times a stage.
+        @param stage (str): Stage name, e.g. "cse_request" or "html_fetch".
+        @param tags: Extra fields such as keyword, domain or bytes.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, stage, tags)
+
+    def record(self, stage, duration_ms, tags):
+        """Records one finished span. Thread-safe."""
+        entry = {"ts": round(time.time(), 3), "stage": stage, "ms": round(duration_ms, 3), **tags}
+        with self._lock:
+            self._recent.append(entry)
+            self._buffer.append(entry)
+            should_flush = len(self._buffer) >= FLUSH_EVERY
+        if should_flush:
+            self.flush()
+
+    def _log_path(self, day):
+        return os.path.join(self.directory, f"metrics-{day.isoformat()}.jsonl")
+
+    def flush(self):
+        """Appends buffered spans to today's log file and prunes logs past the retention window."""
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        if not entries:
+            return
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._log_path(date.today()), "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+            self._prune()
+        except OSError as e:
+            print(f"Could not write metrics log: {e}")
+
+    def _prune(self):
+        """Deletes daily log files older than the retention window."""
+        cutoff = f"metrics-{(date.today() - timedelta(days=self.retention_days)).isoformat()}.jsonl"
+        for name in os.listdir(self.directory):
+            # ISO dates sort lexically, so a string comparison is enough
+            if name.startswith("metrics-") and name.endswith(".jsonl") and name < cutoff:
+                os.remove(os.path.join(self.directory, name))
+
+    def _load_today(self):
+        """
+        Replaces the in-memory history with today's log, so summaries include earlier sessions.
+        Called after a flush, so the log already holds this session's spans.
+        """
+        self._loaded_today = True
+        try:
+            with open(self._log_path(date.today()), "r", encoding="utf-8") as f:
+                logged = [json.loads(line) for line in f if line.strip()]
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        with self._lock:
+            # Keep any spans recorded since the flush
+            self._recent.clear()
+            self._recent.extend(logged + self._buffer)
+
+    def summarize(self, group_by=("stage",)):
+        """
+        Returns timing percentiles for recorded spans grouped by the given tags.
+
+        @param group_by (tuple): Tag names to group by, e.g. ("stage",) or ("stage", "domain").
+                                 Spans missing any of the tags are left out.
+        @return dict: {group key tuple: {"count": n, "p50": ms, "p95": ms}}
+        """
+        if not self._loaded_today:
+            self.flush()
+            self._load_today()
+
+        groups = {}
+        with self._lock:
+            entries = list(self._recent)
+        for entry in entries:
+            if all(tag in entry for tag in group_by):
+                key = tuple(entry[tag] for tag in group_by)
+                groups.setdefault(key, []).append(entry["ms"])
+
+        return {key: {"count": len(durations),
+                      "p50": percentile(durations, 50),
+                      "p95": percentile(durations, 95)}
+                for key, durations in sorted(groups.items())}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(1, round(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+# Process-wide recorder used by the services
+recorder = MetricsRecorder()
+atexit.register(recorder.flush)
+
+def span(stage, **tags):
+    """Times a stage with the process-wide recorder. See MetricsRecorder.span."""
+    return recorder.span(stage, **tags)
@@ -1,36 +1,53 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+import sys
 import uuid
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Article:
     """
-    Data class representing a single article.
+    Slotted data class representing a single article.
+
+    Only metadata stays resident. Once an article is added to the ArticleManager its HTML content
+    moves to the ContentStore and `content` is set to None; use ArticleManager.get_content to read it.
     """
     title: str
-    content: str
+    content: Optional[str]
     source: str
     keyword: str = "Manual"
     author: List[str] = field(default_factory=list)
     url: Optional[str] = None
     lead: Optional[str] = None
     id: Optional[str] = None
+    tags: Dict[str, dict] = field(default_factory=dict) # Keyword -> {"count", "positions"}, see keyword_tagger
 
     def __post_init__(self):
         """
-        Generates unique ID for Article objects
+        Generates unique ID for Article objects.
+        Interns source and keyword, which repeat across many articles.
         """
         if self.id is None:
             self.id = str(uuid.uuid4())
+        if self.source:
+            self.source = sys.intern(self.source)
+        if self.keyword:
+            self.keyword = sys.intern(self.keyword)
 
     def to_dict(self):
         """Converts the Article object to a dictionary."""
         return {
+            "id": self.id,
             "title": self.title,
             "lead": self.lead,
             "content": self.content,
             "source": self.source,
             "url": self.url,
             "author": self.author,
-            "keyword": self.keyword
-        }
\ No newline at end of file
+            "keyword": self.keyword,
+            "tags": self.tags
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Creates an Article from a dictionary like to_dict's, ignoring keys that aren't Article fields."""
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
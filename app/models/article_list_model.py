@@ -0,0 +1,124 @@
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QMimeData, Slot
+from .article import Article
+
+class ArticleListModel(QAbstractListModel):
+    """
+    List model of article titles bound to an ArticleManager.
+    Translates the manager's per-row signals into row insert/remove/move/dataChanged notifications,
+    so a single add, edit or reorder only touches one row in the view.
+    """
+    MIME_TYPE = "application/x-news-article-row"
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self._manager = manager
+
+        # Shadow copy of the manager's list, so rows can be updated inside begin/end notifications
+        self._articles = list(manager.get_all_articles())
+
+        manager.article_added.connect(self._on_article_added)
+        manager.article_removed.connect(self._on_article_removed)
+        manager.article_moved.connect(self._on_article_moved)
+        manager.article_updated.connect(self._on_article_updated)
+        manager.articles_reset.connect(self._on_articles_reset)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._articles)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        article = self._articles[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return article.title
+        if role == Qt.ItemDataRole.UserRole:
+            return article
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if not article.tags:
+                return article.source
+            keywords = ", ".join(f"{keyword} ({tag['count']})" for keyword, tag in article.tags.items())
+            return f"{article.source}\nKeywords: {keywords}"
+        return None
+
+    def flags(self, index):
+        default_flags = super().flags(index)
+        if index.isValid():
+            return default_flags | Qt.ItemFlag.ItemIsDragEnabled
+        # Drops are only allowed between rows, never onto an article
+        return default_flags | Qt.ItemFlag.ItemIsDropEnabled
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(self):
+        return [self.MIME_TYPE]
+
+    def mimeData(self, indexes):
+        mime_data = QMimeData()
+        if indexes:
+            mime_data.setData(self.MIME_TYPE, str(indexes[0].row()).encode())
+        return mime_data
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action == Qt.DropAction.IgnoreAction:
+            return True
+        if not data.hasFormat(self.MIME_TYPE):
+            return False
+
+        source_row = int(bytes(data.data(self.MIME_TYPE)).decode())
+        # A drop past the last row arrives as row -1
+        if row == -1:
+            row = parent.row() if parent.isValid() else self.rowCount()
+        return self._move_to_insert_position(source_row, row)
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_child):
+        # Used by QListView for internal moves; only single-row moves are supported
+        if count != 1 or source_parent.isValid() or destination_parent.isValid():
+            return False
+        return self._move_to_insert_position(source_row, destination_child)
+
+    def _move_to_insert_position(self, source_row, insert_row):
+        """
+        Asks the manager to move an article. The manager's article_moved signal updates this model.
+        @param source_row (int): Row being moved.
+        @param insert_row (int): Row it is dropped before, counted before the move.
+        """
+        to_row = insert_row - 1 if insert_row > source_row else insert_row
+        return self._manager.move_article(source_row, to_row)
+
+    @Slot(int)
+    def _on_article_added(self, row):
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._articles.insert(row, self._manager.get_all_articles()[row])
+        self.endInsertRows()
+
+    @Slot(int)
+    def _on_article_removed(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._articles[row]
+        self.endRemoveRows()
+
+    @Slot(int, int)
+    def _on_article_moved(self, from_row, to_row):
+        # beginMoveRows takes the destination as an insert position before the move
+        destination = to_row + 1 if to_row > from_row else to_row
+        if not self.beginMoveRows(QModelIndex(), from_row, from_row, QModelIndex(), destination):
+            return
+        self._articles.insert(to_row, self._articles.pop(from_row))
+        self.endMoveRows()
+
+    @Slot(Article)
+    def _on_article_updated(self, article):
+        for row, existing_article in enumerate(self._articles):
+            if existing_article.id == article.id:
+                self._articles[row] = article
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+                return
+
+    @Slot()
+    def _on_articles_reset(self):
+        self.beginResetModel()
+        self._articles = list(self._manager.get_all_articles())
+        self.endResetModel()
@@ -1,77 +1,187 @@
-import pandas as pd
 from .article import Article
-from ..utils import normalize_url
+from .content_store import ContentStore
+from ..utils import normalize_url, atomic_write_text
+from ..metrics import span
+from ..profiling import profiled
 from PySide6.QtCore import Signal, QObject
 from typing import Optional
+from contextlib import contextmanager
 import ast
+import csv
+import io
 import os
+import sys
+import threading
+from collections import deque
 from titlecase import titlecase
-from pandas.errors import EmptyDataError
 from app.config import DATA_FILE
 
+# Column order of the articles CSV. Content is kept in the ContentStore, not the CSV.
+CSV_FIELDS = ["id", "title", "lead", "source", "url", "author", "keyword", "tags"]
+
+# Serializes CSV writes from the GUI thread (Build Email) and the autosave thread
+_write_lock = threading.Lock()
+
+
+def write_articles_csv(filepath, rows):
+    """
+    Writes article rows to the CSV file atomically (temp file, fsync, rename).
+    An empty row list removes the file, matching delete_all_articles.
+
+    @param filepath (str): Path of the CSV file.
+    @param rows (list): Article dictionaries as returned by Article.to_dict.
+    """
+    with _write_lock:
+        if not rows:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            return
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+        atomic_write_text(filepath, buffer.getvalue())
+
 class ArticleManager(QObject):
     """
     Manages the collection of all Article objects.
     """
     # Custom signals
-    articles_changed = Signal()
+    articles_changed = Signal(dict) # Emitted once per change (or batch) with the affected ids, see _notify
+    articles_reset = Signal() # The whole list was replaced (e.g. delete all)
+    article_added = Signal(int) # Row of the appended article
+    article_removed = Signal(int) # Row the article was removed from
+    article_moved = Signal(int, int) # Old row, new row
     article_updated = Signal(Article)
 
-    def __init__(self, filepath=DATA_FILE):
+    def __init__(self, filepath=DATA_FILE, content_store=None, sent_registry=None, tagger=None):
         """
         Initializes the ArticleModel.
         
         @param filepath (str): Path to the CSV file containing articles.
+        @param content_store (ContentStore): Where article HTML is kept. Defaults to the data/content directory.
+        @param sent_registry (SentRegistry): Record of articles sent in earlier emails. Defaults to the shared one.
+        @param tagger (callable): Returns the keyword tags of article HTML. Defaults to keyword_tagger.tag_content.
         """
         super().__init__()
         self.filepath = filepath
+        self.content_store = content_store or ContentStore()
+        self._sent_registry = sent_registry # The shared registry is loaded on first use, not at startup
+        if tagger is None:
+            from ..services.keyword_tagger import tag_content as tagger
+        self.tagger = tagger
         self.articles = []
         self.seen_urls = set() # Keep a set of normalized URLs for fast lookup
         self.seen_titles = set() # Same thing for titles. This is for manual article duplicate checking
+        self._pending_changes = None # Change summary collected while inside batch()
         self._load_articles()
 
+    @property
+    def sent_registry(self):
+        if self._sent_registry is None:
+            from ..services.sent_registry import registry
+            self._sent_registry = registry
+        return self._sent_registry
+
+    @profiled("load_articles")
     def _load_articles(self):
         """
         Private method: loads existing articles from the CSV file into a list of Article objects.
+        Uses the stdlib csv reader rather than pandas so that startup does not pay for the pandas import.
         """
         try:
-            df = pd.read_csv(self.filepath)
-
-            # Replace 'NaN values with None for optional fields
-            df['author'] = df['author'].apply(lambda x: ast.literal_eval(x) if isinstance(x, str) else x)
-            df = df.where(pd.notna(df), None)
-            # Ensure 'lead' nan values are replaced with empty string
-            df['lead'] = df['lead'].apply(lambda x: "" if x is None or pd.isna(x) else x)
-
-            # Create an Article object for each row in the dataframe
-            for _, row in df.iterrows():
-                article = Article(
-                    title=row.get('title', ''),
-                    content=row.get('content', ''),
-                    source=row.get('source', ''),
-                    url=row.get('url', ''),
-                    keyword=row.get('keyword', ''),
-                    author=row.get('author', []),
-                    lead=row.get("lead", '')
-                    )
-                self.articles.append(article)
-                # Populate the set of seen URLs
-                if article.url:
-                    self.seen_urls.add(normalize_url(article.url)) 
-                # Populate the set of seen titles
-                if article.title:
-                    self.seen_titles.add(article.title.lower().strip())                 
+            with open(self.filepath, "r", newline="", encoding="utf-8") as f:
+                rows = list(csv.DictReader(f))
         except FileNotFoundError:
             print(f"{self.filepath} not found. Starting with empty article list.")
             self.articles = []
-        except EmptyDataError:
+            return
+
+        if not rows:
             print(f"{self.filepath} is empty. Starting with empty article list.")
             self.articles = []
+            return
+
+        # Create an Article object for each row in the file
+        migrated = False
+        for row in rows:
+            # Author lists are stored as their Python repr, e.g. "['Jane Doe']"
+            author = row.get('author') or ''
+            author = ast.literal_eval(author) if author.startswith('[') else []
+            # Tags are stored the same way, e.g. "{'tariffs': {'count': 3, 'positions': [4, 17, 52]}}"
+            tags = row.get('tags') or ''
+            tags = ast.literal_eval(tags) if tags.startswith('{') else {}
+
+            article = Article(
+                title=row.get('title') or '',
+                content=None, # Loaded on demand from the content store
+                source=row.get('source') or '',
+                url=row.get('url') or None,
+                keyword=row.get('keyword') or '',
+                author=author,
+                lead=row.get('lead') or '',
+                id=row.get('id') or None,
+                tags=tags
+                )
+
+            # Files written before content moved out of the CSV still carry it inline: migrate it
+            if row.get('content'):
+                article.content = row['content']
+                self._store_content(article)
+                migrated = True
+
+            self.articles.append(article)
+            # Populate the set of seen URLs
+            if article.url:
+                self.seen_urls.add(normalize_url(article.url))
+            # Populate the set of seen titles
+            if article.title:
+                self.seen_titles.add(article.title.lower().strip())
+
+        # Rewrite migrated files right away so the generated ids match the stored content
+        if migrated:
+            write_articles_csv(self.filepath, self.snapshot())
 
     def get_all_articles(self):
         """Returns a list of all Article objects"""
         return self.articles
+
+    def snapshot(self):
+        """
+        Returns the articles as a list of plain dictionaries.
+        Safe to hand to another thread, since it shares no objects with the live list.
+        """
+        return [dict(article.to_dict(), author=list(article.author or []), tags=dict(article.tags or {}))
+                for article in self.articles]
+
+    def get_content(self, article):
+        """
+        Returns an article's HTML content, loading it from the content store if it isn't in memory.
+        @param article (Article): The article whose content to return.
+        """
+        if article.content is not None:
+            return article.content
+        return self.content_store.get(article.id)
+
+    def _store_content(self, article):
+        """
+        Private helper: tags an article with the keywords its content matches, then moves the content
+        to the content store. Articles whose content is None (already stored) are left alone.
+        """
+        if article.content is not None:
+            article.tags = self.tagger(article.content)
+            self.content_store.put(article.id, article.content)
+            article.content = None
     
+    def articles_with_tag(self, keyword):
+        """
+        Returns the articles whose content matches a keyword, most hits first.
+        @param keyword (str): A keyword from keywords.json.
+        """
+        tagged = [article for article in self.articles if keyword in article.tags]
+        return sorted(tagged, key=lambda article: article.tags[keyword]["count"], reverse=True)
+
     def get_single_article(self, article_id: str) -> Optional[Article]:
         """
         Returns a single Article object by its unique ID.
@@ -84,40 +194,159 @@ class ArticleManager(QObject):
         # If the loop finishes without finding a match, the article doesn't exist.
         return None
     
-    def add_article(self, new_article):
+    @contextmanager
+    def batch(self):
+        """
+        Groups several mutations into a single change notification.
+        Row-level signals are suppressed inside the block; when the outermost block exits,
+        articles_reset and articles_changed are emitted once with a summary of all affected ids.
+
+        Usage:
+            with manager.batch():
+                manager.add_article(first)
+                manager.delete_article(second)
+        """
+        outermost = self._pending_changes is None
+        if outermost:
+            self._pending_changes = self._empty_change_summary()
+        try:
+            yield self
+        finally:
+            if outermost:
+                summary, self._pending_changes = self._pending_changes, None
+                if any(summary.values()):
+                    self.articles_reset.emit()
+                    self.articles_changed.emit(summary)
+
+    @staticmethod
+    def _empty_change_summary():
+        """Returns an empty change summary: lists of affected article ids by kind of change."""
+        return {"added": [], "updated": [], "removed": [], "moved": []}
+
+    def _notify(self, kind, article_ids, row_signal=None, *row_args):
+        """
+        Private helper: reports a change to listeners, or records it if a batch is open.
+        @param kind (str): "added", "updated", "removed" or "moved".
+        @param article_ids (list): Ids of the affected articles.
+        @param row_signal: Fine-grained signal to emit outside of a batch (e.g. article_added).
+        @param row_args: Arguments for row_signal.
+        """
+        if self._pending_changes is not None:
+            self._pending_changes[kind].extend(article_ids)
+            return
+
+        if row_signal is not None:
+            row_signal.emit(*row_args)
+
+        summary = self._empty_change_summary()
+        summary[kind] = list(article_ids)
+        self.articles_changed.emit(summary)
+
+    @staticmethod
+    def _apply_titlecase(article):
+        """Enforces titlecase for an article's title and source."""
+        article.title = titlecase(article.title.strip())
+        article.source = sys.intern(titlecase(article.source.strip()))
+
+    @staticmethod
+    def _dedup_keys(article):
+        """
+        Returns the (normalized url, normalized title) pair used for duplicate checks.
+        The url key is None for articles without a URL.
+        """
+        url_key = normalize_url(article.url) if article.url else None
+        return url_key, article.title.lower().strip()
+
+    @staticmethod
+    def _is_duplicate(url_key, title_key, seen_urls, seen_titles):
+        """
+        Duplicate check shared by the single and batch add paths.
+        Articles with a URL are compared by URL; articles without one are compared by title.
+        """
+        if url_key:
+            return url_key in seen_urls
+        return title_key in seen_titles
+
+    def sent_match(self, article):
+        """
+        Checks whether an article went out in an earlier email, by URL, title or content.
+        @return dict: SentRegistry.sent_match's description of the match, or None.
+        """
+        return self.sent_registry.sent_match(url=article.url, title=article.title, content=article.content)
+
+    def add_article(self, new_article, allow_sent=False):
         """
         Takes a new Article object and adds it to the list of Articles.
         Performs a duplicate check before adding.
+        @param allow_sent (bool): Add the article even if it went out in an earlier email.
         """
         # Enforce titlecase for title and source
-        new_article.title = titlecase(new_article.title.strip())
-        new_article.source = titlecase(new_article.source.strip())
-
-        # First priority duplicate check: URL
-        if new_article.url:
-            url = normalize_url(new_article.url)
-            # Check for duplicate
-            if url in self.seen_urls:
-                print(f'Duplicate article found: {new_article.title}')
-                return False
-        
-        # If no url, check duplicate on title
-        else:
-            normalized_title = new_article.title.lower().strip()
-            if normalized_title in self.seen_titles:
-                print(f'Duplicate article found: {new_article.title}')
-                return False
+        self._apply_titlecase(new_article)
+
+        # Duplicate check: URL first, title if there is no URL
+        with span("dedup"):
+            url_key, title_key = self._dedup_keys(new_article)
+            is_duplicate = self._is_duplicate(url_key, title_key, self.seen_urls, self.seen_titles)
+        if is_duplicate:
+            print(f'Duplicate article found: {new_article.title}')
+            return False
+        if not allow_sent and self.sent_match(new_article):
+            print(f'Article already sent in an earlier email: {new_article.title}')
+            return False
         
-        # If not duplicate, add article to list
+        # If not duplicate, move its content to disk and add article to list
+        self._store_content(new_article)
         self.articles.append(new_article)
         # Add url to seen urls
-        if new_article.url:
-            self.seen_urls.add(url)
+        if url_key:
+            self.seen_urls.add(url_key)
         # Add title to seen titles
-        self.seen_titles.add(new_article.title.lower().strip())
+        self.seen_titles.add(title_key)
         
-        self.articles_changed.emit()
+        self._notify("added", [new_article.id], self.article_added, len(self.articles) - 1)
         return True
+
+    def add_many(self, new_articles, allow_sent=False):
+        """
+        Adds several Article objects at once with a single change notification.
+        Duplicates are skipped using the same rules as add_article, including duplicates within new_articles.
+
+        @param new_articles (list): Article objects to add.
+        @param allow_sent (bool): Add articles even if they went out in an earlier email.
+        @return list: The articles that were actually added.
+        """
+        added = []
+        new_urls, new_titles = set(), set()
+
+        with span("dedup", count=len(new_articles)):
+            for article in new_articles:
+                self._apply_titlecase(article)
+                url_key, title_key = self._dedup_keys(article)
+
+                # Check against the collection and against earlier articles in this call
+                if (self._is_duplicate(url_key, title_key, self.seen_urls, self.seen_titles)
+                        or self._is_duplicate(url_key, title_key, new_urls, new_titles)):
+                    print(f'Duplicate article found: {article.title}')
+                    continue
+                if not allow_sent and self.sent_match(article):
+                    print(f'Article already sent in an earlier email: {article.title}')
+                    continue
+
+                added.append(article)
+                if url_key:
+                    new_urls.add(url_key)
+                new_titles.add(title_key)
+
+        if added:
+            # Apply all additions, then update the lookup sets once
+            for article in added:
+                self._store_content(article)
+            self.articles.extend(added)
+            self.seen_urls |= new_urls
+            self.seen_titles |= new_titles
+            self._notify("added", [article.id for article in added], self.articles_reset)
+
+        return added
     
     def edit_article(self, article):
         """
@@ -125,14 +354,14 @@ class ArticleManager(QObject):
         @param article (Article): The updated Article object. It MUST have a valid ID.
         """
         # Enforce titlecase for title and source
-        article.title = titlecase(article.title.strip())
-        article.source = titlecase(article.source.strip())
+        self._apply_titlecase(article)
 
         for i, existing_article in enumerate(self.articles):
             if existing_article.id == article.id:
                 # Found the article by ID, now replace it with the updated version
+                self._store_content(article)
                 self.articles[i] = article
-                self.article_updated.emit(article)
+                self._notify("updated", [article.id], self.article_updated, article)
                 return True
                 
         print(f"Error: Article with ID '{article.id}' not found for editing.")
@@ -154,35 +383,82 @@ class ArticleManager(QObject):
 
                 # Delete the article from current session, and notify controller of changes
                 del self.articles[i]
-                self.articles_changed.emit()
+                self.content_store.delete(article.id)
+                self._notify("removed", [article.id], self.article_removed, i)
                 return True
 
         print(f"Error: Article with ID '{article.id}' not found for deletion.")
         return False
+
+    def delete_many(self, articles):
+        """
+        Deletes several articles at once with a single change notification.
+        @param articles (list): Article objects to delete. Each MUST have a valid ID.
+        @return int: Number of articles deleted.
+        """
+        ids_to_delete = {article.id for article in articles}
+        removed = [article for article in self.articles if article.id in ids_to_delete]
+        if not removed:
+            return 0
+
+        # Apply the deletion, then update the lookup sets once
+        self.articles = [article for article in self.articles if article.id not in ids_to_delete]
+        self.seen_titles -= {article.title.lower().strip() for article in removed}
+        self.seen_urls -= {normalize_url(article.url) for article in removed}
+        for article in removed:
+            self.content_store.delete(article.id)
+
+        self._notify("removed", [article.id for article in removed], self.articles_reset)
+        return len(removed)
     
     def delete_all_articles(self):
+        removed_ids = [article.id for article in self.articles]
         self.articles = []
+        self.seen_urls.clear()
+        self.seen_titles.clear()
+        self.content_store.clear()
 
-        if os.path.exists(DATA_FILE):
-            os.remove(DATA_FILE)
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
 
-        self.articles_changed.emit()
+        self._notify("removed", removed_ids, self.articles_reset)
 
-    def reorder_articles(self, new_title_order):
+    def move_article(self, from_row, to_row):
         """
-        Takes a list of titles in a new order and rearranges the Articles list to that order
+        Moves a single article to a new position in the Articles list.
+        @param from_row (int): Current index of the article.
+        @param to_row (int): Index the article should have after the move.
         """
-        # Create dictionary for article lookup
-        article_mapper = {article.title: article for article in self.articles}
+        if from_row == to_row or not (0 <= from_row < len(self.articles) and 0 <= to_row < len(self.articles)):
+            return False
 
-        # Create list for reordered articles
-        reordered_articles = [article_mapper[title] for title in new_title_order]
+        article = self.articles.pop(from_row)
+        self.articles.insert(to_row, article)
 
-        # Replace unordered list with ordered list
-        self.articles = reordered_articles
-        self.articles_changed.emit()
+        self._notify("moved", [article.id], self.article_moved, from_row, to_row)
+        return True
+
+    def reorder_articles(self, new_title_order):
+        """
+        Takes a list of titles in a new order and rearranges the Articles list to that order.
+        Articles sharing a title keep their order among themselves.
+        """
+        # Titles aren't unique (an edit can give two articles the same one), so each takes the next article with it
+        ids_by_title = {}
+        for article in self.articles:
+            ids_by_title.setdefault(article.title, deque()).append(article.id)
+        self.reorder_by_ids([ids_by_title[title].popleft() for title in new_title_order])
 
+    def reorder_by_ids(self, article_ids):
+        """
+        Rearranges the Articles list to the order of the given ids.
+        @param article_ids (list): The id of every article, once each, in the new order.
+        """
+        articles_by_id = {article.id: article for article in self.articles}
+        self.articles = [articles_by_id[article_id] for article_id in article_ids]
+        self._notify("moved", list(article_ids), self.articles_reset)
 
+    @profiled("save_articles")
     def save_articles(self):
         """
         Saves the Article list as a CSV file, overwriting the old file.
@@ -193,14 +469,9 @@ class ArticleManager(QObject):
             return False
         
         try:
-            # Convert each Article object in the list to a dictionary
-            articles_as_dicts = [article.to_dict() for article in self.articles]
-
-            # Create a DataFrame from the list of dictionaries
-            df = pd.DataFrame(articles_as_dicts)
-
-            # Save the DataFrame to the CSV file
-            df.to_csv(self.filepath, index=False)
+            # Write any content still waiting for the autosave, then the articles, atomically
+            self.content_store.flush()
+            write_articles_csv(self.filepath, self.snapshot())
 
             print(f"Articles saved successfully to {self.filepath}")
             return True
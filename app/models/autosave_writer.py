@@ -0,0 +1,134 @@
+import queue
+import threading
+import time
+from PySide6.QtCore import QObject, QTimer, Signal, Slot
+from .article_manager import write_articles_csv
+from app.config import AUTOSAVE_DELAY_MS
+
+class AutosaveWriter(QObject):
+    """
+    Write-behind autosave for an ArticleManager.
+
+    Every change restarts a debounce timer on the GUI thread. When it fires, a snapshot of the
+    articles is queued for a background thread, which writes the CSV atomically. If several
+    snapshots are waiting, only the newest is written, so rapid edits coalesce into one write.
+    The manager's content store is switched to write-behind, and the same thread writes the
+    content of added and edited articles just before the CSV that lists them.
+    """
+    # Latency of the write in ms, number of articles written. Emitted from the writer thread.
+    write_finished = Signal(float, int)
+
+    _STOP = object() # Queue sentinel that shuts the writer thread down
+
+    def __init__(self, manager, delay_ms=AUTOSAVE_DELAY_MS, parent=None):
+        """
+        @param manager (ArticleManager): The collection to persist.
+        @param delay_ms (int): Quiet period after the last change before a snapshot is written.
+        """
+        super().__init__(parent)
+        self.manager = manager
+        self.manager.content_store.write_behind = True
+
+        # Observable state
+        self.pending_changes = 0 # Changes since the last snapshot was queued
+        self.writes_completed = 0
+        self.last_write_ms = None
+        self.max_write_ms = 0.0
+
+        # Debounce timer: restarted by every change, fires once things go quiet
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._enqueue_snapshot)
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="autosave-writer", daemon=True)
+        self._thread.start()
+
+        self.manager.articles_changed.connect(self._on_articles_changed)
+
+    @property
+    def queue_depth(self):
+        """Number of snapshots waiting to be written."""
+        return self._queue.qsize()
+
+    def stats(self):
+        """Returns a dictionary describing the autosave state, for logging or display."""
+        return {
+            "pending_changes": self.pending_changes,
+            "queue_depth": self.queue_depth,
+            "writes_completed": self.writes_completed,
+            "last_write_ms": self.last_write_ms,
+            "max_write_ms": self.max_write_ms,
+        }
+
+    @Slot(dict)
+    def _on_articles_changed(self, summary):
+        self.pending_changes += 1
+        self._timer.start()
+
+    @Slot()
+    def _enqueue_snapshot(self):
+        """Takes a snapshot on the GUI thread and hands it to the writer thread."""
+        self._queue.put(self.manager.snapshot())
+        self.pending_changes = 0
+
+    def flush(self):
+        """
+        Writes any pending changes and blocks until the writer thread has caught up.
+        Used before an explicit save and when the application quits.
+        """
+        if self._timer.isActive() or self.pending_changes or self.manager.content_store.pending_count:
+            self._timer.stop()
+            self._enqueue_snapshot()
+        self._queue.join()
+
+    @Slot()
+    def stop(self):
+        """Flushes pending changes and shuts the writer thread down."""
+        self.flush()
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        """Writer thread: writes the newest queued snapshot, skipping any it has superseded."""
+        stopping = False
+        while not stopping:
+            rows = self._queue.get()
+            taken = 1
+            stopping = rows is self._STOP
+
+            # Coalesce: if more snapshots arrived meanwhile, only the newest matters
+            while not stopping:
+                try:
+                    newer = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+                if newer is self._STOP:
+                    stopping = True
+                else:
+                    rows = newer
+
+            if rows is not self._STOP:
+                self._write(rows)
+
+            for _ in range(taken):
+                self._queue.task_done()
+
+    def _write(self, rows):
+        """Writes one snapshot and records its latency."""
+        start = time.perf_counter()
+        try:
+            self.manager.content_store.flush()
+            write_articles_csv(self.manager.filepath, rows)
+        except Exception as e:
+            print(f"Autosave failed: {e}")
+            return
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.writes_completed += 1
+        self.last_write_ms = latency_ms
+        self.max_write_ms = max(self.max_write_ms, latency_ms)
+        print(f"Autosaved {len(rows)} articles in {latency_ms:.1f} ms (queue depth {self.queue_depth})")
+        self.write_finished.emit(latency_ms, len(rows))
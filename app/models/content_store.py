@@ -0,0 +1,118 @@
+import os
+import shutil
+import threading
+import zlib
+from ..utils import atomic_write_bytes
+from app.config import CONTENT_DIR, COMPRESS_CONTENT
+
+class ContentStore:
+    """
+    Stores article HTML content on disk, one file per article id, optionally zlib-compressed.
+    Lets Article objects keep only metadata in memory and load content when it is displayed or rendered.
+
+    With write_behind set (the autosave does this for its manager's store), put only keeps the content
+    in memory, and the files are written by flush on the autosave's writer thread, so adding or editing
+    an article doesn't wait for a compressed, fsynced write on the GUI thread. Content waiting to be
+    written is returned by get as usual.
+    """
+    def __init__(self, directory=CONTENT_DIR, compress=COMPRESS_CONTENT, write_behind=False):
+        """
+        @param directory (str): Directory holding the content files.
+        @param compress (bool): Whether new content is written zlib-compressed.
+        @param write_behind (bool): Whether put leaves the write to flush.
+        """
+        self.directory = directory
+        self.compress = compress
+        self.write_behind = write_behind
+        self._pending = {} # Article id -> content not written yet
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock() # One flush at a time, so content missing after a write was deleted
+
+    def _path(self, article_id, compressed):
+        extension = ".html.z" if compressed else ".html"
+        return os.path.join(self.directory, f"{article_id}{extension}")
+
+    def put(self, article_id, html):
+        """
+        Saves the content for an article, replacing any previous version.
+        @param article_id (str): The article's unique ID.
+        @param html (str): The article's HTML content.
+        """
+        html = html or ""
+        if self.write_behind:
+            with self._lock:
+                self._pending[article_id] = html
+            return
+        self._write(article_id, html)
+
+    @property
+    def pending_count(self):
+        """Number of articles whose content hasn't been written yet."""
+        return len(self._pending)
+
+    def flush(self):
+        """
+        Writes the content put since the last flush. Safe to call from another thread than put.
+        Content deleted or replaced while it is being written is left as the later call made it.
+        """
+        with self._flush_lock:
+            with self._lock:
+                to_write = list(self._pending.items())
+            for article_id, html in to_write:
+                self._write(article_id, html)
+                with self._lock:
+                    current = self._pending.get(article_id)
+                    if current is html:
+                        del self._pending[article_id]
+                    elif current is None:
+                        # Deleted while it was being written
+                        self._remove_files(article_id)
+
+    def _write(self, article_id, html):
+        data = html.encode("utf-8")
+        if self.compress:
+            data = zlib.compress(data)
+        atomic_write_bytes(self._path(article_id, self.compress), data)
+
+        # Remove a stale copy in the other format, e.g. after changing COMPRESS_CONTENT
+        stale_path = self._path(article_id, not self.compress)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    def get(self, article_id):
+        """
+        Returns the stored content for an article, or an empty string if there is none.
+        @param article_id (str): The article's unique ID.
+        """
+        with self._lock:
+            pending = self._pending.get(article_id)
+        if pending is not None:
+            return pending
+        for compressed in (True, False):
+            try:
+                with open(self._path(article_id, compressed), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            if compressed:
+                data = zlib.decompress(data)
+            return data.decode("utf-8")
+        return ""
+
+    def delete(self, article_id):
+        """Removes the stored content for an article, if any."""
+        with self._lock:
+            self._pending.pop(article_id, None)
+            self._remove_files(article_id)
+
+    def _remove_files(self, article_id):
+        for compressed in (True, False):
+            path = self._path(article_id, compressed)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def clear(self):
+        """Removes all stored content."""
+        with self._lock:
+            self._pending.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,225 @@
+import threading
+import requests
+from PySide6.QtCore import Signal, Slot
+from .article import Article
+from .article_manager import ArticleManager
+from ..utils import normalize_url
+from ..services.collection_client import CollectionClient, CollectionConflict
+from app.config import DATA_FILE
+
+class RemoteArticleManager(ArticleManager):
+    """
+    ArticleManager for a collection kept on a collection server (see services/collection_server.py) and shared
+    with other copies of the app.
+
+    Changes are sent to the server, and the articles here only change by applying the server's change log,
+    so every copy applies the same changes in the same order. A background thread long-polls the server and
+    hands new changes to the GUI thread; after its own changes the manager catches up at once, so they show
+    without waiting for the poll. Views see the usual ArticleManager signals either way.
+
+    The local data file and content store hold a copy of the collection (kept up by the autosave),
+    which is what Build Email reads.
+    """
+    # Emitted from the watcher thread with a change response; delivered on the GUI thread
+    _changes_received = Signal(object)
+
+    def __init__(self, base_url, filepath=DATA_FILE, content_store=None, sent_registry=None, tagger=None):
+        """
+        @param base_url (str): The collection server's address, e.g. http://127.0.0.1:8770
+        Other parameters as for ArticleManager.
+        """
+        super().__init__(filepath, content_store, sent_registry, tagger)
+        self.base_url = base_url
+        self.client = CollectionClient(base_url)
+        self.server_id = None
+        self.version = 0
+        self._revisions = {} # Article id -> version it last changed at, sent with edits and deletes
+
+        # The first load blocks: the app is of no use until it has the collection
+        self._reload()
+
+        self._changes_received.connect(self._apply_changes)
+        self._stopping = threading.Event()
+        self._watcher = threading.Thread(target=self._watch, name="collection-watcher", daemon=True)
+        self._watcher.start()
+
+    def _load_articles(self):
+        """The collection comes from the server, not the local data file."""
+        self.articles = []
+
+    @Slot()
+    def stop(self):
+        """Stops listening for changes. A change request in progress is abandoned with the daemon thread."""
+        self._stopping.set()
+
+    def _watch(self):
+        """Watcher thread: waits for changes on the server and passes them to the GUI thread."""
+        client = CollectionClient(self.base_url) # Sessions aren't shared between threads
+        since, server_id = self.version, self.server_id
+        while not self._stopping.is_set():
+            try:
+                response = client.changes(since, server_id)
+            except (requests.RequestException, ValueError) as e:
+                print(f"Lost the collection server, retrying: {e}")
+                self._stopping.wait(2)
+                continue
+            since, server_id = response["version"], response["server"]
+            if response.get("changes") or "reset" in response:
+                self._changes_received.emit(response)
+
+    def _reload(self):
+        """Replaces the articles here with the server's whole collection."""
+        try:
+            loaded = self.client.articles()
+        except (requests.RequestException, ValueError) as e:
+            print(f"Could not reach the collection server: {e}")
+            return
+        self._apply_changes(dict(loaded, reset=loaded["articles"]))
+
+    def sync(self):
+        """Applies the changes made on the server since the last ones applied, without waiting for new ones."""
+        try:
+            self._apply_changes(self.client.changes(self.version, self.server_id, wait=0))
+        except (requests.RequestException, ValueError) as e:
+            print(f"Could not reach the collection server: {e}")
+
+    # --- Applying the server's changes ---
+
+    @Slot(object)
+    def _apply_changes(self, response):
+        """Applies a change response, skipping changes already applied (the watcher and sync overlap)."""
+        if "reset" in response:
+            # The watcher's reply may be older than what sync already applied
+            if response["server"] == self.server_id and response["version"] < self.version:
+                return
+            self.server_id, self.version = response["server"], response["version"]
+            self._replace_all(response["reset"])
+            return
+        for change in response["changes"]:
+            if change["version"] <= self.version:
+                continue
+            if change["version"] != self.version + 1:
+                # A gap means changes were missed; start over from the whole collection
+                self._reload()
+                return
+            self.version = change["version"]
+            getattr(self, f"_apply_{change['kind']}")(change)
+
+    def _to_article(self, data):
+        """Makes an Article from the server's data, keeping its content in the local content store."""
+        article = Article.from_dict(data)
+        self._revisions[article.id] = data.get("rev", 0)
+        self.content_store.put(article.id, article.content or "")
+        article.content = None
+        return article
+
+    def _row_of(self, article_id):
+        return next((row for row, article in enumerate(self.articles) if article.id == article_id), None)
+
+    def _replace_all(self, articles):
+        previous_ids = {article.id for article in self.articles}
+        self.articles = [self._to_article(data) for data in articles]
+        for article_id in previous_ids - {article.id for article in self.articles}:
+            self.content_store.delete(article_id)
+        self._revisions = {article.id: self._revisions[article.id] for article in self.articles}
+        self.seen_urls = {normalize_url(article.url) for article in self.articles if article.url}
+        self.seen_titles = {article.title.lower().strip() for article in self.articles if article.title}
+        self._notify("updated", [article.id for article in self.articles], self.articles_reset)
+
+    def _apply_added(self, change):
+        article = self._to_article(change["article"])
+        self.articles.append(article)
+        if article.url:
+            self.seen_urls.add(normalize_url(article.url))
+        self.seen_titles.add(article.title.lower().strip())
+        self._notify("added", [article.id], self.article_added, len(self.articles) - 1)
+
+    def _apply_updated(self, change):
+        article = self._to_article(change["article"])
+        row = self._row_of(article.id)
+        if row is None:
+            return
+        self.articles[row] = article
+        self._notify("updated", [article.id], self.article_updated, article)
+
+    def _apply_removed(self, change):
+        row = self._row_of(change["id"])
+        if row is None:
+            return
+        article = self.articles.pop(row)
+        self.seen_titles.discard(article.title.lower().strip())
+        self.seen_urls.discard(normalize_url(article.url))
+        self._revisions.pop(article.id, None)
+        self.content_store.delete(article.id)
+        self._notify("removed", [article.id], self.article_removed, row)
+
+    def _apply_moved(self, change):
+        from_row = self._row_of(change["id"])
+        if from_row is None or from_row == change["to"]:
+            return
+        self.articles.insert(change["to"], self.articles.pop(from_row))
+        self._notify("moved", [change["id"]], self.article_moved, from_row, change["to"])
+
+    def _apply_reset(self, change):
+        self._replace_all(change["articles"])
+
+    # --- Changes, sent to the server ---
+
+    def _send(self, action, *args):
+        """
+        Sends one change to the server, then catches up with the collection.
+        @return dict: The server's reply, or None if the change was refused or the server couldn't be reached.
+        """
+        try:
+            return action(*args)
+        except CollectionConflict as e:
+            print(f"Change refused: {e}. Showing the latest version instead.")
+        except (requests.RequestException, ValueError) as e:
+            print(f"Could not reach the collection server: {e}")
+        finally:
+            self.sync()
+        return None
+
+    def _article_data(self, article):
+        return dict(article.to_dict(), content=self.get_content(article))
+
+    def add_article(self, new_article, allow_sent=False):
+        """Adds an article to the shared collection. Duplicate checks happen on the server."""
+        result = self._send(self.client.add, [self._article_data(new_article)], allow_sent)
+        return bool(result and result["added"])
+
+    def add_many(self, new_articles, allow_sent=False):
+        """Adds several articles to the shared collection. @return list: The articles that were actually added."""
+        result = self._send(self.client.add, [self._article_data(article) for article in new_articles], allow_sent)
+        added = [self.get_single_article(article_id) for article_id in (result["added"] if result else [])]
+        return [article for article in added if article is not None]
+
+    def edit_article(self, article):
+        """Replaces an article. Fails if someone else changed it since it was loaded here."""
+        rev = self._revisions.get(article.id)
+        return self._send(self.client.edit, self._article_data(article), rev) is not None
+
+    def delete_article(self, article):
+        """Deletes an article. Fails if someone else changed it since it was loaded here."""
+        return self._send(self.client.delete, article.id, self._revisions.get(article.id)) is not None
+
+    def delete_many(self, articles):
+        """Deletes several articles. @return int: Number of articles deleted."""
+        deleted = 0
+        for article in articles:
+            deleted += self.delete_article(article)
+        return deleted
+
+    def delete_all_articles(self):
+        """Empties the shared collection, unless it changed since it was last loaded here."""
+        self._send(self.client.delete_all, self.version)
+
+    def move_article(self, from_row, to_row):
+        """Moves an article. Rows are as shown here; the server moves the article wherever it is now."""
+        if from_row == to_row or not (0 <= from_row < len(self.articles) and 0 <= to_row < len(self.articles)):
+            return False
+        return self._send(self.client.move, self.articles[from_row].id, to_row) is not None
+
+    def reorder_by_ids(self, article_ids):
+        """Puts the articles in the order of the given ids, unless the collection changed since."""
+        self._send(self.client.reorder, list(article_ids), self.version)
@@ -0,0 +1,160 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from datetime import datetime
+from PySide6.QtGui import QBrush, QColor, QFont
+from app.utils import get_domain
+
+class SearchResultsModel(QAbstractTableModel):
+    """
+    Table model holding search result dictionaries (title, url, source, keyword, score).
+    Each row maps to one result; the last column is the "Add to Email" action painted by a delegate.
+    Rows from sites that keep refusing scrapers are shown in red with the reason in their tooltip.
+    Results shown by an earlier search (with a "first_seen" time, see result_history) are shown in grey,
+    and results already sent in an earlier email (with a "sent" description, see sent_registry) are struck through.
+    """
+    TITLE_COLUMN, SOURCE_COLUMN, KEYWORD_COLUMN, SCORE_COLUMN, ACTION_COLUMN = range(5)
+    HEADERS = ["Title", "Source", "Keyword", "Score", ""]
+
+    # Result dictionary key shown in each data column
+    COLUMN_KEYS = {
+        TITLE_COLUMN: "title",
+        SOURCE_COLUMN: "source",
+        KEYWORD_COLUMN: "keyword",
+        SCORE_COLUMN: "score", # Relevance from result_ranker; a number, so the column sorts numerically
+    }
+
+    ACTION_TEXT = "Add to Email"
+    FLAGGED_COLOR = "#b03a2e"
+    SEEN_COLOR = "#8a8a8a"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._results = []
+        self._domains = [] # Site of each row, parallel to _results
+        self._flagged_domains = {} # Site -> why scraping it is likely to fail
+        self._flagged_brush = QBrush(QColor(self.FLAGGED_COLOR))
+        self._seen_brush = QBrush(QColor(self.SEEN_COLOR))
+        self._sent_font = QFont()
+        self._sent_font.setStrikeOut(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        # Flat table: only the invisible root has children
+        return 0 if parent.isValid() else len(self._results)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        result = self._results[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.ACTION_COLUMN:
+                return self.ACTION_TEXT
+            return result.get(self.COLUMN_KEYS[column], "")
+
+        if role == Qt.ItemDataRole.UserRole:
+            # The full result dictionary, used when adding the article or opening its URL
+            return result
+
+        flag = self._flagged_domains.get(self._domains[index.row()])
+
+        first_seen = result.get("first_seen")
+
+        if role == Qt.ItemDataRole.ToolTipRole:
+            notes = []
+            if result.get("sent"):
+                notes.append(result["sent"])
+            if first_seen:
+                seen_at = datetime.fromtimestamp(first_seen).strftime("%b %d, %I:%M %p")
+                notes.append(f"Seen in an earlier search on {seen_at}")
+            if flag:
+                domain = self._domains[index.row()]
+                notes.append(f"Scraping will likely fail: {domain} {flag}. Consider adding it manually.")
+            if column == self.TITLE_COLUMN:
+                return "\n\n".join([result.get("url")] + notes)
+            return "\n\n".join(notes) or None
+
+        if role == Qt.ItemDataRole.ForegroundRole and column != self.ACTION_COLUMN:
+            if flag:
+                return self._flagged_brush
+            if first_seen:
+                return self._seen_brush
+
+        if role == Qt.ItemDataRole.FontRole and result.get("sent") and column != self.ACTION_COLUMN:
+            return self._sent_font
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def set_results(self, results):
+        """
+        Replaces all rows with a new list of results.
+        @param results: List of result dictionaries.
+        """
+        self.beginResetModel()
+        self._results = list(results)
+        self._domains = [get_domain(result.get("url")) for result in self._results]
+        self.endResetModel()
+
+    def append_results(self, results):
+        """
+        Appends results to the end of the table without resetting existing rows.
+        @param results: List of result dictionaries.
+        """
+        if not results:
+            return
+        first = len(self._results)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self._results.extend(results)
+        self._domains.extend(get_domain(result.get("url")) for result in results)
+        self.endInsertRows()
+
+    def set_flagged_domains(self, flagged_domains):
+        """
+        Marks the rows of sites that keep refusing scrapers.
+        @param flagged_domains (dict): {domain: description of the failure}, e.g. from domain_health.
+        """
+        if flagged_domains == self._flagged_domains:
+            return
+        self._flagged_domains = dict(flagged_domains)
+        if self._results:
+            self.dataChanged.emit(
+                self.index(0, 0), self.index(len(self._results) - 1, self.ACTION_COLUMN),
+                [Qt.ItemDataRole.ForegroundRole, Qt.ItemDataRole.ToolTipRole]
+            )
+
+    def result_at(self, row):
+        """Returns the result dictionary at a model row."""
+        return self._results[row]
+
+
+class SearchResultsFilterProxy(QSortFilterProxyModel):
+    """
+    Sorts search results by column and filters them by a case-insensitive match on source or keyword.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filter_text = ""
+        self.setSortCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+    def set_filter_text(self, text):
+        """
+        Shows only rows whose source or keyword contains the given text.
+        @param text (str): Filter text; empty shows all rows.
+        """
+        self._filter_text = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._filter_text:
+            return True
+        result = self.sourceModel().result_at(source_row)
+        return (self._filter_text in (result.get("source") or "").lower()
+                or self._filter_text in (result.get("keyword") or "").lower())
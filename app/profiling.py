@@ -0,0 +1,113 @@
+"""
+Opt-in profiling of hot operations.
+
+Functions decorated with @profiled(name) run normally unless profiling is enabled (NEWS_PROFILE=1 or
+the Ctrl+Shift+P action in the main window). When enabled, each call runs under cProfile and
+tracemalloc and writes to the profiles/ directory:
+
+- <timestamp>-<name>.pstats      cProfile statistics (open with `python -m pstats`)
+- <timestamp>-<name>.tracemalloc allocation snapshot (load with tracemalloc.Snapshot.load)
+- summary.log                    one line per run: wall time, peak memory, top cumulative functions
+"""
+import cProfile
+import functools
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from app.config import PROFILING_ENABLED, PROFILES_DIR
+
+# Number of functions listed in the one-line summary
+TOP_FUNCTIONS = 3
+
+_enabled = PROFILING_ENABLED
+
+# Only the outermost profiled call on a thread is profiled; nested ones show up inside it
+_state = threading.local()
+
+
+def is_enabled():
+    """Returns True if profiled operations are currently being profiled."""
+    return _enabled
+
+
+def set_enabled(enabled):
+    """Turns profiling of decorated operations on or off."""
+    global _enabled
+    _enabled = enabled
+    print(f"Profiling {'enabled' if enabled else 'disabled'}. Output goes to {PROFILES_DIR}")
+
+
+def profiled(name):
+    """
+    Decorator that profiles calls to the decorated function while profiling is enabled.
+    @param name (str): Operation name used in file names and the summary line.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled or getattr(_state, "active", False):
+                return func(*args, **kwargs)
+            return _run_profiled(name, func, args, kwargs)
+        return wrapper
+    return decorator
+
+
+def _run_profiled(name, func, args, kwargs):
+    """Runs one call under cProfile and tracemalloc, then writes its outputs."""
+    _state.active = True
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        profiler.disable()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        if started_tracing:
+            tracemalloc.stop()
+        _state.active = False
+
+        try:
+            _write_outputs(name, profiler, snapshot, elapsed_ms, peak_bytes)
+        except OSError as e:
+            print(f"Could not write profile for {name}: {e}")
+
+
+def _write_outputs(name, profiler, snapshot, elapsed_ms, peak_bytes):
+    """Writes the pstats file, the allocation snapshot and the summary line."""
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    base_path = os.path.join(PROFILES_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{name}")
+
+    profiler.dump_stats(f"{base_path}.pstats")
+    snapshot.dump(f"{base_path}.tracemalloc")
+
+    summary = (f"{name}: {elapsed_ms:.0f} ms, peak {peak_bytes / 1_048_576:.1f} MiB, "
+               f"top: {_top_functions(profiler)} -> {os.path.basename(base_path)}")
+    print(f"[profile] {summary}")
+    with open(os.path.join(PROFILES_DIR, "summary.log"), "a", encoding="utf-8") as f:
+        f.write(f"{datetime.now().isoformat(timespec='seconds')} {summary}\n")
+
+
+def _top_functions(profiler):
+    """Formats the functions with the highest cumulative time, skipping this module's wrappers."""
+    stats = pstats.Stats(profiler).stats
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+
+    top = []
+    for (filename, line, function), (_, _, _, cumulative, _) in ranked:
+        if filename == __file__ or function.startswith("<built-in method builtins.exec") or filename == "~":
+            continue
+        top.append(f"{os.path.basename(filename)}:{line}({function}) {cumulative * 1000:.0f} ms")
+        if len(top) == TOP_FUNCTIONS:
+            break
+    return ", ".join(top)
@@ -0,0 +1,80 @@
+"""
+Client for the collection server (see collection_server.py).
+Plain requests calls without Qt, so scripts and benchmarks can use it as well as the app.
+A client keeps one HTTP session; threads should each use their own client.
+"""
+import requests
+from ..config import REQUEST_TIMEOUT, COLLECTION_POLL_WAIT_S
+
+
+class CollectionConflict(Exception):
+    """
+    A change was based on an outdated version of an article or of the collection: someone else changed it first.
+    @param article (dict): The article as it is now on the server, if the change was to one article.
+    """
+    def __init__(self, message, article=None):
+        super().__init__(message)
+        self.article = article
+
+
+class CollectionClient:
+    def __init__(self, base_url, timeout=REQUEST_TIMEOUT):
+        """
+        @param base_url (str): The server's address, e.g. http://127.0.0.1:8770
+        @param timeout (float): Seconds to wait for a reply, on top of a change request's wait.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def _request(self, method, path, wait=0, **kwargs):
+        response = self._session.request(method, self.base_url + path, timeout=self.timeout + wait, **kwargs)
+        if response.status_code == 409:
+            data = response.json()
+            raise CollectionConflict(data.get("error", "Conflict"), data.get("article"))
+        response.raise_for_status()
+        return response.json()
+
+    def articles(self):
+        """@return dict: {"server", "version", "articles": article dictionaries with content and "rev"}"""
+        return self._request("GET", "/articles")
+
+    def changes(self, since, server=None, wait=COLLECTION_POLL_WAIT_S):
+        """
+        Asks for the changes after a version, waiting up to wait seconds for one if there are none yet.
+        @param server (str): The server id the version belongs to; a restarted server sends the whole collection.
+        @return dict: {"server", "version", "changes": [...]}, or {"server", "version", "reset": articles}
+            when the client is too far behind to catch up change by change.
+        """
+        params = {"since": since, "wait": wait}
+        if server:
+            params["server"] = server
+        return self._request("GET", "/changes", wait=wait, params=params)
+
+    def add(self, articles, allow_sent=False):
+        """
+        Adds articles; duplicates of articles in the collection are skipped.
+        @param articles (list): Article dictionaries with content.
+        @return dict: {"version", "added": ids of the articles added}
+        """
+        return self._request("POST", "/articles", json={"articles": articles, "allow_sent": allow_sent})
+
+    def edit(self, article, rev):
+        """Replaces an article. Raises CollectionConflict if it changed since version rev."""
+        return self._request("PUT", f"/articles/{article['id']}", json={"article": article, "rev": rev})
+
+    def delete(self, article_id, rev):
+        """Deletes an article. Raises CollectionConflict if it changed since version rev."""
+        return self._request("DELETE", f"/articles/{article_id}", params={"rev": rev})
+
+    def move(self, article_id, to_row):
+        """Moves an article to a row, wherever it is now."""
+        return self._request("POST", f"/articles/{article_id}/move", json={"to": to_row})
+
+    def reorder(self, article_ids, version):
+        """Puts the articles in a new order. Raises CollectionConflict if the collection changed since version."""
+        return self._request("PUT", "/order", json={"ids": article_ids, "version": version})
+
+    def delete_all(self, version):
+        """Empties the collection. Raises CollectionConflict if it changed since version."""
+        return self._request("DELETE", "/articles", params={"version": version})
@@ -0,0 +1,305 @@
+"""
+Collection server: one article collection shared by several copies of the app, so two people can split the
+morning's clipping instead of merging two lists by hand.
+
+The server keeps the collection in an ArticleManager of its own, with the usual duplicate checks, titlecasing,
+keyword tagging and content store. Each copy of the app (see models/remote_article_manager.py) sends its changes
+here and hears about everyone's changes by long polling: a change request waits until the collection moves past
+the client's version, so changes reach the other clients as soon as they are made.
+
+- Changes are applied one at a time under one lock and saved before the reply, so concurrent clients
+  never see half of a change.
+- Versioning is optimistic. Every change bumps the collection version, and each article carries the version
+  it last changed at (its "rev"). An edit or delete names the rev it was based on and is refused with 409 if
+  someone changed the article since, instead of overwriting their change. Reordering and deleting everything
+  name the collection version the same way. Adds need no version; duplicates are skipped as in the app.
+- Every change is logged with its version. A client asking for the changes after its version gets them at once,
+  or as soon as there are any; one further behind than the log, or one that knew an earlier run of the server,
+  gets the whole collection instead.
+
+Protocol (JSON over HTTP):
+
+    GET    /articles                    {"server", "version", "articles": [article with content and "rev"]}
+    GET    /changes?since=V&wait=S      {"server", "version", "changes": [...]} or {..., "reset": articles}
+    POST   /articles                    {"articles", "allow_sent"} -> {"version", "added": ids}
+    PUT    /articles/<id>               {"article", "rev"} -> {"version"}
+    DELETE /articles/<id>?rev=R         {"version"}
+    POST   /articles/<id>/move          {"to": row} -> {"version"}
+    PUT    /order                       {"ids", "version"} -> {"version"}
+    DELETE /articles?version=V          {"version"}
+
+Stale changes get 409 {"error", "article"}, unknown articles 404 and malformed requests 400.
+A change is {"version", "kind", ...}: "added" and "updated" carry the article, "removed" its id, "moved" its id
+and the rows it moved between, and "reset" the whole collection after a reorder or delete all.
+
+Usage: python -m app.services.collection_server [--host 127.0.0.1] [--port 8770] [--data-dir data/shared]
+The server listens on localhost only unless given another --host.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from ..config import COLLECTION_HOST, COLLECTION_PORT, COLLECTION_DIR, COLLECTION_CHANGE_LOG, COLLECTION_POLL_WAIT_S
+from ..models.article import Article
+from .collection_client import CollectionConflict
+
+
+class SharedCollection:
+    """
+    An ArticleManager's collection with versioned, serialized changes and a change log clients can wait on.
+    """
+    def __init__(self, manager, log_size=COLLECTION_CHANGE_LOG, save=None):
+        """
+        @param manager (ArticleManager): Holds the articles.
+        @param save (callable): Writes the manager's articles after each change. Defaults to its CSV file.
+        """
+        self.manager = manager
+        self.server_id = uuid.uuid4().hex # Lets clients notice that the server was restarted
+        self.version = 0
+        self._revisions = {article.id: 0 for article in manager.get_all_articles()}
+        self._log = deque(maxlen=log_size)
+        self._changed = threading.Condition()
+        if save is None:
+            from ..models.article_manager import write_articles_csv
+            save = lambda: write_articles_csv(manager.filepath, manager.snapshot())
+        self._save = save
+
+    def _article_data(self, article):
+        rev = self._revisions.get(article.id, 0)
+        return dict(article.to_dict(), content=self.manager.get_content(article), rev=rev)
+
+    def _all_articles(self):
+        return [self._article_data(article) for article in self.manager.get_all_articles()]
+
+    def _record(self, kind, article=None, **change):
+        # Called with the lock held
+        self.version += 1
+        if article is not None:
+            self._revisions[article.id] = self.version
+            change["article"] = self._article_data(article)
+        change.update(version=self.version, kind=kind)
+        self._log.append(change)
+
+    def _commit(self):
+        # Called with the lock held, once a request's changes are recorded: save them and wake the waiting clients
+        try:
+            self._save()
+        except OSError as e:
+            print(f"Could not save the shared collection: {e}")
+        self._changed.notify_all()
+        return {"version": self.version}
+
+    def _current(self, article_id, rev):
+        # Called with the lock held
+        article = self.manager.get_single_article(article_id)
+        if article is None:
+            raise LookupError(f"No article with id {article_id}")
+        if rev != self._revisions.get(article_id, 0):
+            raise CollectionConflict(f"'{article.title}' was changed by someone else", self._article_data(article))
+        return article
+
+    def _check_version(self, version):
+        # Called with the lock held
+        if version != self.version:
+            raise CollectionConflict("The collection was changed by someone else")
+
+    def articles(self):
+        with self._changed:
+            return {"server": self.server_id, "version": self.version, "articles": self._all_articles()}
+
+    def changes(self, since, wait=0, server_id=None):
+        """Returns the changes after version since, waiting up to wait seconds for one. See the module docstring."""
+        deadline = time.monotonic() + wait
+        with self._changed:
+            stale = (server_id and server_id != self.server_id) or since > self.version
+            while not stale and self.version <= since:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._changed.wait(remaining)
+
+            response = {"server": self.server_id, "version": self.version}
+            if stale or (self.version > since and (not self._log or self._log[0]["version"] > since + 1)):
+                response["reset"] = self._all_articles()
+            else:
+                response["changes"] = [change for change in self._log if change["version"] > since]
+            return response
+
+    def add(self, articles, allow_sent=False):
+        with self._changed:
+            added = self.manager.add_many([Article.from_dict(data) for data in articles], allow_sent)
+            for article in added:
+                self._record("added", article)
+            return dict(self._commit(), added=[article.id for article in added])
+
+    def edit(self, data, rev):
+        with self._changed:
+            self._current(data["id"], rev)
+            article = Article.from_dict(data)
+            self.manager.edit_article(article)
+            self._record("updated", article)
+            return self._commit()
+
+    def delete(self, article_id, rev):
+        with self._changed:
+            article = self._current(article_id, rev)
+            self.manager.delete_article(article)
+            self._revisions.pop(article_id, None)
+            self._record("removed", id=article_id)
+            return self._commit()
+
+    def move(self, article_id, to_row):
+        with self._changed:
+            articles = self.manager.get_all_articles()
+            from_row = next((row for row, article in enumerate(articles) if article.id == article_id), None)
+            if from_row is None:
+                raise LookupError(f"No article with id {article_id}")
+            to_row = max(0, min(to_row, len(articles) - 1))
+            if self.manager.move_article(from_row, to_row):
+                self._record("moved", id=article_id, **{"from": from_row, "to": to_row})
+            return self._commit()
+
+    def reorder(self, article_ids, version):
+        with self._changed:
+            self._check_version(version)
+            if sorted(article_ids) != sorted(article.id for article in self.manager.get_all_articles()):
+                raise ValueError("The new order must list every article once")
+            self.manager.reorder_by_ids(article_ids)
+            self._record("reset", articles=self._all_articles())
+            return self._commit()
+
+    def delete_all(self, version):
+        with self._changed:
+            self._check_version(version)
+            self.manager.delete_all_articles()
+            self._revisions.clear()
+            self._record("reset", articles=[])
+            return self._commit()
+
+
+class CollectionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle's algorithm on, each reply waits about 40 ms for an ACK
+    disable_nagle_algorithm = True
+
+    # Set on the server: server.collection, server.verbose
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        parts = urlsplit(self.path)
+        path = [part for part in parts.path.split("/") if part]
+        query = {name: values[0] for name, values in parse_qs(parts.query).items()}
+        collection = self.server.collection
+        try:
+            body = self._read_json() if method in ("POST", "PUT") else {}
+            if method == "GET" and path == ["articles"]:
+                result = collection.articles()
+            elif method == "GET" and path == ["changes"]:
+                # Waits are capped, so a client can't hold a thread forever
+                wait = min(float(query.get("wait", 0)), COLLECTION_POLL_WAIT_S * 2)
+                result = collection.changes(int(query.get("since", 0)), wait, query.get("server"))
+            elif method == "POST" and path == ["articles"]:
+                result = collection.add(body["articles"], bool(body.get("allow_sent")))
+            elif method == "DELETE" and path == ["articles"]:
+                result = collection.delete_all(int(query["version"]))
+            elif method == "PUT" and len(path) == 2 and path[0] == "articles":
+                result = collection.edit(dict(body["article"], id=path[1]), body.get("rev"))
+            elif method == "DELETE" and len(path) == 2 and path[0] == "articles":
+                result = collection.delete(path[1], int(query["rev"]))
+            elif method == "POST" and len(path) == 3 and path[0] == "articles" and path[2] == "move":
+                result = collection.move(path[1], int(body["to"]))
+            elif method == "PUT" and path == ["order"]:
+                result = collection.reorder(body["ids"], body.get("version"))
+            else:
+                self._send(404, {"error": f"No such endpoint: {method} {parts.path}"})
+                return
+        except CollectionConflict as e:
+            self._send(409, {"error": str(e), "article": e.article})
+        except (KeyError, ValueError, TypeError) as e:
+            self._send(400, {"error": f"Bad request: {e}"})
+        except LookupError as e:
+            self._send(404, {"error": str(e)})
+        else:
+            self._send(200, result)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting; it will ask again
+            self.close_connection = True
+
+
+def make_server(collection, host=COLLECTION_HOST, port=COLLECTION_PORT, verbose=False):
+    """
+    Creates a collection server. Call serve_forever() on it, usually from a daemon thread.
+    @param collection (SharedCollection): The collection to serve.
+    @param port (int): Port to listen on; 0 picks a free one (read it back from server.server_address).
+    """
+    server = ThreadingHTTPServer((host, port), CollectionHandler)
+    server.daemon_threads = True
+    server.collection = collection
+    server.verbose = verbose
+    return server
+
+
+def open_collection(data_dir=COLLECTION_DIR):
+    """Opens the shared collection kept in data_dir (articles.csv and a content directory)."""
+    from ..models.article_manager import ArticleManager
+    from ..models.content_store import ContentStore
+    os.makedirs(os.path.join(data_dir, "content"), exist_ok=True)
+    manager = ArticleManager(os.path.join(data_dir, "articles.csv"), ContentStore(os.path.join(data_dir, "content")))
+    return SharedCollection(manager)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--host", default=COLLECTION_HOST)
+    arg_parser.add_argument("--port", type=int, default=COLLECTION_PORT)
+    arg_parser.add_argument("--data-dir", default=COLLECTION_DIR, help="where the shared collection is saved")
+    arg_parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = arg_parser.parse_args()
+
+    collection = open_collection(args.data_dir)
+    server = make_server(collection, args.host, args.port, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving {len(collection.manager.get_all_articles())} articles. Point the app at it with:")
+    print(f"  NEWS_COLLECTION_URL=http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,85 +1,109 @@
 # pyright: reportAttributeAccessIssue=false
 
 import requests
-from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 import pytz
 from dateutil import parser
+from app.metrics import span
+from app.config import HOUSE_SCHEDULE_URL, SENATE_URL
+from app.utils import find_html_element, find_child_element, element_text
+
+def parse_house_schedule(html, now=None):
+    """
+    Extracts today's House schedule from the House Majority Leader's schedule page.
+    @param html (str): The page HTML.
+    @param now (datetime): The current time; defaults to datetime.now().
+    """
+    now = now or datetime.now()
+
+    # Get today's date to verify against the House schedule
+    today_str = now.strftime('%A, %B %d').upper().replace(' 0', ' ')
+
+    # Find the HTML element that contains the schedule
+    schedule_container = find_html_element(html, 'span', 'ctl00_ctl23_ctl00_Text')
+
+    if schedule_container is not None:
+        # Get the entire text content of the container
+        full_text = element_text(schedule_container, separator=' ', strip=True)
+
+        # Check if today's date is anywhere in that text
+        if today_str in full_text.upper():
+            # Use the current day of the week to create a dynamic delimiter
+            day_of_week = now.strftime('%A')
+            delimiter = f"On {day_of_week}, the House"
+
+            if delimiter in full_text:
+                schedule_details = full_text.split(delimiter)[1].strip()
+            
+                # Remove all unnecessary details about the House schedule
+                cutoff = "Legislation"
+                if cutoff in schedule_details:
+                    schedule_details = schedule_details.split(cutoff)[0].strip()
+                
+                return f'The House {schedule_details}'
+            else:
+                # Fallback in case the "On [Day]," text isn't present
+                return f'The House {full_text}'
+        else:
+            return f"The House is out."  
+
+    return "House schedule not found."
+
 
 def get_house_schedule():
     """Scrapes the House Majority Leader's site for the daily schedule."""
     try:
-        # Get today's date to verify against the House schedule
-        today_str = datetime.now().strftime('%A, %B %d').upper().replace(' 0', ' ')
-
-        # Get the main House Majority Leader page and scrape it using BeautifulSoup
-        url = "https://www.majorityleader.gov/schedule/default.aspx"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Find the HTML element that contains the schedule
-        schedule_container = soup.find('span', id='ctl00_ctl23_ctl00_Text')
-
-        if schedule_container:
-            # Get the entire text content of the container
-            full_text = schedule_container.get_text(separator=' ', strip=True)
-
-            # Check if today's date is anywhere in that text
-            if today_str in full_text.upper():
-                # Use the current day of the week to create a dynamic delimiter
-                day_of_week = datetime.now().strftime('%A')
-                delimiter = f"On {day_of_week}, the House"
-
-                if delimiter in full_text:
-                    schedule_details = full_text.split(delimiter)[1].strip()
-                
-                    # Remove all unnecessary details about the House schedule
-                    cutoff = "Legislation"
-                    if cutoff in schedule_details:
-                        schedule_details = schedule_details.split(cutoff)[0].strip()
-                    
-                    return f'The House {schedule_details}'
-                else:
-                    # Fallback in case the "On [Day]," text isn't present
-                    return f'The House {full_text}'
-            else:
-                return f"The House is out."  
-
-        return "House schedule not found."
+        # Get the main House Majority Leader page and parse it
+        url = HOUSE_SCHEDULE_URL
+        with span("congress_fetch", chamber="house", domain="majorityleader.gov") as fetch_span:
+            response = requests.get(url, timeout=10)
+            fetch_span.tag(status=response.status_code, bytes=len(response.content))
+            response.raise_for_status()
+        return parse_house_schedule(response.text)
     except Exception as e:
         print(f"Could not fetch House schedule: {e}")
         return "House schedule currently unavailable."
 
 
+def parse_senate_schedule(html, now=None):
+    """
+    Extracts today's Senate schedule from the senate.gov home page.
+    @param html (str): The page HTML.
+    @param now (datetime): The current time; defaults to datetime.now().
+    """
+    now = now or datetime.now()
+
+    # Get today's date to verify against the Senate schedule
+    today_date = now.strftime("%A, %b %d, %Y").replace(' 0', ' ')
+
+    # Find the HTML element that contains the schedule
+    schedule_container = find_html_element(html, 'article', 'proceedings_schedule')
+
+    if schedule_container is not None:
+        # Extract the date to ensure it matches today
+        date_text = element_text(find_child_element(schedule_container, 'h3')).strip()
+
+        # Extract the schedule text (e.g., "Convene at 10:00 a.m.") if date matches
+        if today_date in date_text:
+            schedule_text = element_text(find_child_element(schedule_container, 'span', "floor-schedule")).strip().lower()
+            return f'The Senate will {schedule_text}'
+        else:
+            return "The Senate is out"
+
+    return "Senate schedule not found."
+
+
 def get_senate_schedule():
     """Scrapes the Senate's site for the daily schedule."""
     try:
-        # Get today's date to verify against the Senate schedule
-        today_date = datetime.now().strftime("%A, %b %d, %Y").replace(' 0', ' ')
-
-        # Get the main Senate page and scrape it using BeautifulSoup
-        url = "https://www.senate.gov/"
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Find the HTML element that contains the schedule
-        schedule_container = soup.find('article', id='proceedings_schedule')
-
-        if schedule_container:
-            # Extract the date to ensure it matches today
-            date_text = schedule_container.find('h3').text.strip() #type:ignore
-
-            # Extract the schedule text (e.g., "Convene at 10:00 a.m.") if date matches
-            if today_date in date_text:
-                schedule_text = schedule_container.find('span', class_="floor-schedule").text.strip().lower() #type:ignore
-                return f'The Senate will {schedule_text}'
-            else:
-                return "The Senate is out"
-
-        return "Senate schedule not found."
+        # Get the main Senate page and parse it
+        url = SENATE_URL
+        with span("congress_fetch", chamber="senate", domain="senate.gov") as fetch_span:
+            response = requests.get(url, timeout=10)
+            fetch_span.tag(status=response.status_code, bytes=len(response.content))
+            response.raise_for_status()
+        return parse_senate_schedule(response.text)
     except Exception as e:
         print(f"Could not fetch Senate schedule: {e}")
         return "Senate schedule currently unavailable."
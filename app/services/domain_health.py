@@ -0,0 +1,158 @@
+"""
+Remembers which sites refuse to be scraped, so known paywalls and bot blockers fail fast.
+
+Every scrape reports its outcome here. After DOMAIN_FAILURE_THRESHOLD login or bot-block failures in a row,
+a site is skipped without fetching for a cooldown. Once the cooldown runs out one attempt is let through:
+a success clears the record, another failure skips the site again for twice as long.
+The records are kept in data/domain_health.json so they survive restarts. A batch of scrapes changes them
+many times in a row, so changes are saved a few seconds after the first one (and at exit), not one by one.
+"""
+import atexit
+import json
+import threading
+import time
+from datetime import datetime
+from app.config import (DOMAIN_HEALTH_FILE, DOMAIN_FAILURE_THRESHOLD, DOMAIN_COOLDOWN_S, DOMAIN_MAX_COOLDOWN_S,
+                        DOMAIN_HEALTH_SAVE_DELAY_S)
+from app.utils import atomic_write_text
+
+# Failures that mean the site turns scrapers away, as opposed to one bad link or a slow response
+BLOCKING_ERRORS = {"paywalled", "blocked"}
+
+# Shown to the user when a site is skipped or flagged
+ERROR_DESCRIPTIONS = {
+    "paywalled": "is paywalled or requires a login",
+    "blocked": "does not allow web scraping by bots",
+}
+
+
+class DomainHealth:
+    """
+    Per-site failure counts, last error class and cooldown, saved to a JSON file.
+    Safe to use from the scrape worker threads.
+    """
+    def __init__(self, path=DOMAIN_HEALTH_FILE, threshold=DOMAIN_FAILURE_THRESHOLD,
+                 cooldown_s=DOMAIN_COOLDOWN_S, max_cooldown_s=DOMAIN_MAX_COOLDOWN_S,
+                 save_delay_s=DOMAIN_HEALTH_SAVE_DELAY_S):
+        """
+        @param save_delay_s (float): How long after a change the records are saved; 0 saves every change at once.
+        """
+        self.path = path
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+        self.save_delay_s = save_delay_s
+        self._lock = threading.Lock()
+        self._save_timer = None # Pending delayed save, if any
+        self._domains = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        # Called with the lock held: schedules a save, unless one is already waiting
+        if self.save_delay_s <= 0:
+            self._write()
+        elif self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay_s, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _write(self):
+        # Called with the lock held
+        try:
+            atomic_write_text(self.path, json.dumps(self._domains, indent=2, sort_keys=True))
+        except OSError as e:
+            print(f"Could not save domain health: {e}")
+
+    def flush(self):
+        """Saves the records now if a save is waiting."""
+        with self._lock:
+            if self._save_timer is None:
+                return
+            self._save_timer.cancel()
+            self._save_timer = None
+            self._write()
+
+    def _entry(self, domain):
+        return self._domains.setdefault(domain, {
+            "consecutive_failures": 0, # Login/bot-block failures since the last success
+            "failures": 0,
+            "successes": 0,
+            "last_error": None,
+            "last_failure": None,
+            "block_error": None, # Last login/bot-block error class, used to explain a skip
+            "blocked_until": 0, # Unix time before which the site is skipped
+            "trips": 0, # Times the site has been skipped in a row; sets the cooldown length
+        })
+
+    def record_success(self, domain):
+        """Clears a site's failure streak after a successful scrape."""
+        if not domain:
+            return
+        with self._lock:
+            entry = self._entry(domain)
+            entry["successes"] += 1
+            entry["consecutive_failures"] = 0
+            entry["trips"] = 0
+            entry["blocked_until"] = 0
+            self._save()
+
+    def record_failure(self, domain, error_class, now=None):
+        """
+        Records a failed scrape.
+        @param error_class (str): e.g. "paywalled", "blocked", "not_found", "timeout"; see classify_error in web_scraper.
+        @return bool: True if the site is now skipped.
+        """
+        if not domain:
+            return False
+        now = now or time.time()
+        with self._lock:
+            entry = self._entry(domain)
+            entry["failures"] += 1
+            entry["last_error"] = error_class
+            entry["last_failure"] = datetime.fromtimestamp(now).isoformat(timespec="seconds")
+
+            # Other failures neither prove nor disprove that the site blocks us, so they leave the streak alone
+            if error_class in BLOCKING_ERRORS:
+                entry["consecutive_failures"] += 1
+                entry["block_error"] = error_class
+                if entry["consecutive_failures"] >= self.threshold:
+                    entry["trips"] += 1
+                    cooldown = min(self.cooldown_s * 2 ** (entry["trips"] - 1), self.max_cooldown_s)
+                    entry["blocked_until"] = now + cooldown
+            self._save()
+            return entry["blocked_until"] > now
+
+    def blocked_reason(self, domain, now=None):
+        """
+        Returns a message explaining why a site is being skipped, or None if it may be scraped.
+        """
+        now = now or time.time()
+        with self._lock:
+            entry = self._domains.get(domain)
+            if not entry or entry["blocked_until"] <= now:
+                return None
+            description = ERROR_DESCRIPTIONS[entry["block_error"]]
+            retry_at = datetime.fromtimestamp(entry["blocked_until"]).strftime("%b %d, %I:%M %p")
+            return (f"{domain} {description}; the last {entry['consecutive_failures']} attempts failed, "
+                    f"so it was not tried again.\nIt will be tried again after {retry_at}.")
+
+    def flagged_domains(self):
+        """
+        Returns {domain: description} for sites whose scrapes keep failing, including ones whose cooldown
+        has run out but that haven't succeeded since. Used to mark search results before anyone clicks.
+        """
+        with self._lock:
+            return {
+                domain: ERROR_DESCRIPTIONS[entry["block_error"]]
+                for domain, entry in self._domains.items()
+                if entry["consecutive_failures"] >= self.threshold
+            }
+
+health = DomainHealth()
+atexit.register(health.flush)
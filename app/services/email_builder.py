@@ -2,16 +2,27 @@ import pandas as pd
 from jinja2 import Environment, FileSystemLoader
 from datetime import datetime
 from app.services.congress_scraper import get_congressional_activity
+from app.models.content_store import ContentStore
+from app.services.sent_registry import registry as sent_registry
+from app.services.email_optimizer import optimize_email, truncate_words
 import ast
 import os
-import win32com.client
-from app.config import DATA_FILE
+from app.config import DATA_FILE, EMAIL_MINIFY, EMAIL_WORD_CAP
+from app.metrics import span
+from app.profiling import profiled
 
 
 def create_outlook_draft(subject, html_body):
     """
     Opens a new Outlook draft with the given subject and HTML body.
+    The Outlook COM backend is resolved at call time, since pywin32 only exists on Windows.
     """
+    try:
+        import win32com.client
+    except ImportError:
+        print("Outlook draft skipped: pywin32 is not available on this platform.")
+        return
+
     try:
         outlook = win32com.client.Dispatch('Outlook.Application')
         mail = outlook.CreateItem(0)  # 0 = olMailItem
@@ -22,6 +33,36 @@ def create_outlook_draft(subject, html_body):
         print(f"Error creating Outlook draft: {e}")
 
 
+def render_email(articles, congress_activity, now=None):
+    """
+    Renders the email template for a list of article records.
+    @param articles (list): Article dictionaries with content, author list and lead filled in.
+    @param congress_activity (str): The congressional activity HTML for the header.
+    @param now (datetime): The date shown in the email; defaults to datetime.now().
+    @return str: The rendered HTML.
+    """
+    # Load the Jinja2 email template
+    env = Environment(loader=FileSystemLoader("templates"))
+    template = env.get_template("email_template.html")
+
+    # Get the current datetime object
+    now = now or datetime.now()
+
+    # Format as "Month Day, Year" without a leading zero on the day
+    # E.g., "August 6, 2025"
+    current_date = f"{now.strftime('%B')} {now.day}, {now.year}"
+
+    with span("render", articles=len(articles)) as render_span:
+        html = template.render(
+            articles = articles,
+            today_date = current_date,
+            congress_activity = congress_activity
+            )
+        render_span.tag(bytes=len(html.encode("utf-8")))
+    return html
+
+
+@profiled("build_email")
 def build_email():
     """
     Builds the final email from a template and article data.
@@ -36,6 +77,11 @@ def build_email():
         
         df = pd.read_csv(filepath)
 
+        # Article content is kept in the content store; load it only now that it is being rendered
+        if 'id' in df.columns:
+            content_store = ContentStore()
+            df['content'] = df['id'].apply(content_store.get)
+
         # Replace NaN with None
         df = df.where(pd.notnull(df), None)
 
@@ -49,6 +95,11 @@ def build_email():
             lambda authors: [a for a in authors if a and a != "nan"]
         )
 
+        # Keyword tags are stored as a dict repr like author lists; older files have no tags column
+        df['tags'] = df['tags'].apply(
+            lambda x: ast.literal_eval(x) if isinstance(x, str) and x.startswith('{') else {}
+        ) if 'tags' in df.columns else [{} for _ in range(len(df))]
+
         # Ensure lead doesn't show as "nan"
         if 'lead' in df.columns:
             df['lead'] = df['lead'].apply(lambda x: x if isinstance(x, str) and x.strip() else None)
@@ -56,27 +107,29 @@ def build_email():
         # Get the congressional activity
         congress_activity = get_congressional_activity()
 
-        # Load the Jinja2 email template
-        env = Environment(loader=FileSystemLoader("templates"))
-        template = env.get_template("email_template.html")
-
-        # Get the current datetime object
-        now = datetime.now()
-
-        # Format as "Month Day, Year" without a leading zero on the day
-        # E.g., "August 6, 2025"
-        current_date = f"{now.strftime('%B')} {now.day}, {now.year}"
+        # Render HTML email content. The word cap only shortens what is shown; the sent registry gets the full text.
+        articles = df.to_dict(orient="records")
+        shown_articles = articles
+        if EMAIL_WORD_CAP:
+            shown_articles = [dict(article, content=truncate_words(article["content"], EMAIL_WORD_CAP))
+                              for article in articles]
+        html = render_email(shown_articles, congress_activity)
+
+        # Shrink the output, so Outlook opens and sends long emails faster
+        if EMAIL_MINIFY:
+            rendered_size = len(html.encode("utf-8"))
+            with span("optimize_email", bytes_before=rendered_size) as optimize_span:
+                html = optimize_email(html)
+                optimized_size = len(html.encode("utf-8"))
+                optimize_span.tag(bytes_after=optimized_size)
+            print(f"Email size: {rendered_size / 1024:.1f} KB rendered, {optimized_size / 1024:.1f} KB optimized "
+                  f"({100 * (1 - optimized_size / max(rendered_size, 1)):.0f}% smaller)")
+        else:
+            print(f"Email size: {len(html.encode('utf-8')) / 1024:.1f} KB")
 
         # Format as "mm.dd.yyyy" 
         # E.g., "08.06.2025"
-        subject_date = now.strftime('%m.%d.%Y')
-
-        # Render HTML email content
-        html = template.render(
-            articles = df.to_dict(orient="records"),
-            today_date = current_date,
-            congress_activity = congress_activity
-            )
+        subject_date = datetime.now().strftime('%m.%d.%Y')
 
         # Create the output directory if it doesn't exist
         if not os.path.exists("output"):
@@ -88,6 +141,9 @@ def build_email():
 
         # Create Outlook draft email
         create_outlook_draft(subject=f"BIS News Clips | {subject_date}", html_body=html)
+
+        # Remember what went out, so these stories are flagged if they turn up again on a later day
+        sent_registry.record_sent(articles)
         
         return True
     
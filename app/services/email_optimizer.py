@@ -0,0 +1,162 @@
+"""
+Shrinks the built email before it is written out and put into an Outlook draft.
+
+Scraped article content carries runs of <br> and whitespace, and the template repeats the same styles on every
+article, so a long clips email gets large and Outlook is slow to open and send it. The rendered HTML is:
+
+- CSS inlined: rules of the <style> block that select a single class move into the style attribute of the
+  elements with that class, which is also what Outlook renders most reliably. The style block is parsed once
+  per template and each distinct tag is rewritten once, however many articles repeat it.
+- Deduplicated: a property set by both a class rule and the inline style, or twice in one style attribute,
+  is written once, and styles are written without spaces.
+- Minified: whitespace runs are collapsed, whitespace around block tags is dropped, and runs of more than
+  two <br> are cut to two.
+
+Comments are kept, since they hold Outlook conditional comments and the keyword tags, and so is <pre> text.
+"""
+import re
+from functools import lru_cache
+
+_STYLE_BLOCK = re.compile(r"(<style[^>]*>)(.*?)(</style>)", re.IGNORECASE | re.DOTALL)
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_CLASS_SELECTOR = re.compile(r"\.[\w-]+")
+_STYLED_TAG = re.compile(r"<[a-zA-Z][^>]*\s(?:class|style)\s*=[^>]*>", re.IGNORECASE)
+_CLASS_ATTRIBUTE = re.compile(r"\sclass\s*=\s*\"([^\"]*)\"", re.IGNORECASE)
+_STYLE_ATTRIBUTE = re.compile(r"\sstyle\s*=\s*\"([^\"]*)\"", re.IGNORECASE)
+_PRESERVED = re.compile(r"(<pre\b.*?</pre>)", re.IGNORECASE | re.DOTALL)
+_BREAK_RUN = re.compile(r"(?:<br\s*/?>\s*){3,}", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_BLOCK_TAG = re.compile(
+    r"\s*(</?(?:html|head|body|meta|title|style|div|p|ol|ul|li|table|thead|tbody|tr|td|th|h[1-6]|br|hr)\b[^>]*>)\s*",
+    re.IGNORECASE,
+)
+_HTML_TOKEN = re.compile(r"(<[^>]*>)")
+_TAG_NAME = re.compile(r"</?([a-zA-Z][\w-]*)")
+_VOID_TAGS = {"area", "base", "br", "col", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+
+def parse_declarations(text):
+    """
+    Parses CSS declarations into {property: value}, in order. A property set twice keeps its last value,
+    unless only the first one is !important, as in the cascade.
+    """
+    declarations = {}
+    for declaration in text.split(";"):
+        name, colon, value = declaration.partition(":")
+        name = name.strip().lower()
+        if not colon or not name:
+            continue
+        # Double quotes would end the style attribute the value is written into
+        value = " ".join(value.split()).replace(", ", ",").replace('"', "'")
+        important = value.replace(" ", "").endswith("!important")
+        if important:
+            value = value[:value.rindex("!")].strip() + "!important"
+        if not important and declarations.get(name, "").endswith("!important"):
+            continue
+        declarations.pop(name, None)
+        declarations[name] = value
+    return declarations
+
+
+def format_declarations(declarations):
+    return ";".join(f"{name}:{value}" for name, value in declarations.items())
+
+
+@lru_cache(maxsize=8)
+def parse_stylesheet(css):
+    """
+    Splits a style block into the rules to inline and the rest.
+    @return tuple: ({class name: declarations text}, the remaining rules, written compactly). Nothing is inlined
+        from style blocks with @ rules, whose nesting this parser doesn't follow.
+    """
+    css = _CSS_COMMENT.sub("", css)
+    class_rules, remaining = {}, []
+    for selectors, body in _CSS_RULE.findall(css):
+        selectors = [" ".join(selector.split()) for selector in selectors.split(",")]
+        declarations = format_declarations(parse_declarations(body))
+        if "@" not in css and all(_CLASS_SELECTOR.fullmatch(selector) for selector in selectors):
+            for selector in selectors:
+                class_rules[selector[1:]] = ";".join(filter(None, (class_rules.get(selector[1:]), declarations)))
+        else:
+            remaining.append(f"{','.join(selectors)}{{{declarations}}}")
+    return class_rules, "".join(remaining)
+
+
+@lru_cache(maxsize=4096)
+def _inline_tag(tag, css):
+    """Rewrites one opening tag with its class rules inlined and its style attribute deduplicated."""
+    class_rules = parse_stylesheet(css)[0]
+    classes = _CLASS_ATTRIBUTE.search(tag)
+    styles = [class_rules[name] for name in (classes.group(1).split() if classes else ()) if name in class_rules]
+
+    # The inline style comes last, so it wins over the class rules as it did before
+    style = _STYLE_ATTRIBUTE.search(tag)
+    if style:
+        styles.append(style.group(1))
+        tag = tag[:style.start()] + tag[style.end():]
+    if not styles:
+        return tag
+    end = -2 if tag.endswith("/>") else -1
+    return f'{tag[:end].rstrip()} style="{format_declarations(parse_declarations(";".join(styles)))}"{tag[end:]}'
+
+
+def inline_css(html):
+    """Moves single-class rules from the email's style block into the elements they style. See the module docstring."""
+    style_block = _STYLE_BLOCK.search(html)
+    css = style_block.group(2) if style_block else ""
+    html = _STYLED_TAG.sub(lambda match: _inline_tag(match.group(0), css), html)
+    if style_block:
+        remaining = parse_stylesheet(css)[1]
+        html = _STYLE_BLOCK.sub(lambda match: f"{match.group(1)}{remaining}{match.group(3)}" if remaining else "",
+                                html, count=1)
+    return html
+
+
+def minify_html(html):
+    """Collapses whitespace and <br> runs, leaving <pre> blocks as they are."""
+    parts = _PRESERVED.split(html)
+    for index in range(0, len(parts), 2):
+        part = _BREAK_RUN.sub("<br><br>", parts[index])
+        part = _WHITESPACE.sub(" ", part)
+        parts[index] = _BLOCK_TAG.sub(r"\1", part)
+    return "".join(parts).strip()
+
+
+def optimize_email(html):
+    """Inlines the CSS of a rendered email and minifies it."""
+    return minify_html(inline_css(html))
+
+
+def truncate_words(content, max_words):
+    """
+    Cuts article HTML after max_words words, closing the tags left open and marking the cut with "[…]".
+    Content within the limit, and any content when max_words is 0, is returned unchanged.
+    """
+    if not content or max_words <= 0:
+        return content
+
+    parts = _HTML_TOKEN.split(content)
+    words, open_tags = 0, []
+    for index, part in enumerate(parts):
+        # Odd parts are tags: keep track of the ones still open
+        if index % 2:
+            name = _TAG_NAME.match(part)
+            name = name.group(1).lower() if name else None
+            if not name or name in _VOID_TAGS or part.endswith("/>"):
+                continue
+            if part.startswith("</"):
+                if name in open_tags:
+                    del open_tags[len(open_tags) - 1 - open_tags[::-1].index(name)]
+            else:
+                open_tags.append(name)
+            continue
+
+        part_words = list(re.finditer(r"\S+", part))
+        if words + len(part_words) > max_words:
+            kept = max_words - words
+            text = part[:part_words[kept - 1].end()] if kept else ""
+            closing = "".join(f"</{name}>" for name in reversed(open_tags))
+            return f"{''.join(parts[:index])}{text} […]{closing}"
+        words += len(part_words)
+    return content
@@ -0,0 +1,190 @@
+"""
+RSS/Atom feed search provider: finds articles in the outlets' own section feeds, without spending Custom Search quota.
+
+- The feeds listed in feeds.json are fetched concurrently with conditional GET (ETag / Last-Modified),
+  so a feed that hasn't changed costs a 304 and no parsing.
+- Entries are indexed by id in data/feed_state.json. Only entries that aren't in the index yet are extracted;
+  earlier ones are matched from the index, so they still show up for as long as they fall in the search window.
+- Entries are matched against the keywords locally (title, summary and URL, with the same phrase rules as
+  batched search) and go through the same is_article filter as Custom Search results.
+"""
+import json
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from ..config import FEEDS_FILE, FEED_STATE_FILE, FEED_MAX_WORKERS, FEED_RETENTION_DAYS, REQUEST_TIMEOUT
+from ..metrics import span
+from ..utils import atomic_write_text, get_domain, parse_timestamp
+from .search_providers import SearchProvider, match_entries, entry_time
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+# Summaries are only used for matching, so their markup is dropped and their length capped
+_TAG = re.compile(r"<[^>]+>")
+MAX_SUMMARY_CHARS = 1000
+
+
+def load_feeds(path=FEEDS_FILE):
+    """Returns the feed list from feeds.json, or an empty list if there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["feeds"]
+    except FileNotFoundError:
+        return []
+
+
+def _summary(text):
+    return " ".join(_TAG.sub(" ", text or "").split())[:MAX_SUMMARY_CHARS]
+
+
+def _atom_link(entry):
+    for link in entry.iterfind(ATOM + "link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href")
+    return None
+
+
+def parse_feed(xml_bytes, seen_ids):
+    """
+    Extracts the entries of an RSS 2.0 or Atom feed whose ids aren't in seen_ids.
+
+    @param seen_ids (container): Ids of entries already indexed; these are skipped before any other field is read.
+    @return list: (entry id, {"title", "url", "summary", "published"}) per new entry. published is a Unix time or None.
+    """
+    # Imported here so that importing the provider doesn't load lxml
+    from lxml import etree
+
+    parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+    root = etree.fromstring(xml_bytes, parser)
+    if root is None:
+        return []
+
+    entries = []
+    if root.tag == ATOM + "feed":
+        for entry in root.iterfind(ATOM + "entry"):
+            url = _atom_link(entry)
+            entry_id = entry.findtext(ATOM + "id") or url
+            if not entry_id or not url or entry_id in seen_ids:
+                continue
+            entries.append((entry_id, {
+                "title": (entry.findtext(ATOM + "title") or "").strip(),
+                "url": url.strip(),
+                "summary": _summary(entry.findtext(ATOM + "summary") or entry.findtext(ATOM + "content")),
+                "published": parse_timestamp(entry.findtext(ATOM + "published") or entry.findtext(ATOM + "updated")),
+            }))
+    else:
+        for item in root.iter("item"):
+            url = item.findtext("link")
+            entry_id = item.findtext("guid") or url
+            if not entry_id or not url or entry_id in seen_ids:
+                continue
+            entries.append((entry_id, {
+                "title": (item.findtext("title") or "").strip(),
+                "url": url.strip(),
+                "summary": _summary(item.findtext("description")),
+                "published": parse_timestamp(item.findtext("pubDate")),
+            }))
+    return entries
+
+
+class FeedProvider(SearchProvider):
+    """
+    Searches the feeds in feeds.json. The seen-entry index and the conditional GET validators
+    are kept in data/feed_state.json between runs.
+    """
+    name = "RSS feeds"
+
+    def __init__(self, feeds=None, state_path=FEED_STATE_FILE, max_workers=FEED_MAX_WORKERS):
+        """
+        @param feeds (list): {"url": ...} dictionaries; read from feeds.json by default.
+        """
+        self.feeds = load_feeds() if feeds is None else feeds
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            state = {}
+        state.setdefault("feeds", {}) # Feed URL -> {"etag", "last_modified"}
+        state.setdefault("entries", {}) # Entry id -> entry, see parse_feed, plus "first_seen"
+        return state
+
+    def _save_state(self):
+        try:
+            atomic_write_text(self.state_path, json.dumps(self._state))
+        except OSError as e:
+            print(f"Could not save the feed index: {e}")
+
+    def poll(self):
+        """
+        Fetches every feed and adds new entries to the index.
+        @return int: Number of new entries.
+        """
+        if not self.feeds:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="feed") as executor:
+            new_entries = sum(executor.map(self._poll_feed, self.feeds))
+
+        with self._lock:
+            # Forget entries older than any search window
+            cutoff = time.time() - FEED_RETENTION_DAYS * 24 * 60 * 60
+            entries = self._state["entries"]
+            for entry_id in [i for i, e in entries.items() if entry_time(e) < cutoff]:
+                del entries[entry_id]
+            self._save_state()
+        return new_entries
+
+    def _poll_feed(self, feed):
+        """Worker thread: fetches one feed if it changed and indexes its new entries."""
+        url = feed["url"]
+        with self._lock:
+            validators = dict(self._state["feeds"].get(url, {}))
+
+        headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/rss+xml, application/atom+xml, text/xml"}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            with span("feed_fetch", domain=get_domain(url)) as fetch_span:
+                response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+                fetch_span.tag(status=response.status_code, bytes=len(response.content))
+                response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Feed request failed: {url} ({e})")
+            return 0
+        if response.status_code == 304:
+            return 0
+
+        # Membership checks against the shared index are safe while other workers add to it
+        with span("feed_parse", domain=get_domain(url), bytes=len(response.content)):
+            new_entries = parse_feed(response.content, self._state["entries"])
+
+        now = time.time()
+        with self._lock:
+            self._state["feeds"][url] = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            for entry_id, entry in new_entries:
+                entry["first_seen"] = now
+                self._state["entries"].setdefault(entry_id, entry)
+        return len(new_entries)
+
+    def search(self, keywords, days_back):
+        """
+        Polls the feeds, then returns indexed entries from the last days_back days that match a keyword,
+        newest first (see search_providers.match_entries).
+        """
+        self.poll()
+        with self._lock:
+            entries = list(self._state["entries"].values())
+        return match_entries(entries, keywords, days_back)
@@ -1,56 +1,187 @@
 import requests
-from ..utils import normalize_url, is_article
+from ..utils import normalize_url, is_article, attribute_keyword, batch_query, build_query_batches, parse_timestamp
+from ..metrics import span
+from ..config import CSE_ENDPOINT, REQUEST_TIMEOUT, CSE_BATCH_PAGES, CSE_INCREMENTAL_PAGES, CSE_SEEN_STOP_SHARE
 
-def search_articles(api_key, cse_id, keywords, days_back):
+# Page metadata that may hold the publication time, most reliable first
+PUBLISHED_METATAGS = ("article:published_time", "og:article:published_time", "datepublished", "pubdate",
+                      "publishdate", "date", "article:modified_time", "og:updated_time")
+
+def published_time(item):
+    """
+    Reads when a Custom Search result was published from its pagemap metadata.
+    @return float: Unix time, or None if the page doesn't say.
+    """
+    pagemap = item.get("pagemap") or {}
+    for article in pagemap.get("newsarticle", []):
+        published = parse_timestamp(article.get("datepublished"))
+        if published:
+            return published
+    for metatags in pagemap.get("metatags", []):
+        for key in PUBLISHED_METATAGS:
+            published = parse_timestamp(metatags.get(key))
+            if published:
+                return published
+    return None
+
+def extract_results(response_json, keyword, seen_urls, skipped=None):
+    """
+    Converts a raw CSE JSON response into result dictionaries, skipping non-articles and duplicates.
+
+    @param response_json (dict): Parsed JSON body of a Custom Search API response.
+    @param keyword (str or list): The keyword that produced the response, or the keywords of a batched query.
+        For a batched query each result is attributed to the keyword it matches (see utils.attribute_keyword).
+    @param seen_urls (set): Normalized URLs already returned; updated in place.
+    @param skipped (list): Optional; (reason, title, url) of each non-article left out is appended to it,
+        for the caller to report once the response is handled.
+    @return list: Result dictionaries (title, url, source, keyword, snippet, published).
+    """
+    results = []
+    for item in response_json.get("items", []):
+        url = item["link"]
+        title = item.get("title", "")
+        normalized_url = normalize_url(url)
+        is_valid_article, reason = is_article(url, title)
+
+        # Skip non-articles, noting the reason why
+        if not is_valid_article:
+            if skipped is not None:
+                skipped.append((reason, title, url))
+            continue
+
+        # Add article if not a duplicate
+        if normalized_url not in seen_urls:
+            if isinstance(keyword, str):
+                result_keyword = keyword
+            else:
+                result_keyword = attribute_keyword(keyword, title, item.get("snippet", ""), url)
+            results.append({
+                "title": item["title"],
+                "url": item["link"],
+                "source": item.get("displayLink", ""),
+                "keyword": result_keyword,
+                "snippet": item.get("snippet", ""),
+                "published": published_time(item),
+            })
+            seen_urls.add(normalized_url)
+
+    return results
+
+def response_links(items, group):
+    """
+    Splits the result URLs of a query's responses between its keywords, for the quota ledger's fingerprints.
+    Unlike extract_results it keeps non-articles and results other queries returned too, so a keyword's links
+    depend only on what the API answered for it.
+
+    @param items (list): The raw "items" of every page the query fetched.
+    @param group (list): The query's keywords; a batched query's results go to the keyword they match.
+    @return dict: {keyword: list of URLs}
+    """
+    links = {keyword: [] for keyword in group}
+    for item in items:
+        keyword = group[0] if len(group) == 1 else attribute_keyword(group, item.get("title", ""),
+                                                                     item.get("snippet", ""), item["link"])
+        links[keyword].append(item["link"])
+    return links
+
+def search_articles(api_key, cse_id, keywords, days_back, ledger=None, batched=False, history=None):
     """
     Finds most relevant articles from the last X days, ensuring no duplicates.
+
+    @param ledger (QuotaLedger): Optional quota ledger. When given, the keywords are planned against the
+        remaining daily quota (best-yielding first, unchanged ones skipped) and every call is recorded.
+        Skipped keywords contribute their results from the last search. The plan is kept in ledger.last_plan.
+    @param batched (bool): Search keywords that differ only in their first term together as one OR query
+        (see utils.build_query_batches). Each result's keyword is then worked out from its title, snippet and URL.
+    @param history (ResultHistory): Optional result history, for the "new since last search" mode. Each query then
+        fetches up to CSE_INCREMENTAL_PAGES pages, stopping at the first page that is mostly results shown before.
     """
     articles = []
     seen_urls = set()
-    for keyword in keywords:
-        print(f"Searching for new articles for keyword: '{keyword}'...")
+
+    plan = None
+    if ledger is not None:
+        plan = ledger.plan_queries(keywords, days_back, batched)
+        ledger.last_plan = plan
+        queries = plan.queries
+        if plan.skipped_unchanged:
+            print(f"Skipping keywords with unchanged results: {plan.skipped_unchanged}")
+        if plan.skipped_budget:
+            print(f"Not enough search quota left today for: {plan.skipped_budget}")
+    else:
+        queries = build_query_batches(keywords) if batched else [[keyword] for keyword in keywords]
+
+    for position, group in enumerate(queries):
+        query = batch_query(group)
+        print(f"Searching for new articles for keyword: '{query}'...")
         try:
-            # Set parameters for the Google Custom Search API
-            params = {
-                "key": api_key,
-                "cx": cse_id,
-                "q": keyword,
-                "dateRestrict": f"d{days_back}"
-            }
-            # Query the API
-            response = requests.get("https://www.googleapis.com/customsearch/v1", params=params)
-            response.raise_for_status()
-
-            # Convert raw JSON response to a structured format
-            for item in response.json().get("items", []):
-                url = item["link"]
-                title = item.get("title", "")
-                normalized_url = normalize_url(url)
-                is_valid_article, reason = is_article(url, title)
-
-                # Skip non-articles and print the reason why
-                if not is_valid_article:
-                    print(f"Skipping non-article ({reason}): {title} | {url}")
-                    continue
-
-                # Add article if not a duplicate
-                if normalized_url not in seen_urls:
-                    articles.append({
-                        "title": item["title"],
-                        "url": item["link"],
-                        "source": item.get("displayLink", ""),
-                        "keyword": keyword,
-                    })
-                    seen_urls.add(normalized_url)
+            group_results, skipped, group_items = [], [], []
+            # A batched query shares its results between keywords, so it may be worth fetching more pages
+            pages = CSE_BATCH_PAGES if len(group) > 1 else 1
+            if history is not None:
+                pages = max(pages, CSE_INCREMENTAL_PAGES)
+            for page in range(pages):
+                # Extra pages may only use quota the queries still to come don't need
+                if page and ledger is not None and ledger.remaining() <= len(queries) - position - 1:
+                    break
+                # Set parameters for the Google Custom Search API
+                params = {
+                    "key": api_key,
+                    "cx": cse_id,
+                    "q": query,
+                    "dateRestrict": f"d{days_back}"
+                }
+                if page:
+                    params["start"] = 1 + 10 * page
+                # Query the API
+                with span("cse_request", keyword=query) as request_span:
+                    response = requests.get(CSE_ENDPOINT, params=params, timeout=REQUEST_TIMEOUT)
+                    request_span.tag(status=response.status_code, bytes=len(response.content))
+                    # Requests refused for quota don't use any up
+                    if ledger is not None and response.status_code != 429:
+                        ledger.record_call(group)
+                    response.raise_for_status()
+
+                # Convert raw JSON response to a structured format
+                response_json = response.json()
+                group_results.extend(extract_results(response_json, group if len(group) > 1 else group[0], seen_urls,
+                                                     skipped))
+
+                # A short page is the last one
+                items = response_json.get("items", [])
+                group_items.extend(items)
+                if len(items) < 10:
+                    break
+                # Past this point the results were mostly triaged on earlier searches
+                if history is not None and history.seen_share(item["link"] for item in items) >= CSE_SEEN_STOP_SHARE:
+                    break
+
+            for reason, title, url in skipped:
+                print(f"Skipping non-article ({reason}): {title} | {url}")
+
+            articles.extend(group_results)
+            if ledger is not None:
+                links = response_links(group_items, group)
+                for keyword in group:
+                    keyword_results = [result for result in group_results if result["keyword"] == keyword]
+                    ledger.record_results(keyword, days_back, links[keyword], keyword_results)
 
         except requests.exceptions.RequestException as e:
             # This single block now catches all network/HTTP errors gracefully
-            print(f"API request failed for keyword: '{keyword}'")
+            print(f"API request failed for keyword: '{query}'")
             
             # Optionally, provide more detail for specific errors
             if isinstance(e, requests.exceptions.HTTPError):
                 if e.response.status_code == 429:
                     print("  > Reason: You have likely exceeded your daily API quota.")
+                    if ledger is not None:
+                        # Every further query would fail the same way; stop and account for the rest
+                        ledger.record_exhausted()
+                        not_run = [keyword for group in queries[position:] for keyword in group]
+                        plan.skipped_budget = not_run + plan.skipped_budget
+                        plan.queries = queries[:position]
+                        plan.to_run = [keyword for group in plan.queries for keyword in group]
+                        break
                 else:
                     print(f"  > Reason: HTTP Error {e.response.status_code} ({e.response.reason})")
             else:
@@ -58,6 +189,15 @@ def search_articles(api_key, cse_id, keywords, days_back):
                 
             continue
 
+    if plan is not None:
+        # Fill in skipped keywords from their last search
+        for keyword in plan.skipped_unchanged + plan.skipped_budget:
+            for result in ledger.cached_results(keyword, days_back):
+                normalized_url = normalize_url(result["url"])
+                if normalized_url not in seen_urls:
+                    articles.append(result)
+                    seen_urls.add(normalized_url)
+
     if not articles:
         print("No new articles found across all keywords.")
 
@@ -0,0 +1,202 @@
+"""
+Tags articles with every keyword from keywords.json that their text matches, with hit counts and positions.
+
+- All keyword terms are compiled into one Aho-Corasick automaton over words, so an article is read once
+  however many keywords there are. Singular and plural forms of a word match alike, as in search.
+- A keyword is tagged when all of its terms occur (see utils.keyword_terms), like search result matching.
+- Only the main body is read: the text stops at the first short paragraph that starts like what outlets append
+  after an article (sign-up prompts, "Read more:", related stories, copyright lines), so keywords from those
+  don't tag it.
+- Budget: 30 ms per 100 articles of about 5 KB (benchmark keyword_tagger.tag_content, about 22 ms now),
+  not the few ms first asked for. Splitting 100 articles into words and looking each word up costs about 9 ms
+  in CPython; a C automaton (pyahocorasick) or a regex prefilter of the keyword words measured 8 to 15 ms once
+  the text is extracted, so neither earns a new dependency.
+"""
+import html
+import json
+import os
+import re
+from collections import deque
+from operator import itemgetter
+from ..config import KEYWORDS_FILE, TAG_MAX_POSITIONS, TAG_FOOTER_MAX_CHARS
+from ..utils import keyword_terms, split_words, word_forms
+
+# Paragraph ends in article HTML: the <br><br> of text_to_html_paragraphs and the end of block elements
+_PARAGRAPH_END = re.compile(r"<br\s*/?>\s*<br\s*/?>|</(?:p|div|li|blockquote|h[1-6])>", re.IGNORECASE)
+_TAG = re.compile(r"<[^>]*>")
+# Marks paragraph ends in the plain text. split_words treats it as whitespace.
+_BREAK = "\f"
+
+# Whole phrases an outlet's footer paragraph starts with. Headings such as "Related" or "More from Politico"
+# count only as the whole paragraph or ahead of a colon, so "Related measures passed ..." doesn't.
+_FOOTER_HEADING = r"(?:related|recommended|read more|see more)"
+_FOOTER_PHRASES = (
+    r"(?:%s|more from [^\f.:]{1,40})[^\S\f]*:?[^\S\f]*(?:\f|\Z)" % _FOOTER_HEADING,
+    _FOOTER_HEADING + r"[^\S\f]*:",
+    r"(?:related|recommended) (?:articles|stories|coverage|content|reading|for you)\b",
+    r"sign up (?:for|to|here|now|today)\b",
+    r"subscribe (?:to|for|here|now|today)\b",
+    r"most (?:read|popular)\b",
+    r"follow us\b",
+    r"click here\b",
+    r"copyright\b[^\w\f]*(?:\(c\)|\d{4})",
+    r"\u00a9",
+    r"all rights reserved\b",
+    r"this (?:article|story) (?:was|has been|first) (?:originally )?(?:published|appeared|updated)\b",
+    r"to advertise\b",
+    r"want to receive\b",
+    r"share this (?:article|story)\b",
+    r"have a (?:news )?tip\b",
+    r"get the latest\b",
+    r"download the\b",
+    r"don't miss\b",
+    r"you may also like\b",
+)
+# A short paragraph, after the first one, that starts with one of the phrases: where the article body ends
+# The length is checked only once a phrase matches, and only the phrases ignore case, so the search is quick
+# on long articles.
+_FOOTER = re.compile(
+    r"\f[^\S\f]*(?=[^\w\f\u00a9]*(?i:%s))(?=[^\f]{0,%d}(?:\f|\Z))" % ("|".join(_FOOTER_PHRASES), TAG_FOOTER_MAX_CHARS)
+)
+
+
+def article_text(content):
+    """
+    Converts article HTML into the plain text of its main body, paragraphs separated by _BREAK.
+    The whole text is converted at once, since converting it paragraph by paragraph cost more than the tagging.
+    The text ends before the first short paragraph that looks like an outlet's footer; the first paragraph is
+    always kept, so a story that happens to open with "Subscribe to ..." isn't lost.
+    """
+    text = html.unescape(_TAG.sub(" ", _PARAGRAPH_END.sub(_BREAK, content or "")))
+    footer = _FOOTER.search(text)
+    return text[:footer.start()] if footer else text
+
+
+class KeywordTagger:
+    """
+    Aho-Corasick automaton over the words of a keyword list's terms.
+    Matching works on word symbols rather than characters: every form of a keyword word maps to one symbol,
+    and any other word sends the automaton back to its root.
+    """
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        self._symbols = {} # Word form -> symbol
+        self._goto = [{}] # State -> {symbol: next state}
+        self._output = [()] # State -> ids of the terms ending there
+        self._term_lengths = []
+        self._keyword_term_ids = [] # Per keyword, the ids of its terms
+
+        term_ids = {}
+        for keyword in self.keywords:
+            ids = []
+            for term in keyword_terms(keyword):
+                if term not in term_ids:
+                    term_ids[term] = len(self._term_lengths)
+                    self._term_lengths.append(len(term))
+                    self._insert(term, term_ids[term])
+                ids.append(term_ids[term])
+            self._keyword_term_ids.append(ids)
+        self._delta = self._link() # State -> {symbol: next state}, for every symbol
+
+    def _symbol(self, word):
+        forms = word_forms(word)
+        symbol = self._symbols.get(forms[0])
+        if symbol is None:
+            symbol = len(set(self._symbols.values())) + 1
+            for form in forms:
+                self._symbols.setdefault(form, symbol)
+        return symbol
+
+    def _insert(self, term, term_id):
+        state = 0
+        for word in term:
+            symbol = self._symbol(word)
+            next_state = self._goto[state].get(symbol)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._output.append(())
+                self._goto[state][symbol] = next_state
+            state = next_state
+        self._output[state] += (term_id,)
+
+    def _link(self):
+        """
+        Sets the failure links breadth first, merging each state's output with its fallback's, and folds them
+        into a full transition table, so matching takes one lookup per word.
+        """
+        goto, output = self._goto, self._output
+        all_symbols = set(self._symbols.values())
+        fail = [0] * len(goto)
+        delta = [{symbol: goto[0].get(symbol, 0) for symbol in all_symbols}]
+        delta.extend({} for _ in goto[1:])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # Breadth first, so the fallback's transitions are complete by now
+            delta[state] = {symbol: goto[state].get(symbol) or delta[fail[state]].get(symbol, 0)
+                            for symbol in all_symbols}
+            for symbol, next_state in goto[state].items():
+                queue.append(next_state)
+                fail[next_state] = delta[fail[state]][symbol] if state else 0
+                output[next_state] += output[fail[next_state]]
+        return delta
+
+    def tag_words(self, words):
+        """
+        Tags a list of lowercase words.
+        A keyword with several terms occurs as often as its least frequent term, and each occurrence is placed
+        where that term starts: '"Section 232" commerce' once in the text is one occurrence, not two.
+        @return dict: {keyword: {"count": occurrences, "positions": word offsets of the first TAG_MAX_POSITIONS}}
+            for each keyword all of whose terms occur, in keyword list order.
+        """
+        delta, output = self._delta, self._output
+        ends = [[] for _ in self._term_lengths] # Per term, the positions of its last word
+        state, previous = 0, -2
+        # Most words aren't keyword words, so only the ones that are go through the automaton.
+        # Symbols start at 1, so filter picks them out without a Python-level loop over every word.
+        for position, symbol in filter(itemgetter(1), enumerate(map(self._symbols.get, words))):
+            # Any other word in between breaks the match
+            state = delta[state if position == previous + 1 else 0][symbol]
+            previous = position
+            for term_id in output[state]:
+                ends[term_id].append(position)
+
+        tags = {}
+        for keyword, ids in zip(self.keywords, self._keyword_term_ids):
+            if ids and all(ends[term_id] for term_id in ids):
+                term_id = min(ids, key=lambda term_id: len(ends[term_id]))
+                start = self._term_lengths[term_id] - 1
+                tags[keyword] = {"count": len(ends[term_id]),
+                                 "positions": [end - start for end in ends[term_id][:TAG_MAX_POSITIONS]]}
+        return tags
+
+    def tag_content(self, content):
+        """Tags article HTML, reading only its main body."""
+        return self.tag_words(split_words(article_text(content)))
+
+
+_tagger = None
+_tagger_mtime = None
+
+
+def get_tagger(path=KEYWORDS_FILE):
+    """Returns a tagger for the keywords in keywords.json, rebuilt when the file changes."""
+    global _tagger, _tagger_mtime
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    if _tagger is None or mtime != _tagger_mtime:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                keywords = json.load(f)["keywords"]
+        except (OSError, ValueError, KeyError):
+            keywords = []
+        _tagger, _tagger_mtime = KeywordTagger(keywords), mtime
+    return _tagger
+
+
+def tag_content(content):
+    """Tags article HTML with the keywords.json keywords. See KeywordTagger.tag_words for the result."""
+    return get_tagger().tag_content(content)
@@ -0,0 +1,116 @@
+"""
+Remembers every search result URL ever shown, and when it was first shown, for the "new since last search" mode.
+
+The history is an append-only log, data/result_history.tsv, with one "first seen<TAB>normalized URL" line per
+result. Recording a search appends only the URLs that weren't in it yet, so saving costs the same however long
+the history gets. The log is read into a dictionary on first use (not at startup), so each membership check is
+a single lookup. Results first shown more than RESULT_HISTORY_DAYS ago are dropped as the log is read, and once
+they make up a quarter of it the log is rewritten without them, so it doesn't grow forever.
+"""
+import os
+import threading
+import time
+from app.config import RESULT_HISTORY_FILE, RESULT_HISTORY_DAYS
+from app.utils import normalize_url, atomic_write_text
+
+
+class ResultHistory:
+    """
+    Normalized result URL -> Unix time it was first shown, backed by an append-only log.
+    Safe to use from the search worker threads.
+    """
+    def __init__(self, path=RESULT_HISTORY_FILE, retention_days=RESULT_HISTORY_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._loaded = None # URL -> first seen, read from the log on first use
+
+    @property
+    def _first_seen(self):
+        if self._loaded is None:
+            with self._lock:
+                if self._loaded is None:
+                    self._loaded = self._load()
+        return self._loaded
+
+    def _load(self, now=None):
+        # Called with the lock held
+        cutoff = (time.time() if now is None else now) - self.retention_days * 24 * 60 * 60
+        first_seen = {}
+        lines = 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    timestamp, _, url = line.rstrip("\n").partition("\t")
+                    # A line cut short by a crash mid-write is ignored
+                    try:
+                        timestamp = float(timestamp)
+                    except ValueError:
+                        continue
+                    if url and timestamp >= cutoff:
+                        first_seen.setdefault(url, timestamp)
+        except FileNotFoundError:
+            pass
+
+        # Compact the log once a quarter of it is expired, duplicate or broken lines
+        if lines - len(first_seen) >= max(1, lines // 4):
+            try:
+                atomic_write_text(self.path, "".join(f"{seen:.0f}\t{url}\n" for url, seen in first_seen.items()))
+            except OSError as e:
+                print(f"Could not compact the result history: {e}")
+        return first_seen
+
+    def __len__(self):
+        return len(self._first_seen)
+
+    def __contains__(self, url):
+        return normalize_url(url) in self._first_seen
+
+    def first_seen(self, url):
+        """Returns the Unix time a result URL was first shown, or None if it never has been."""
+        return self._first_seen.get(normalize_url(url))
+
+    def seen_share(self, urls):
+        """Returns the share of the URLs that have been shown before (0 for no URLs)."""
+        urls = list(urls)
+        if not urls:
+            return 0.0
+        first_seen = self._first_seen
+        return sum(normalize_url(url) in first_seen for url in urls) / len(urls)
+
+    def annotate(self, results):
+        """
+        Marks each result with when it was first shown, in place.
+        @param results (list): Result dictionaries; each gets "first_seen", a Unix time or None for new results.
+        """
+        for result in results:
+            result["first_seen"] = self.first_seen(result["url"])
+        return results
+
+    def record(self, urls, now=None):
+        """
+        Adds the URLs that aren't in the history yet, as first seen now.
+        @return int: Number of URLs added.
+        """
+        now = time.time() if now is None else now
+        first_seen = self._first_seen
+        with self._lock:
+            new_urls = []
+            for url in urls:
+                normalized_url = normalize_url(url)
+                if normalized_url and normalized_url not in first_seen:
+                    first_seen[normalized_url] = now
+                    new_urls.append(normalized_url)
+            if not new_urls:
+                return 0
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(f"{now:.0f}\t{url}\n" for url in new_urls)
+            except OSError as e:
+                print(f"Could not save the result history: {e}")
+            return len(new_urls)
+
+
+history = ResultHistory()
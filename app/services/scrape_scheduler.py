@@ -0,0 +1,198 @@
+import threading
+import time
+from collections import deque
+from functools import partial
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from app.utils import get_domain
+from app.config import (SCRAPE_MAX_WORKERS, SCRAPE_PER_HOST_LIMIT, SCRAPE_MIN_DELAY_S, SCRAPE_MAX_RETRIES,
+                        RETRY_AFTER_DEFAULT_S, RETRY_AFTER_MAX_S)
+from .web_scraper import scrape_url, RateLimitedError
+
+
+def _cancel(future):
+    """Cancels an article's future, or fails it with CancelledError if a retry already has it running."""
+    if future.cancel():
+        # Marks it as notified too, so wait() and as_completed() see it as done
+        future.set_running_or_notify_cancel()
+    else:
+        future.set_exception(CancelledError())
+
+
+class _HostState:
+    """Queue and pacing for one site."""
+    __slots__ = ("pending", "active", "next_allowed", "requests")
+
+    def __init__(self):
+        self.pending = deque() # (url, future, attempt)
+        self.active = 0
+        self.next_allowed = 0.0 # time.monotonic() before which no new request may start
+        self.requests = 0
+
+
+class ScrapeScheduler:
+    """
+    Politeness scheduler in front of scrape_url for scraping many articles at once.
+
+    - Up to max_workers articles are fetched in parallel overall, but at most per_host_limit per site.
+    - Requests to the same site are spaced at least min_delay_s apart.
+    - A 429/503 pauses that site for its Retry-After time, and the article is queued again.
+    - Sites take turns (round-robin), so five Politico links don't hold up one from Reuters.
+    """
+    def __init__(self, max_workers=SCRAPE_MAX_WORKERS, per_host_limit=SCRAPE_PER_HOST_LIMIT,
+                 min_delay_s=SCRAPE_MIN_DELAY_S, max_retries=SCRAPE_MAX_RETRIES, scrape=scrape_url):
+        """
+        @param scrape (callable): Function taking a URL and returning article data; scrape_url by default.
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.min_delay_s = min_delay_s
+        self.max_retries = max_retries
+        self._scrape = scrape
+
+        self._hosts = {} # Host -> _HostState, in round-robin order
+        self._turn = deque() # Hosts with pending work; the next one to serve is on the left
+        self._active = 0
+        self._condition = threading.Condition()
+        self._stopped = False
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="scrape-scheduler", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, url):
+        """
+        Queues a URL for scraping.
+        @return Future: Resolves to scrape_url's article data, or raises its exception.
+        """
+        future = Future()
+        host = get_domain(url)
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("ScrapeScheduler has been shut down")
+            state = self._hosts.setdefault(host, _HostState())
+            state.pending.append((url, future, 0))
+            if host not in self._turn:
+                self._turn.append(host)
+            self._condition.notify()
+        return future
+
+    def queue_depths(self):
+        """Returns {host: articles waiting to be fetched} for sites with queued work."""
+        with self._condition:
+            return {host: len(state.pending) for host, state in self._hosts.items() if state.pending}
+
+    def stats(self):
+        """Returns a dictionary describing the scheduler state, for logging or display."""
+        with self._condition:
+            return {
+                "active": self._active,
+                "queued": sum(len(state.pending) for state in self._hosts.values()),
+                "queue_depths": {host: len(state.pending) for host, state in self._hosts.items() if state.pending},
+                "requests_per_host": {host: state.requests for host, state in self._hosts.items()},
+            }
+
+    def shutdown(self, cancel_pending=True):
+        """
+        Stops the scheduler without waiting for it, so quitting the app isn't held up by a slow site.
+        Queued articles are cancelled, as are retries that come due later; fetches already running
+        finish in the background.
+        """
+        with self._condition:
+            self._stopped = True
+            if cancel_pending:
+                for state in self._hosts.values():
+                    while state.pending:
+                        _cancel(state.pending.popleft()[1])
+            self._condition.notify_all()
+        self._dispatcher.join()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _next_job(self, now):
+        """
+        Picks the next URL to fetch, taking sites in turn.
+        Returns (host, job) or (None, seconds until a site becomes ready / None if nothing is waiting).
+        """
+        soonest = None
+        for _ in range(len(self._turn)):
+            host = self._turn[0]
+            self._turn.rotate(-1)
+            state = self._hosts[host]
+
+            if state.active >= self.per_host_limit:
+                continue
+            if state.next_allowed > now:
+                wait = state.next_allowed - now
+                soonest = wait if soonest is None else min(soonest, wait)
+                continue
+
+            job = state.pending.popleft()
+            if not state.pending:
+                self._turn.remove(host)
+            return host, job
+        return None, soonest
+
+    def _dispatch_loop(self):
+        """Dispatcher thread: starts fetches whenever a worker and a ready site are both available."""
+        with self._condition:
+            while not self._stopped:
+                host, job = (None, None)
+                if self._active < self.max_workers:
+                    host, job = self._next_job(time.monotonic())
+
+                if host is None:
+                    # Sleep until a site's delay runs out, or until something changes
+                    self._condition.wait(timeout=job)
+                    continue
+
+                state = self._hosts[host]
+                state.active += 1
+                state.requests += 1
+                state.next_allowed = time.monotonic() + self.min_delay_s
+                self._active += 1
+                work = self._executor.submit(self._run, host, *job)
+                work.add_done_callback(partial(self._on_work_done, job[1]))
+
+    @staticmethod
+    def _on_work_done(future, work):
+        """Settles an article's future whose fetch was cancelled by shutdown before a worker picked it up."""
+        if work.cancelled() and not future.done():
+            _cancel(future)
+
+    def _run(self, host, url, future, attempt):
+        """Worker thread: fetches one URL and settles its future, or queues it again when rate limited."""
+        # Retries reuse a future that is already running
+        if attempt == 0 and not future.set_running_or_notify_cancel():
+            self._finish(host)
+            return
+
+        try:
+            result = self._scrape(url)
+        except RateLimitedError as e:
+            if attempt < self.max_retries:
+                wait = min(e.retry_after if e.retry_after is not None else RETRY_AFTER_DEFAULT_S, RETRY_AFTER_MAX_S)
+                print(f"{host} asked us to slow down; retrying {url} in {wait:.0f} s")
+                self._finish(host, retry=(url, future, attempt + 1), pause_s=wait)
+                return
+            future.set_exception(e)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        self._finish(host)
+
+    def _finish(self, host, retry=None, pause_s=None):
+        with self._condition:
+            state = self._hosts[host]
+            state.active -= 1
+            self._active -= 1
+            if pause_s is not None:
+                state.next_allowed = max(state.next_allowed, time.monotonic() + pause_s)
+            if retry is not None and self._stopped:
+                # Shutdown has already cancelled the queue; nothing would fetch the retry
+                _cancel(retry[1])
+            elif retry is not None:
+                # A running future can't go back to pending, so the retry carries it as-is
+                state.pending.appendleft(retry)
+                if host not in self._turn:
+                    self._turn.append(host)
+            self._condition.notify()
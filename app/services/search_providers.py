@@ -0,0 +1,117 @@
+"""
+Search providers: the sources a search gathers results from.
+
+Google Custom Search is one provider; RSS/Atom feeds (feed_reader.py) and news sitemaps (sitemap_crawler.py) are
+others. search_all runs a list of providers over the same keywords and merges their results into the one list
+the search results page shows.
+"""
+from abc import ABC, abstractmethod
+from urllib.parse import urlparse
+import time
+from ..utils import normalize_url, is_article, match_text, keyword_terms, term_matches
+
+
+class SearchProvider(ABC):
+    """
+    A source of search results. Subclasses set name and implement search().
+    """
+    name = "provider"
+
+    @abstractmethod
+    def search(self, keywords, days_back):
+        """
+        Finds articles for the keywords from the last days_back days.
+        @return list: Result dictionaries (title, url, source, keyword), already filtered with is_article.
+            They may also carry a "snippet" and a "published" Unix time, used for ranking.
+        """
+
+
+class CseProvider(SearchProvider):
+    """Google Custom Search, through google_searcher.search_articles."""
+    name = "Custom Search"
+
+    def __init__(self, api_key, cse_id, ledger=None, batched=False, history=None):
+        self.api_key = api_key
+        self.cse_id = cse_id
+        self.ledger = ledger
+        self.batched = batched
+        self.history = history
+
+    def search(self, keywords, days_back):
+        from .google_searcher import search_articles
+        return search_articles(self.api_key, self.cse_id, keywords, days_back, ledger=self.ledger,
+                               batched=self.batched, history=self.history)
+
+
+def entry_time(entry):
+    """When an indexed entry was published, or first seen if the source gave no date. A Unix time."""
+    return entry["published"] or entry["first_seen"]
+
+
+def match_entries(entries, keywords, days_back, now=None):
+    """
+    Picks the indexed feed or sitemap entries that match a keyword, for providers that collect candidates
+    themselves instead of searching for each keyword.
+
+    - Entries older than days_back are left out.
+    - An entry matches a keyword when all of its terms appear in the title, summary or URL
+      (see utils.keyword_terms); the first matching keyword in keywords.json order is used.
+    - The same is_article filter and URL deduplication as Custom Search results are applied.
+    @param entries (list): Dictionaries with "title", "url", "summary", "published" (Unix time or None) and "first_seen".
+    @return list: Result dictionaries (title, url, source, keyword, snippet, published), newest first.
+    """
+    cutoff = (now or time.time()) - days_back * 24 * 60 * 60
+    keyword_term_lists = [(keyword, keyword_terms(keyword)) for keyword in keywords]
+
+    results = []
+    seen_urls = set()
+    for entry in sorted(entries, key=entry_time, reverse=True):
+        if entry_time(entry) < cutoff:
+            continue
+        text = match_text(entry["title"], entry["summary"], entry["url"])
+        keyword = next((keyword for keyword, terms in keyword_term_lists
+                        if terms and all(term_matches(term, text) for term in terms)), None)
+        if keyword is None:
+            continue
+
+        is_valid_article, reason = is_article(entry["url"], entry["title"])
+        normalized_url = normalize_url(entry["url"])
+        if not is_valid_article or normalized_url in seen_urls:
+            continue
+        seen_urls.add(normalized_url)
+        results.append({
+            "title": entry["title"],
+            "url": entry["url"],
+            "source": urlparse(entry["url"]).netloc,
+            "keyword": keyword,
+            "snippet": entry["summary"],
+            "published": entry["published"],
+        })
+    return results
+
+
+def search_all(providers, keywords, days_back):
+    """
+    Runs each provider in turn and merges the results, dropping URLs an earlier provider already returned.
+    A provider that fails is reported and skipped, so the others' results are still shown.
+
+    @return list: Result dictionaries (title, url, source, keyword).
+    """
+    results = []
+    seen_urls = set()
+    for provider in providers:
+        try:
+            provider_results = provider.search(keywords, days_back)
+        except Exception as e:
+            print(f"{provider.name} search failed: {e}")
+            continue
+
+        added = 0
+        for result in provider_results:
+            normalized_url = normalize_url(result["url"])
+            if normalized_url not in seen_urls:
+                seen_urls.add(normalized_url)
+                results.append(result)
+                added += 1
+        print(f"{provider.name}: {len(provider_results)} results, {added} new")
+    return results
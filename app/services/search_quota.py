@@ -0,0 +1,234 @@
+"""
+Accounting for the Custom Search API's daily quota, and planning which keywords to spend it on.
+
+The ledger (data/cse_quota.json) counts API calls per day and per keyword, and keeps per-keyword history:
+how many searches ran, how many of their results were added to the email, and the last result set.
+Before a search, plan_queries orders the keywords by that yield (best first), skips keywords whose results
+haven't changed in the last few searches, and cuts the list off where the remaining quota runs out.
+Skipped keywords reuse their last results, so nothing silently disappears from the results page.
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import pytz
+from app.config import (CSE_QUOTA_FILE, CSE_DAILY_QUOTA, CSE_QUOTA_HISTORY_DAYS, CSE_SKIP_UNCHANGED_RUNS,
+                        CSE_RECHECK_HOURS)
+from app.utils import atomic_write_text, normalize_url, build_query_batches
+
+# The quota resets at midnight Pacific time
+QUOTA_TIMEZONE = pytz.timezone("US/Pacific")
+
+
+@dataclass
+class SearchPlan:
+    """Which keywords a search will query, in order, and which it skips."""
+    to_run: list
+    queries: list = field(default_factory=list) # Keyword groups, one API query each (single keywords unless batched)
+    skipped_unchanged: list = field(default_factory=list)
+    skipped_budget: list = field(default_factory=list)
+    remaining: int = 0 # Quota left when the plan was made
+
+
+class QuotaLedger:
+    """
+    Persistent count of Custom Search calls per day and per keyword, plus per-keyword yield history.
+    """
+    def __init__(self, path=CSE_QUOTA_FILE, daily_quota=CSE_DAILY_QUOTA):
+        self.path = path
+        self.daily_quota = daily_quota
+        self.last_plan = None # The plan of the most recent search, for status messages
+        self._lock = threading.RLock()
+        self._data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        data.setdefault("days", {})
+        data.setdefault("keywords", {})
+        return data
+
+    def _save(self):
+        # Called with the lock held
+        try:
+            atomic_write_text(self.path, json.dumps(self._data, indent=2))
+        except OSError as e:
+            print(f"Could not save the search quota ledger: {e}")
+
+    @staticmethod
+    def _now(now=None):
+        return (now or datetime.now(QUOTA_TIMEZONE)).astimezone(QUOTA_TIMEZONE)
+
+    def _day(self, now=None):
+        """The ledger entry for the current quota day."""
+        today = self._now(now).date().isoformat()
+        return self._data["days"].setdefault(today, {"calls": 0, "exhausted": False, "keywords": {}})
+
+    def _keyword(self, keyword):
+        return self._data["keywords"].setdefault(keyword, {
+            "searches": 0,
+            "results": 0,
+            "accepted": 0, # Results from this keyword that were added to the email
+            "last_searched": None,
+            "days_back": None,
+            "fingerprint": None, # Hash of the last result URLs, to notice when nothing changed
+            "unchanged_runs": 0,
+            "last_results": [],
+        })
+
+    def remaining(self, now=None):
+        """Queries left today."""
+        with self._lock:
+            day = self._day(now)
+            return 0 if day["exhausted"] else max(0, self.daily_quota - day["calls"])
+
+    def record_call(self, keywords, now=None):
+        """
+        Counts one API call against today's quota.
+        @param keywords (list): The keywords the query searched for (several for a batched query).
+        """
+        with self._lock:
+            day = self._day(now)
+            day["calls"] += 1
+            for keyword in keywords:
+                day["keywords"][keyword] = day["keywords"].get(keyword, 0) + 1
+
+            # Drop days older than the history window
+            cutoff = (self._now(now).date() - timedelta(days=CSE_QUOTA_HISTORY_DAYS)).isoformat()
+            for old_day in [d for d in self._data["days"] if d < cutoff]:
+                del self._data["days"][old_day]
+            self._save()
+
+    def record_exhausted(self, now=None):
+        """Marks today's quota as used up, after the API answered 429."""
+        with self._lock:
+            self._day(now)["exhausted"] = True
+            self._save()
+
+    def record_results(self, keyword, days_back, result_urls, results, now=None):
+        """
+        Records what a keyword's search returned.
+        @param result_urls (list): Every URL the API returned for the keyword (see google_searcher.response_links),
+            used to tell whether the results changed. Results other keywords also found count too.
+        @param results (list): The result dictionaries kept from the response, reused when the keyword is skipped.
+        """
+        fingerprint = hashlib.sha1("\n".join(sorted(normalize_url(url) for url in result_urls)).encode()).hexdigest()
+        with self._lock:
+            entry = self._keyword(keyword)
+            if entry["fingerprint"] == fingerprint and entry["days_back"] == days_back:
+                entry["unchanged_runs"] += 1
+            else:
+                entry["unchanged_runs"] = 0
+            entry.update(fingerprint=fingerprint, days_back=days_back, last_results=results,
+                         last_searched=self._now(now).isoformat(timespec="seconds"))
+            entry["searches"] += 1
+            entry["results"] += len(results)
+            self._save()
+
+    def record_accepted(self, keywords):
+        """
+        Counts articles added to the email from search results, per keyword.
+        @param keywords (list): The keyword of each added article.
+        """
+        with self._lock:
+            changed = False
+            for keyword in keywords:
+                if keyword in self._data["keywords"]:
+                    self._data["keywords"][keyword]["accepted"] += 1
+                    changed = True
+            if changed:
+                self._save()
+
+    def keyword_yield(self, keyword):
+        """
+        Share of a keyword's searches that led to an added article, smoothed so new keywords start at 0.5.
+        """
+        entry = self._data["keywords"].get(keyword)
+        if not entry:
+            return 0.5
+        return (entry["accepted"] + 1) / (entry["searches"] + 2)
+
+    def _is_unchanged(self, keyword, days_back, now):
+        entry = self._data["keywords"].get(keyword)
+        if not entry or entry["days_back"] != days_back or entry["unchanged_runs"] < CSE_SKIP_UNCHANGED_RUNS:
+            return False
+        last_searched = datetime.fromisoformat(entry["last_searched"])
+        return self._now(now) - last_searched < timedelta(hours=CSE_RECHECK_HOURS)
+
+    def plan_queries(self, keywords, days_back, batched=False, now=None):
+        """
+        Decides which keywords to query and in what order.
+        @param batched (bool): Group keywords into OR queries (see utils.build_query_batches), so fewer calls are needed.
+        @return SearchPlan: Highest-yield keywords first, limited to the remaining quota.
+        """
+        with self._lock:
+            plan = SearchPlan(to_run=[], remaining=self.remaining(now))
+            candidates = []
+            for keyword in dict.fromkeys(keywords):
+                if self._is_unchanged(keyword, days_back, now):
+                    plan.skipped_unchanged.append(keyword)
+                else:
+                    candidates.append(keyword)
+
+            # sorted is stable, so keywords with equal yield keep their keywords.json order
+            candidates = sorted(candidates, key=self.keyword_yield, reverse=True)
+            queries = build_query_batches(candidates) if batched else [[keyword] for keyword in candidates]
+
+            # Each query costs at least one call
+            plan.queries = queries[:plan.remaining]
+            plan.to_run = [keyword for group in plan.queries for keyword in group]
+            plan.skipped_budget = [keyword for group in queries[plan.remaining:] for keyword in group]
+            return plan
+
+    def cached_results(self, keyword, days_back, now=None):
+        """
+        Returns a keyword's results from its last search, if that search covers the same time window
+        and is recent enough to still fall inside it.
+        """
+        with self._lock:
+            entry = self._data["keywords"].get(keyword)
+            if not entry or not entry["last_searched"] or entry["days_back"] != days_back:
+                return []
+            if self._now(now) - datetime.fromisoformat(entry["last_searched"]) > timedelta(days=days_back):
+                return []
+            return list(entry["last_results"])
+
+    def summary(self, keywords, days_back, batched=False, now=None):
+        """
+        Describes today's usage and what a search would do, for the search dialog.
+        @return dict: "date", "used", "quota", "remaining", "exhausted", "queries" (API calls the search will make)
+                      and "rows", one per keyword in plan order:
+                      {"keyword", "status", "calls_today", "yield", "last_searched"}.
+        """
+        with self._lock:
+            plan = self.plan_queries(keywords, days_back, batched, now)
+            day = self._day(now)
+            statuses = [(keyword, "Will search") for keyword in plan.to_run]
+            statuses += [(keyword, "Skip: results unchanged") for keyword in plan.skipped_unchanged]
+            statuses += [(keyword, "Skip: over quota") for keyword in plan.skipped_budget]
+
+            rows = []
+            for keyword, status in statuses:
+                entry = self._data["keywords"].get(keyword, {})
+                rows.append({
+                    "keyword": keyword,
+                    "status": status,
+                    "calls_today": day["keywords"].get(keyword, 0),
+                    "yield": self.keyword_yield(keyword),
+                    "last_searched": entry.get("last_searched"),
+                })
+            return {
+                "date": self._now(now).date().isoformat(),
+                "used": day["calls"],
+                "quota": self.daily_quota,
+                "remaining": plan.remaining,
+                "exhausted": day["exhausted"],
+                "queries": len(plan.queries),
+                "rows": rows,
+            }
+
+ledger = QuotaLedger()
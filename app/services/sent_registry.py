@@ -0,0 +1,210 @@
+"""
+Remembers every article that went out in a built email, so it isn't clipped again on a later day.
+
+The article list is cleared between emails, so it can't catch a story sent yesterday. The registry records each
+sent article's URL, title and content fingerprint in data/sent_registry.json, in two structures:
+
+- An exact window of the last SENT_RECENT_DAYS days, with the send date and title, for precise messages.
+- A scalable Bloom filter holding everything ever sent. It uses a few bytes per key however long the history
+  gets and may rarely report a story as sent when it wasn't (at most SENT_FILTER_ERROR_RATE of lookups).
+  It never misses one that was.
+
+Lookups need only the URL and title, so search results can be flagged without scraping them.
+"""
+import base64
+import hashlib
+import html
+import json
+import math
+import re
+import threading
+import time
+from app.config import SENT_REGISTRY_FILE, SENT_RECENT_DAYS, SENT_FILTER_CAPACITY, SENT_FILTER_ERROR_RATE
+from app.utils import atomic_write_text, normalize_url
+
+_TAG = re.compile(r"<[^>]+>")
+_WORD = re.compile(r"\w+")
+
+
+def content_fingerprint(content):
+    """
+    Fingerprint of an article's text that ignores markup, case, punctuation and spacing,
+    so the same story reformatted by another outlet or scrape still matches. None for empty content.
+    """
+    words = _WORD.findall(html.unescape(_TAG.sub(" ", content or "")).lower())
+    if not words:
+        return None
+    return hashlib.blake2b(" ".join(words).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def sent_keys(url=None, title=None, content=None):
+    """Returns the registry keys for whichever of an article's URL, title and content are known."""
+    keys = []
+    if url:
+        keys.append(("url", "url:" + normalize_url(url)))
+    if title and title.strip():
+        keys.append(("title", "title:" + " ".join(title.lower().split())))
+    fingerprint = content_fingerprint(content) if content else None
+    if fingerprint:
+        keys.append(("content", "content:" + fingerprint))
+    return keys
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter sized for capacity keys at the given false positive rate."""
+    def __init__(self, capacity, error_rate, bits=None, count=0):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    def _positions(self, key):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "error_rate": self.error_rate, "count": self.count,
+                "bits": base64.b64encode(bytes(self.bits)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["capacity"], data["error_rate"], bytearray(base64.b64decode(data["bits"])), data["count"])
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows as keys are added. When the newest filter is full, another twice its size
+    with half its false positive rate is added, so the overall rate stays below twice the first filter's.
+    """
+    GROWTH = 2
+    TIGHTENING = 0.5
+
+    def __init__(self, capacity=SENT_FILTER_CAPACITY, error_rate=SENT_FILTER_ERROR_RATE, filters=None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filters = filters or []
+
+    def __contains__(self, key):
+        return any(key in bloom for bloom in self.filters)
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    def add(self, key):
+        if key in self:
+            return
+        if not self.filters or self.filters[-1].count >= self.filters[-1].capacity:
+            if self.filters:
+                capacity = self.filters[-1].capacity * self.GROWTH
+                error_rate = self.filters[-1].error_rate * self.TIGHTENING
+            else:
+                # The first filter gets half the target rate, so the sum over all filters stays within it
+                capacity, error_rate = self.capacity, self.error_rate * (1 - self.TIGHTENING)
+            self.filters.append(BloomFilter(capacity, error_rate))
+        self.filters[-1].add(key)
+
+    def to_dict(self):
+        return {"capacity": self.capacity, "error_rate": self.error_rate,
+                "filters": [bloom.to_dict() for bloom in self.filters]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["capacity"], data["error_rate"], [BloomFilter.from_dict(f) for f in data["filters"]])
+
+
+class SentRegistry:
+    """
+    Record of the articles sent in built emails, saved to a JSON file. Safe to use from worker threads.
+    """
+    def __init__(self, path=SENT_REGISTRY_FILE, recent_days=SENT_RECENT_DAYS):
+        self.path = path
+        self.recent_days = recent_days
+        self._lock = threading.Lock()
+        self._recent, self._filter = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["recent"], ScalableBloomFilter.from_dict(data["filter"])
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+            return {}, ScalableBloomFilter()
+
+    def _save(self):
+        # Called with the lock held
+        try:
+            atomic_write_text(self.path, json.dumps({"recent": self._recent, "filter": self._filter.to_dict()}))
+        except OSError as e:
+            print(f"Could not save the sent article registry: {e}")
+
+    def record_sent(self, articles, now=None):
+        """
+        Records the articles of an email that was built.
+        @param articles (list): Dictionaries with "url", "title" and "content" (any may be missing).
+        @return int: Number of articles recorded.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            for article in articles:
+                for _, key in sent_keys(article.get("url"), article.get("title"), article.get("content")):
+                    self._filter.add(key)
+                    self._recent[key] = {"sent": now, "title": article.get("title")}
+
+            # The filter keeps older sends; the exact window only needs the last few weeks
+            cutoff = now - self.recent_days * 24 * 60 * 60
+            for key in [k for k, entry in self._recent.items() if entry["sent"] < cutoff]:
+                del self._recent[key]
+            self._save()
+        return len(articles)
+
+    def sent_match(self, url=None, title=None, content=None):
+        """
+        Checks whether an article went out in an earlier email.
+        @return dict: None if it didn't, otherwise {"match": "url", "title" or "content", "sent": Unix time
+            (None if sent before the exact window, in which case the match is probable rather than certain),
+            "title": title of the sent article or None}.
+        """
+        keys = sent_keys(url, title, content)
+        with self._lock:
+            for match, key in keys:
+                entry = self._recent.get(key)
+                if entry:
+                    return {"match": match, "sent": entry["sent"], "title": entry["title"]}
+            for match, key in keys:
+                if key in self._filter:
+                    return {"match": match, "sent": None, "title": None}
+        return None
+
+    def annotate(self, results):
+        """
+        Marks search results that were already sent, in place, from their URL and title alone.
+        @param results (list): Result dictionaries; each gets "sent", a description (see describe_sent) or None.
+        """
+        for result in results:
+            match = self.sent_match(url=result.get("url"), title=result.get("title"))
+            result["sent"] = describe_sent(match) if match else None
+        return results
+
+
+def describe_sent(match):
+    """Short description of a sent_match result for messages and tooltips."""
+    if match["sent"] is None:
+        return f"Probably sent in an email more than {SENT_RECENT_DAYS} days ago (same {match['match']})"
+    sent_on = time.strftime("%b %d", time.localtime(match["sent"]))
+    return f"Already sent in the {sent_on} email (same {match['match']})"
+
+
+registry = SentRegistry()
@@ -0,0 +1,265 @@
+"""
+News sitemap search provider: finds the SOURCE_MAP outlets' articles in their Google News sitemaps,
+without spending Custom Search quota.
+
+- A news sitemap lists the articles an outlet published in the last two days, each with its title and
+  publication time. The sitemaps are listed in sitemaps.json.
+- Sitemaps are fetched with conditional GET (ETag / Last-Modified), one outlet per worker. For a sitemap index,
+  only the newest children whose lastmod changed since the last crawl are fetched.
+- Sitemaps are parsed while they download (lxml iterparse, clearing each element once read), so a large
+  sitemap is never held in memory whole. Gzipped sitemaps (.xml.gz files) are decompressed on the fly, unless
+  the server already sent them with Content-Encoding: gzip, in which case requests has decompressed them.
+- Article URLs are indexed in data/sitemap_state.json. URLs already in the index are skipped before their other
+  fields are read, and entries are matched against the keywords like feed entries (see search_providers.match_entries).
+"""
+import gzip
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from ..config import (SITEMAPS_FILE, SITEMAP_STATE_FILE, SITEMAP_MAX_WORKERS, SITEMAP_MAX_CHILDREN,
+                      SITEMAP_RETENTION_DAYS, REQUEST_TIMEOUT)
+from ..metrics import span
+from ..utils import atomic_write_text, get_domain, parse_timestamp
+from .search_providers import SearchProvider, match_entries, entry_time
+
+SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+NEWS = "{http://www.google.com/schemas/sitemap-news/0.9}"
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def load_sitemaps(path=SITEMAPS_FILE):
+    """Returns the sitemap list from sitemaps.json, or an empty list if there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["sitemaps"]
+    except FileNotFoundError:
+        return []
+
+
+def sitemap_stream(raw):
+    """
+    Wraps a sitemap's body stream so that it reads as XML. A .gz sitemap served as a plain file is still gzip
+    data and is gunzipped; one served with Content-Encoding: gzip has already been decompressed by requests.
+    The first bytes are peeked at rather than trusting the URL, which says nothing about how it was served.
+    @param raw (file-like): The body, e.g. response.raw with decode_content set.
+    """
+    stream = io.BufferedReader(raw)
+    if stream.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def iter_sitemap(source, seen_urls, cutoff=None):
+    """
+    Streams the entries of a news sitemap or a sitemap index.
+
+    @param source (file-like or str): The sitemap XML, or its path. Read a block at a time.
+    @param seen_urls (container): Article URLs already indexed; these are skipped before any other field is read.
+    @param cutoff (float): Unix time; articles published before it are skipped.
+    @return generator: ("sitemap", url, lastmod) for each child of a sitemap index, and
+        ("article", url, {"title", "url", "summary", "published"}) for each new news article.
+        published is a Unix time or None.
+    """
+    # Imported here so that importing the provider doesn't load lxml
+    from lxml import etree
+
+    context = etree.iterparse(source, events=("end",), tag=(SITEMAP + "url", SITEMAP + "sitemap"),
+                              recover=True, resolve_entities=False, no_network=True, huge_tree=True)
+    for _, element in context:
+        url = (element.findtext(SITEMAP + "loc") or "").strip()
+        if element.tag == SITEMAP + "sitemap":
+            if url:
+                yield "sitemap", url, element.findtext(SITEMAP + "lastmod")
+        elif url and url not in seen_urls:
+            # Only Google News entries carry a title to match against
+            news = element.find(NEWS + "news")
+            if news is not None:
+                published = parse_timestamp(news.findtext(NEWS + "publication_date"))
+                if cutoff is None or published is None or published >= cutoff:
+                    yield "article", url, {
+                        "title": (news.findtext(NEWS + "title") or "").strip(),
+                        "url": url,
+                        "summary": (news.findtext(NEWS + "keywords") or "").strip(),
+                        "published": published,
+                    }
+
+        # Drop what has been read: the element and the siblings before it
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+class SitemapProvider(SearchProvider):
+    """
+    Searches the news sitemaps in sitemaps.json. The seen-article index, the conditional GET validators
+    and each sitemap index's child lastmods are kept in data/sitemap_state.json between runs.
+    """
+    name = "News sitemaps"
+
+    def __init__(self, sitemaps=None, state_path=SITEMAP_STATE_FILE, max_workers=SITEMAP_MAX_WORKERS,
+                 max_children=SITEMAP_MAX_CHILDREN):
+        """
+        @param sitemaps (list): {"outlet": ..., "url": ...} dictionaries; read from sitemaps.json by default.
+        @param max_children (int): Child sitemaps followed per sitemap index, newest first.
+        """
+        self.sitemaps = load_sitemaps() if sitemaps is None else sitemaps
+        self.state_path = state_path
+        self.max_workers = max_workers
+        self.max_children = max_children
+        self._lock = threading.Lock()
+        self._state = self._load_state()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            state = {}
+        # Sitemap URL -> {"etag", "last_modified", "checked", "children": {child URL: lastmod}}
+        state.setdefault("sitemaps", {})
+        state.setdefault("entries", {}) # Article URL -> entry, see iter_sitemap, plus "first_seen"
+        return state
+
+    def _save_state(self):
+        try:
+            atomic_write_text(self.state_path, json.dumps(self._state))
+        except OSError as e:
+            print(f"Could not save the sitemap index: {e}")
+
+    def poll(self):
+        """
+        Crawls every sitemap and adds new articles to the index.
+        @return int: Number of new articles.
+        """
+        if not self.sitemaps:
+            return 0
+        cutoff = time.time() - SITEMAP_RETENTION_DAYS * 24 * 60 * 60
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sitemap") as executor:
+            counts = executor.map(lambda sitemap: self._crawl(sitemap["url"], cutoff), self.sitemaps)
+            new_entries = sum(count or 0 for count in counts)
+
+        with self._lock:
+            # Forget articles older than any search window, and sitemaps no index lists any more
+            entries = self._state["entries"]
+            for url in [u for u, e in entries.items() if entry_time(e) < cutoff]:
+                del entries[url]
+            records = self._state["sitemaps"]
+            for url in [u for u, r in records.items() if r.get("checked", 0) < cutoff]:
+                del records[url]
+            self._save_state()
+        return new_entries
+
+    def _crawl(self, url, cutoff, depth=0):
+        """
+        Worker thread: fetches one sitemap if it changed and indexes its new articles. For a sitemap index,
+        also crawls the children that changed. News sitemap indexes are one level deep, so only the top level's
+        children are followed.
+        @return int: Number of new articles, or None if the sitemap couldn't be read.
+        """
+        with self._lock:
+            record = dict(self._state["sitemaps"].get(url, {}))
+
+        headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/xml, text/xml"}
+        if record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record.get("last_modified"):
+            headers["If-Modified-Since"] = record["last_modified"]
+
+        try:
+            with span("sitemap_fetch", domain=get_domain(url)) as fetch_span:
+                response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True)
+                fetch_span.tag(status=response.status_code)
+                response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Sitemap request failed: {url} ({e})")
+            return None
+
+        with response:
+            if response.status_code == 304:
+                self._update_record(url, {})
+                return 0
+
+            # The body is parsed as it arrives rather than read into memory first
+            response.raw.decode_content = True
+            # Left open at the end of the body, as the buffered reader sitemap_stream wraps it in expects
+            response.raw.auto_close = False
+
+            articles, children = [], []
+            try:
+                # Membership checks against the shared index are safe while other workers add to it
+                with span("sitemap_parse", domain=get_domain(url)) as parse_span:
+                    source = sitemap_stream(response.raw)
+                    for kind, loc, data in iter_sitemap(source, self._state["entries"], cutoff):
+                        (articles if kind == "article" else children).append((loc, data))
+                    parse_span.tag(articles=len(articles), sitemaps=len(children))
+            except Exception as e: # A dropped connection, bad gzip data or XML beyond recovery
+                print(f"Sitemap could not be read: {url} ({e})")
+                return None
+
+        now = time.time()
+        with self._lock:
+            for loc, entry in articles:
+                entry["first_seen"] = now
+                self._state["entries"].setdefault(loc, entry)
+        new_entries = len(articles)
+
+        complete = True
+        child_lastmods = {}
+        if children and depth == 0:
+            new_children, complete, child_lastmods = self._crawl_children(children, record.get("children", {}),
+                                                                           cutoff, depth)
+            new_entries += new_children
+
+        # Validators are only kept once every changed child has been crawled, so a failed child is tried again
+        self._update_record(url, {
+            "etag": response.headers.get("ETag") if complete else None,
+            "last_modified": response.headers.get("Last-Modified") if complete else None,
+            "children": child_lastmods,
+        })
+        return new_entries
+
+    def _crawl_children(self, children, known_lastmods, cutoff, depth):
+        """
+        Crawls the newest children of a sitemap index whose lastmod changed since the last crawl.
+        @param children (list): (child URL, lastmod) pairs in index order.
+        @param known_lastmods (dict): Child URL -> lastmod as of the last crawl.
+        @return tuple: (new articles, whether every changed child was read, child URL -> lastmod to remember).
+        """
+        new_entries = 0
+        complete = True
+        # Children dropped from the index are forgotten
+        lastmods = {loc: known_lastmods[loc] for loc, _ in children if loc in known_lastmods}
+
+        dated = [(parse_timestamp(lastmod), loc, lastmod) for loc, lastmod in children]
+        dated.sort(key=lambda child: child[0] or 0, reverse=True)
+        for timestamp, loc, lastmod in dated[:self.max_children]:
+            if timestamp is not None and timestamp < cutoff:
+                break
+            if lastmod and lastmods.get(loc) == lastmod:
+                continue
+            count = self._crawl(loc, cutoff, depth + 1)
+            if count is None:
+                complete = False
+                continue
+            new_entries += count
+            lastmods[loc] = lastmod
+        return new_entries, complete, lastmods
+
+    def _update_record(self, url, fields):
+        with self._lock:
+            record = self._state["sitemaps"].setdefault(url, {})
+            record.update(fields)
+            record["checked"] = time.time()
+
+    def search(self, keywords, days_back):
+        """
+        Crawls the sitemaps, then returns indexed articles from the last days_back days that match a keyword,
+        newest first (see search_providers.match_entries).
+        """
+        self.poll()
+        with self._lock:
+            entries = list(self._state["entries"].values())
+        return match_entries(entries, keywords, days_back)
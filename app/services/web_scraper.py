@@ -3,7 +3,41 @@ from titlecase import titlecase
 import tldextract
 import requests
 from fake_useragent import UserAgent
-from app.utils import text_to_html_paragraphs
+from app.utils import text_to_html_paragraphs, get_domain, parse_retry_after
+from app.metrics import span
+from app.config import SCRAPE_BASE_URL, REQUEST_TIMEOUT, SOURCE_MAP
+from .domain_health import health
+
+class RateLimitedError(ArticleException):
+    """
+    Raised when a site answers 429 (Too Many Requests) or 503 (Service Unavailable).
+    retry_after is the wait in seconds the site asked for, or None if it didn't say.
+    """
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class DomainBlockedError(ArticleException):
+    """Raised without fetching when a site has refused the last few scrapes (see domain_health)."""
+
+def classify_error(error):
+    """
+    Short label for why a scrape failed, recorded in the site's health record.
+    @return str: "paywalled", "blocked", "not_found", "rate_limited", "timeout" or "error".
+    """
+    if isinstance(error, RateLimitedError):
+        return "rate_limited"
+    if isinstance(error, requests.Timeout):
+        return "timeout"
+    # Only a status the site answered with counts: a URL can contain "403" too
+    status = error.response.status_code if isinstance(error, requests.HTTPError) and error.response is not None else None
+    if status == 401:
+        return "paywalled"
+    if status == 403:
+        return "blocked"
+    if status == 404:
+        return "not_found"
+    return "error"
 
 def clean_author_string(authors_raw):
     """
@@ -52,26 +86,56 @@ def clean_author_string(authors_raw):
     
     return unique_names
 
+def parse_article_html(url, html):
+    """
+    Extracts article data from a fetched page with newspaper3k.
+    Returns article data dict on success, raises ArticleException if no content is found.
+    """
+    article = Article(url)
+    article.set_html(html)
+    article.parse()
+
+    if not article.text:
+        raise ArticleException("Scrape resulted in no content")
+
+    # Capitalize article title
+    capitalized_title = titlecase(article.title) if article.title else None
+
+    # Clean author list
+    cleaned_authors = clean_author_string(article.authors)
+
+    # Extract the base domain name from the URL
+    source_domain = tldextract.extract(url).domain
+
+    # Look up source domain in the map. If not found, use capitalized domain name.
+    formatted_source = SOURCE_MAP.get(source_domain, source_domain.title())
+
+    # Get content and convert to html
+    content = article.text
+    content_as_html = text_to_html_paragraphs(content)
+
+    return {
+        "title": capitalized_title,
+        "author": cleaned_authors,
+        "source": formatted_source,
+        "content": content_as_html,
+        "url": url
+    }
+
+def fetch_location(url):
+    """
+    Returns the address an article is actually fetched from.
+    Normally the URL itself; with SCRAPE_BASE_URL set, https://host/path becomes <base>/host/path.
+    """
+    if not SCRAPE_BASE_URL:
+        return url
+    return f"{SCRAPE_BASE_URL.rstrip('/')}/{url.split('://', 1)[-1]}"
+
 def scrape_url(url):
         """
         Tries live fetch first; if blocked or error, falls back to Google Cache.
         Returns article data dict on success, raises ArticleException on failure.
         """
-        # Map domain names to source titles
-        SOURCE_MAP = {
-            "apnews": "Associated Press",
-            "nytimes": "New York Times",
-            "wsj": "Wall Street Journal",
-            "politico": "POLITICO",
-            "ft": "Financial Times",
-            "cnbc": "CNBC",
-            "scmp": "South China Morning Post",
-            "foxnews": "Fox News",
-            "washingtonpost": "Washington Post",
-            "cnn": "CNN",
-            "bloomberglaw": "Bloomberg"
-        }
-
         # Set user agent (to avoid website blocks)
         user_agent = UserAgent()
 
@@ -81,52 +145,48 @@ def scrape_url(url):
             "Accept-Language": "en-US,en;q=0.9",
         }
 
+        # Site the url belongs to, used to tag timing metrics and look up its health record
+        domain = get_domain(url)
+
+        # Fail fast on sites that have been turning us away, instead of waiting for another refusal
+        blocked_reason = health.blocked_reason(domain)
+        if blocked_reason:
+            raise DomainBlockedError(blocked_reason)
+
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
+            with span("html_fetch", domain=domain) as fetch_span:
+                response = requests.get(fetch_location(url), headers=headers, timeout=REQUEST_TIMEOUT)
+                fetch_span.tag(status=response.status_code, bytes=len(response.content))
+                if response.status_code in (429, 503):
+                    raise RateLimitedError(
+                        f"{domain} is limiting requests (HTTP {response.status_code}). Try again later.",
+                        parse_retry_after(response.headers.get("Retry-After")),
+                    )
+                response.raise_for_status()
             html = response.text
             if not html.strip():
                 raise ArticleException("Empty HTML returned")
 
             # Extract content with Newspaper3k
-            article = Article(url)
-            article.set_html(html)
-            article.parse()
-            
-            if not article.text:
-                raise ArticleException("Scrape resulted in no content")
-            
-            # Capitalize article title
-            capitalized_title = titlecase(article.title) if article.title else None
-
-            # Clean author list
-            cleaned_authors = clean_author_string(article.authors)
-
-            # Extract the base domain name from the URL
-            source_domain = tldextract.extract(url).domain
-
-            # Look up source domain in the map. If not found, use capitalized domain name.
-            formatted_source = SOURCE_MAP.get(source_domain, source_domain.title())
-
-            # Get content and convert to html
-            content = article.text
-            content_as_html = text_to_html_paragraphs(content)
-
-            return {
-                "title": capitalized_title,
-                "author": cleaned_authors,
-                "source": formatted_source,
-                "content": content_as_html,
-                "url": url
-            }
+            with span("parse", domain=domain, bytes=len(html)):
+                article_data = parse_article_html(url, html)
+            health.record_success(domain)
+            return article_data
         
+        except RateLimitedError as e:
+            # Keep the wait the site asked for, so the caller can retry later
+            health.record_failure(domain, classify_error(e))
+            raise
+
         except Exception as e:
-            if '404' in str(e):
+            error_class = classify_error(e)
+            health.record_failure(domain, error_class)
+            if error_class == "not_found":
                 raise ArticleException("This url either does not exist, or the website blocks web scraping by bots." \
                                         "\nClick title to verify if article exists.")
-            elif '403' in str(e):
+            elif error_class == "blocked":
                 raise ArticleException("This website does not allow web scraping by bots.")
-            elif '401' in str(e):
+            elif error_class == "paywalled":
                 raise ArticleException("This article is paywalled or requires a login\n(Usually a Google sign-in).")
             else:
                 # For all other errors, re-raise the original exception
@@ -1,6 +1,13 @@
 from urllib.parse import urlparse
+from html.entities import html5 as html5_entities
+from html.parser import HTMLParser
+import os
 import re
-from bs4 import BeautifulSoup
+import tempfile
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from app.metrics import span
+from app.config import CSE_BATCH_SIZE, CSE_MAX_QUERY_CHARS, CSE_MAX_QUERY_WORDS
 
 def text_to_html_paragraphs(text: str) -> str:
     """
@@ -29,6 +36,231 @@ def text_to_html_paragraphs(text: str) -> str:
     return "<br><br>".join(html_paragraphs)
 
 
+# Tags removed together with everything inside them
+_DISCARD_TAGS = frozenset({
+    'script', 'style', 'head', 'meta', 'link', 'svg', 'canvas', 'math', 'table',
+    'form', 'input', 'textarea', 'select', 'option', 'button', 'iframe'
+})
+# Tags kept in the cleaned HTML; every other tag is dropped but its content kept
+_ALLOWED_TAGS = frozenset({'b', 'strong', 'i', 'em', 'a', 'p', 'br'})
+# Tags that never have content, so they are closed as soon as they open
+_VOID_TAGS = frozenset({
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed', 'frame', 'hr', 'image',
+    'img', 'input', 'isindex', 'keygen', 'link', 'menuitem', 'meta', 'nextid', 'param', 'source',
+    'spacer', 'track', 'wbr'
+})
+# Whitespace-only text inside these tags is kept as-is instead of being collapsed
+_PRESERVE_WHITESPACE_TAGS = frozenset({'pre', 'textarea'})
+_ASCII_SPACES = ' \n\t\x0c\r'
+
+# Named entities, with and without the trailing semicolon (the first spelling in sorted order wins)
+_ENTITIES = {}
+for _name, _character in sorted(html5_entities.items()):
+    _ENTITIES.setdefault(_name.removesuffix(';'), _character)
+
+# Numeric references in the C1 range that are really Windows-1252 characters
+_WINDOWS_1252_REFERENCES = {
+    number: bytes([number]).decode('windows-1252')
+    for number in range(0x80, 0xA0) if number not in (0x81, 0x8D, 0x8F, 0x90, 0x9D)
+}
+
+# Paragraph tags inside comments and other markup are rewritten the same way as real ones
+_PARAGRAPH_OPEN = re.compile(r'<p.*?>', flags=re.IGNORECASE)
+_PARAGRAPH_CLOSE = re.compile(r'</p>', flags=re.IGNORECASE)
+_LEADING_BREAKS = re.compile(r'(<br\s*/?>\s*)+')
+_BREAK_TAG = re.compile(r'<br\s*/?>')
+
+
+class _AllowListSanitizer(HTMLParser):
+    """
+    Single-pass sanitizer: cleaned HTML is written out while the input is tokenized, with no tree.
+
+    It reproduces what the earlier BeautifulSoup version produced (parse with html.parser, drop the
+    discarded subtrees, unwrap tags that aren't allowed, strip attributes, rewrite <p> as <br><br>),
+    including how unclosed and stray end tags nest and how whitespace-only text is collapsed.
+    """
+    def __init__(self):
+        # Character references are resolved here, so that they are part of the surrounding text
+        super().__init__(convert_charrefs=False)
+        self.output = []
+        self._stack = []
+        self._open_counts = {}
+        self._discarding = 0 # Discarded tags currently open; while > 0 nothing is written
+        self._preserving = 0
+        self._text = []
+        self._closed_void_tags = [] # Void tags already closed, whose redundant end tag is ignored
+
+    # --- Output ---
+
+    def _flush_text(self, prefix=None, suffix=None):
+        """Ends the current run of text. With a prefix and suffix, the run is a comment or declaration."""
+        if not self._text:
+            return
+        text = ''.join(self._text)
+        self._text = []
+
+        # Whitespace-only runs collapse to a single newline or space
+        if not self._preserving and not text.strip(_ASCII_SPACES):
+            text = '\n' if '\n' in text else ' '
+
+        if self._discarding:
+            return
+        if prefix is None:
+            self.output.append(text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;'))
+        else:
+            markup = prefix + text + suffix
+            markup = _PARAGRAPH_OPEN.sub('', markup)
+            self.output.append(_PARAGRAPH_CLOSE.sub('<br><br>', markup))
+
+    def _open(self, tag, attrs):
+        if not self._discarding and tag in _ALLOWED_TAGS:
+            if tag == 'a':
+                href = None
+                for name, value in attrs:
+                    if name == 'href':
+                        href = value or ''
+                self.output.append('<a>' if href is None else f'<a href={_quote_attribute(href)}>')
+            elif tag == 'br':
+                self.output.append('<br/>')
+            elif tag != 'p': # Opening paragraph tags are dropped; the closing one becomes <br><br>
+                self.output.append(f'<{tag}>')
+
+        self._stack.append(tag)
+        self._open_counts[tag] = self._open_counts.get(tag, 0) + 1
+        if tag in _DISCARD_TAGS:
+            self._discarding += 1
+        if tag in _PRESERVE_WHITESPACE_TAGS:
+            self._preserving += 1
+
+    def _close_innermost(self):
+        tag = self._stack.pop()
+        self._open_counts[tag] -= 1
+        if tag in _DISCARD_TAGS:
+            self._discarding -= 1
+        if tag in _PRESERVE_WHITESPACE_TAGS:
+            self._preserving -= 1
+
+        if not self._discarding and tag in _ALLOWED_TAGS and tag not in _VOID_TAGS:
+            self.output.append('<br><br>' if tag == 'p' else f'</{tag}>')
+        return tag
+
+    def _close_through(self, tag):
+        """Closes the most recent open tag with this name and everything opened inside it."""
+        if not self._open_counts.get(tag):
+            return # Stray end tag
+        while self._close_innermost() != tag:
+            pass
+
+    # --- HTMLParser events ---
+
+    def handle_starttag(self, tag, attrs, close_void=True):
+        self._flush_text()
+        self._open(tag, attrs)
+        if tag in _VOID_TAGS and close_void:
+            self.handle_endtag(tag, already_closed=False)
+            self._closed_void_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, close_void=False)
+        self.handle_endtag(tag, already_closed=False)
+
+    def handle_endtag(self, tag, already_closed=True):
+        if already_closed and tag in self._closed_void_tags:
+            self._closed_void_tags.remove(tag)
+            return
+        self._flush_text()
+        self._close_through(tag)
+
+    def handle_data(self, data):
+        self._text.append(data)
+
+    def handle_charref(self, name):
+        self._text.extend(_numeric_reference(name))
+
+    def handle_entityref(self, name):
+        self._text.append(_ENTITIES.get(name, '&' + name))
+
+    def handle_comment(self, data):
+        self._flush_text()
+        self._text.append(data)
+        self._flush_text('<!--', '-->')
+
+    def handle_decl(self, decl):
+        self._flush_text()
+        self._text.append(decl[len('DOCTYPE '):])
+        self._flush_text('<!DOCTYPE ', '>\n')
+
+    def unknown_decl(self, data):
+        self._flush_text()
+        if data.upper().startswith('CDATA['):
+            self._text.append(data[len('CDATA['):])
+            self._flush_text('<![CDATA[', ']]>')
+        else:
+            self._text.append(data)
+            self._flush_text('<?', '?>')
+
+    def handle_pi(self, data):
+        self._flush_text()
+        self._text.append(data)
+        self._flush_text('<?', '>')
+
+    def close(self):
+        super().close()
+        # Close anything left open at the end of the document
+        self._flush_text()
+        while self._stack:
+            self._close_innermost()
+
+
+def _numeric_reference(name):
+    """
+    Resolves the number in a &#...; reference to text, following the HTML spec.
+    Returns (character, trailing text that turned out not to be part of the reference).
+    """
+    base, pattern = (16, r'([0-9a-f]+)(.*)') if name[:1] in 'xX' else (10, r'([0-9]+)(.*)')
+    digits = name[1:] if base == 16 else name
+    extra = ''
+    try:
+        number = int(digits, base)
+    except ValueError:
+        match = re.match(pattern, digits)
+        if match is None:
+            return '', digits
+        number, extra = int(match.group(1), base), match.group(2)
+
+    if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+        return '�', extra
+    return _WINDOWS_1252_REFERENCES.get(number, chr(number)), extra
+
+
+def _quote_attribute(value):
+    """Escapes an attribute value and wraps it in quotes, preferring double quotes."""
+    value = value.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', '&quot;') + '"'
+
+
+def _trim_breaks(html):
+    """Removes leading and trailing runs of <br> tags (and the whitespace around them)."""
+    match = _LEADING_BREAKS.match(html)
+    start = match.end() if match else 0
+
+    # Walk back over trailing breaks without re-scanning the whole string
+    end = len(html)
+    while True:
+        while end > start and html[end - 1].isspace():
+            end -= 1
+        tag_start = html.rfind('<', start, end)
+        if tag_start == -1 or not _BREAK_TAG.fullmatch(html, tag_start, end):
+            break
+        end = tag_start
+
+    return html[start:end].strip()
+
+
 def clean_and_format_html(dirty_html: str) -> str:
     """
     Cleans dirty HTML from a QTextEdit widget to a standardized format.
@@ -37,52 +269,90 @@ def clean_and_format_html(dirty_html: str) -> str:
     - On <a> tags, it keeps ONLY the 'href' attribute.
     - Strips all other tags, attributes (like style, class), and document structure.
     - Converts paragraph structures into <br><br> for consistent paragraph spacing.
+
+    Runs in a single streaming pass (see _AllowListSanitizer), so time grows linearly with input size.
     """
     if not isinstance(dirty_html, str) or not dirty_html.strip():
         return ""
 
-    soup = BeautifulSoup(dirty_html, 'html.parser')
+    with span("sanitize", bytes=len(dirty_html)):
+        sanitizer = _AllowListSanitizer()
+        sanitizer.feed(dirty_html)
+        sanitizer.close()
+        return _trim_breaks(''.join(sanitizer.output))
 
-    # Completely remove unwanted tags whose content is also unwanted
-    tags_to_discard = [
-        'script', 'style', 'head', 'meta', 'link', 'svg', 'canvas', 'math', 'table',
-        'form', 'input', 'textarea', 'select', 'option', 'button', 'iframe'
-    ]
-    for tag in soup.find_all(tags_to_discard):
-        tag.decompose()
-
-    # Define the tags and attributes that are allowed
-    allowed_tags = {'b', 'strong', 'i', 'em', 'a', 'p', 'br'}
-    allowed_attributes = {'a': ['href']}
-
-    # Find all HTML tags in the document
-    for tag in soup.find_all(True):
-        # If the tag is not allowed, remove the tag but keep its content
-        if tag.name not in allowed_tags:
-            tag.unwrap()
-        else:
-            # If tag is allowed, keep only allowed attributes
-            attrs = dict(tag.attrs)
-            for attr_name, _ in attrs.items():
-                if tag.name in allowed_attributes and attr_name in allowed_attributes[tag.name]:
-                    continue  # Keep this attribute
-                # Remove unallowed attributes
-                del tag[attr_name]
 
-    # Get the HTML content from the body, as soup may have added <html>/<body> tags
-    if soup.body:
-        body_content = ''.join(str(c) for c in soup.body.contents)
-    else:
-        body_content = str(soup)
+def find_html_element(html, tag, element_id):
+    """
+    Finds one element by tag name and id in an HTML page, like BeautifulSoup's find(tag, id=...).
+    Returns an lxml element, or None if the page has no such element.
+
+    The page is parsed by lxml, whose C parser builds the tree without a Python object per node,
+    so picking one element out of a large page costs a fraction of a BeautifulSoup parse.
+    """
+    if not isinstance(html, str) or not html.strip():
+        return None
+
+    # Imported here so that importing utils doesn't load lxml
+    from lxml import etree
+
+    # Parse bytes so that pages carrying an encoding declaration are accepted
+    document = etree.fromstring(html.encode("utf-8"), etree.HTMLParser(encoding="utf-8"))
+    if document is None:
+        return None
+
+    matches = document.xpath(f"//{tag}[@id=$element_id]", element_id=element_id)
+    return matches[0] if matches else None
+
+
+def find_child_element(element, tag, css_class=None):
+    """
+    Returns the first element with this tag inside an lxml element, or None.
+    @param css_class (str): Only match elements that have this class (one of the names in their class attribute).
+    """
+    if css_class is None:
+        return element.find(f".//{tag}")
+    matches = element.xpath(
+        f'.//{tag}[contains(concat(" ", normalize-space(@class), " "), $css_class)]',
+        css_class=f" {css_class} ",
+    )
+    return matches[0] if matches else None
+
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = {"script", "style", "template"}
+
 
-    # Convert <p> tags to <br><br> for consistent paragraph spacing.
-    cleaned_html = re.sub(r'<p.*?>', '', body_content, flags=re.IGNORECASE)
-    cleaned_html = re.sub(r'</p>', '<br><br>', cleaned_html, flags=re.IGNORECASE)
+def _text_pieces(element):
+    """Yields the text of an lxml element and its descendants in document order, as get_text() sees it."""
+    # Comments and processing instructions have a non-string tag; their text isn't page text
+    if isinstance(element.tag, str) and element.tag.lower() not in _NON_TEXT_TAGS:
+        if element.text:
+            yield element.text
+        for child in element:
+            yield from _text_pieces(child)
+            if child.tail:
+                yield child.tail
 
-    # Remove any leading/trailing <br> tags that might result from cleaning
-    cleaned_html = re.sub(r'^(<br\s*/?>\s*)+|(<br\s*/?>\s*)+$', '', cleaned_html)
 
-    return cleaned_html.strip()
+def element_text(element, separator="", strip=False):
+    """
+    Returns the text inside an lxml element, like BeautifulSoup's get_text(): the text of script, style
+    and template elements and of comments is left out.
+    @param separator (str): Placed between the separate pieces of text.
+    @param strip (bool): Strip whitespace from each piece and leave out empty ones.
+    """
+    pieces = _text_pieces(element)
+    if strip:
+        pieces = (piece.strip() for piece in pieces if piece.strip())
+    return separator.join(pieces)
+
+
+def get_domain(url):
+    """Returns a URL's host without a leading "www.", e.g. politico.com. Used to group metrics and health by site."""
+    if not url or not isinstance(url, str):
+        return ""
+    return urlparse(url).netloc.lower().removeprefix("www.")
 
 
 def normalize_url(url):
@@ -167,4 +437,229 @@ def is_article(url, title):
         return False, "Path too short"
     
     # If it passes all checks, assume it's an article.
-    return True, ""
\ No newline at end of file
+    return True, ""
+
+
+_KEYWORD_TERM = re.compile(r'"([^"]+)"|(\S+)')
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def match_text(*parts):
+    """
+    Lowercases text and reduces it to space-separated words, for keyword matching.
+    URLs are split on their punctuation too, so a slug like chip-export-controls yields its words.
+    """
+    return " " + " ".join(_NON_WORD.sub(" ", " ".join(part or "" for part in parts).lower()).split()) + " "
+
+
+def keyword_terms(keyword):
+    """
+    Splits a search keyword into the terms a match needs: each quoted phrase and each bare word.
+    Search operators (-exclusions, site: and the like, OR) are left out.
+    @return list: One tuple of words per term, e.g. '"Section 232" commerce' -> [("section", "232"), ("commerce",)].
+    """
+    terms = []
+    for phrase, word in _KEYWORD_TERM.findall(keyword or ""):
+        if word and (word == "OR" or word.startswith("-") or ":" in word):
+            continue
+        words = tuple(_NON_WORD.sub(" ", (phrase or word).lower()).split())
+        if words:
+            terms.append(words)
+    return terms
+
+
+# Punctuation treated as a word break by split_words
+WORD_SEPARATORS = ",.;:!?\"()[]/'\u2018\u2019\u201c\u201d-\u2013\u2014|&"
+
+
+def split_words(text):
+    """
+    Lowercases text and splits it into words at whitespace and the punctuation in WORD_SEPARATORS.
+    Close to match_text's words, but a chain of str.replace calls is several times faster than its regex on long text.
+    """
+    text = text.lower()
+    for separator in WORD_SEPARATORS:
+        text = text.replace(separator, " ")
+    return text.split()
+
+
+def word_forms(word):
+    """
+    The singular and plural forms a keyword word matches, singular first, e.g. controls -> control, controls, controles.
+    Used where words are looked up in a dictionary rather than matched with term_matches' pattern.
+    """
+    stem = word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+    return stem, stem + "s", stem + "es"
+
+
+def _term_pattern(words):
+    # Each word may carry a plural ending, as the search engine matches both
+    return re.compile(r" " + r" ".join(re.escape(w) + r"(?:s|es)?" for w in words) + r" ")
+
+
+_TERM_PATTERNS = {}
+
+
+def term_matches(words, text):
+    """True if the words appear in order, next to each other, in text from match_text."""
+    pattern = _TERM_PATTERNS.get(words)
+    if pattern is None:
+        pattern = _TERM_PATTERNS[words] = _term_pattern(words)
+    return pattern.search(text) is not None
+
+
+def attribute_keyword(keywords, *parts):
+    """
+    Works out which of several keywords a search result was found for, from its title, snippet and URL.
+
+    - The first keyword all of whose terms appear wins.
+    - Otherwise the keyword with the largest share of its words present wins (earlier keywords on ties),
+      since the search engine may have matched text we can't see, such as the article body.
+    @param keywords (list): Candidate keywords, in priority order.
+    @return str: One of keywords.
+    """
+    text = match_text(*parts)
+    best_keyword, best_score = keywords[0], -1.0
+    for keyword in keywords:
+        terms = keyword_terms(keyword)
+        if terms and all(term_matches(term, text) for term in terms):
+            return keyword
+        words = [word for term in terms for word in term]
+        score = sum(term_matches((word,), text) for word in words) / len(words) if words else 0.0
+        if score > best_score:
+            best_keyword, best_score = keyword, score
+    return best_keyword
+
+
+def _split_keyword(keyword):
+    """
+    Splits a keyword into its first term and the rest, as they are written (quoted phrases keep their quotes).
+    @return tuple: (first term, tuple of the other terms), or None if the keyword uses search operators.
+    """
+    raw_terms = [f'"{phrase}"' if phrase else word for phrase, word in _KEYWORD_TERM.findall(keyword or "")]
+    if not raw_terms or any(term == "OR" or term.startswith("-") or ":" in term for term in raw_terms):
+        return None
+    return raw_terms[0], tuple(raw_terms[1:])
+
+
+def batch_query(keywords):
+    """
+    The single query that finds what each of the keywords would, for a group from build_query_batches.
+    OR binds tighter than the implicit AND, so '"Jeffrey Kessler" OR "Section 232" commerce department'
+    means ("Jeffrey Kessler" or "Section 232") and commerce and department.
+    """
+    if len(keywords) == 1:
+        return keywords[0]
+    first_terms = [_split_keyword(keyword)[0] for keyword in keywords]
+    shared_terms = _split_keyword(keywords[0])[1]
+    return " ".join([" OR ".join(first_terms), *shared_terms])
+
+
+def build_query_batches(keywords, max_keywords=CSE_BATCH_SIZE, max_chars=CSE_MAX_QUERY_CHARS,
+                        max_words=CSE_MAX_QUERY_WORDS):
+    """
+    Packs keywords into groups that are each searched as one OR query (see batch_query).
+    Keywords can share a query when they differ only in their first term, e.g. several quoted phrases,
+    or '"Jeffrey Kessler" commerce department' and '"Section 232" commerce department'.
+    Groups are ordered by their first keyword, so higher-priority keywords are still searched first.
+    @return list: Lists of keywords.
+    """
+    batches = []
+    open_batches = {} # Shared terms -> the batch still taking keywords with them, already placed in batches
+    for keyword in keywords:
+        split = _split_keyword(keyword)
+        if split is None:
+            batches.append([keyword])
+            continue
+
+        shared_terms = split[1]
+        current = open_batches.get(shared_terms)
+        if current is not None:
+            query = batch_query(current + [keyword])
+            if len(current) < max_keywords and len(query) <= max_chars and len(query.split()) <= max_words:
+                current.append(keyword)
+                continue
+        current = open_batches[shared_terms] = [keyword]
+        batches.append(current)
+    return batches
+
+
+def parse_retry_after(value, now=None):
+    """
+    Converts a Retry-After header to a number of seconds to wait.
+    Accepts both forms the header can take: a number of seconds or an HTTP date.
+    Returns None if the header is missing or unreadable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+def parse_timestamp(text):
+    """
+    Parses a feed or sitemap date, RFC 822 (RSS) or ISO 8601 (Atom, sitemaps), into a Unix time.
+    Dates without a time zone are taken as UTC. Returns None if the date can't be read.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        # The two standard formats have fast parsers; dateutil handles the rest, at many times the cost
+        parsed = parsedate_to_datetime(text) if text[:1].isalpha() else datetime.fromisoformat(text)
+    except (TypeError, ValueError):
+        from dateutil import parser as date_parser
+        try:
+            parsed = date_parser.parse(text)
+        except (ValueError, OverflowError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def atomic_write_bytes(path, data):
+    """
+    Writes bytes to a file so that readers only ever see the old or the new contents.
+
+    - Writes to a temporary file in the same directory and fsyncs it.
+    - Atomically renames it over the target with os.replace.
+    - A crash mid-write leaves the previous file intact.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=os.path.basename(path), dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        # Don't leave half-written temp files behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # Persist the rename itself (not supported on Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write_text(path, text, encoding="utf-8"):
+    """Text version of atomic_write_bytes. Newlines are written as-is."""
+    atomic_write_bytes(path, text.encode(encoding))
@@ -1,4 +1,6 @@
 from PySide6.QtWidgets import QMainWindow, QStackedWidget
+from PySide6.QtCore import Signal
+from PySide6.QtGui import QAction, QKeySequence
 from .pages.main_menu_page import MainMenuWidget
 from .pages.article_management_page import ArticleManagementWidget
 from .pages.search_results_page import SearchResultsWidget
@@ -7,7 +9,21 @@ from .pages.manual_input_page import ManualInputWidget
 class MainWindow(QMainWindow):
     """
     Defines main application window.
+    Pages are constructed on their first switch_page call rather than up front.
     """
+    # Emitted with the page name right after a page is constructed, so controllers can wire it up
+    page_created = Signal(str)
+    # Hidden Ctrl+Shift+P action that turns profiling of hot operations on or off
+    profiling_toggle_requested = Signal()
+
+    # Maps page names to the widget class that implements them
+    PAGE_CLASSES = {
+        "main_menu": MainMenuWidget,
+        "article_management": ArticleManagementWidget,
+        "search_results": SearchResultsWidget,
+        "manual_input": ManualInputWidget,
+    }
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("News Automation Tool")
@@ -21,36 +37,59 @@ class MainWindow(QMainWindow):
         # Create a stacked widget to manage different views
         self.Stack = QStackedWidget(self)
 
-        # Create an instance of each view widget
-        self.main_menu_page = MainMenuWidget()
-        self.article_management_page = ArticleManagementWidget()
-        self.search_results_page = SearchResultsWidget()
-        self.manual_input_page = ManualInputWidget()
-
-        # Add the widgets to the stacked widget
-        self.Stack.addWidget(self.main_menu_page)
-        self.Stack.addWidget(self.article_management_page)
-        self.Stack.addWidget(self.search_results_page)
-        self.Stack.addWidget(self.manual_input_page)
-
-        # Set initial page to main menu
-        self.Stack.setCurrentWidget(self.main_menu_page)
+        # Pages that have been constructed so far, keyed by name
+        self.pages = {}
 
         # Set the stacked widget as the central widget of the main window
         self.setCentralWidget(self.Stack)
 
+        # Hidden action (no menu entry) for toggling profiling
+        self.toggle_profiling_action = QAction("Toggle Profiling", self)
+        self.toggle_profiling_action.setShortcut(QKeySequence("Ctrl+Shift+P"))
+        self.toggle_profiling_action.triggered.connect(self.profiling_toggle_requested.emit)
+        self.addAction(self.toggle_profiling_action)
+
+    def has_page(self, page: str) -> bool:
+        """Returns True if the named page has already been constructed."""
+        return page in self.pages
+
+    def get_page(self, page: str):
+        """
+        Returns the named page, constructing it and adding it to the stack on first use.
+        @param page (str): The name of the page.
+        """
+        if page not in self.pages:
+            if page not in self.PAGE_CLASSES:
+                raise ValueError(f"Unknown page: {page}")
+
+            widget = self.PAGE_CLASSES[page]()
+            self.pages[page] = widget
+            self.Stack.addWidget(widget)
+
+            # Let controllers connect signals and bind data before the page is shown
+            self.page_created.emit(page)
+
+        return self.pages[page]
+
+    @property
+    def main_menu_page(self):
+        return self.get_page("main_menu")
+
+    @property
+    def article_management_page(self):
+        return self.get_page("article_management")
+
+    @property
+    def search_results_page(self):
+        return self.get_page("search_results")
+
+    @property
+    def manual_input_page(self):
+        return self.get_page("manual_input")
+
     def switch_page(self, page: str):
         """
         Switches to a specified page in the stacked widget.
         @param page (str): The name of the page to switch to.
         """
-        if page == "main_menu":
-            self.Stack.setCurrentWidget(self.main_menu_page)
-        elif page == "article_management":
-            self.Stack.setCurrentWidget(self.article_management_page)
-        elif page == "search_results":
-            self.Stack.setCurrentWidget(self.search_results_page)
-        elif page == "manual_input":
-            self.Stack.setCurrentWidget(self.manual_input_page)
-        else:
-            raise ValueError(f"Unknown page: {page}")
\ No newline at end of file
+        self.Stack.setCurrentWidget(self.get_page(page))
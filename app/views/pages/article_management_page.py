@@ -1,9 +1,9 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QSplitter, QSizePolicy,
-                                QHBoxLayout, QLineEdit, QListWidgetItem, QAbstractItemView, QMessageBox)
-from PySide6.QtCore import Qt, Signal, Slot
+                                QHBoxLayout, QLineEdit, QMessageBox)
+from PySide6.QtCore import Qt, Signal, Slot, QModelIndex
 from ..widgets.article_preview_widget import ArticlePreviewWidget
 from app.models.article import Article
-from ..widgets.reorderable_list_widget import ReorderableListWidget
+from ..widgets.reorderable_list_view import ReorderableListView
 
 class ArticleManagementWidget(QWidget):
     # Custom signals, connect to ArticleController
@@ -14,7 +14,6 @@ class ArticleManagementWidget(QWidget):
     edit_article_requested = Signal(Article)
     delete_article_requested = Signal(Article)
     save_articles_requested = Signal()
-    reorder_articles_requested = Signal(list)
     delete_all_requested = Signal()
 
     def __init__(self):
@@ -75,15 +74,11 @@ class ArticleManagementWidget(QWidget):
         self.splitter = QSplitter(Qt.Orientation.Horizontal)
         self.splitter.setSizes([300, 500]) # Initial width ratio
 
-        # Master view: listbox
-        self.listbox = ReorderableListWidget()
+        # Master view: listbox (drag-and-drop reordering is handled by its model)
+        self.listbox = ReorderableListView()
 
-        # Enable drag-and-drop and previewing
-        self.listbox.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
-        self.listbox.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.listbox.setDefaultDropAction(Qt.DropAction.MoveAction)
-        self.listbox.itemClicked.connect(self._on_item_changed)
-        self.listbox.orderChanged.connect(self._on_order_changed)
+        # Enable previewing
+        self.listbox.clicked.connect(self._on_item_changed)
         self.splitter.addWidget(self.listbox)
 
         # Detail view: preview pane
@@ -124,28 +119,18 @@ class ArticleManagementWidget(QWidget):
             self.url_scrape_requested.emit(url)
             self.url_input.clear()
 
-    @Slot()
-    def _on_item_changed(self):
+    @Slot(QModelIndex)
+    def _on_item_changed(self, index):
         """
         Handles selection of an article title in the listbox.
         """
-        selected_item = self.listbox.currentItem()
-
-        if selected_item:
+        if index.isValid():
             # Get the Article object
-            article = selected_item.data(Qt.ItemDataRole.UserRole)
+            article = index.data(Qt.ItemDataRole.UserRole)
 
             # Pass that article to the controller
             self.article_preview_requested.emit(article)
 
-    @Slot()
-    def _on_order_changed(self):
-        """
-        Handles reordering of article listbox
-        """
-        titles = [self.listbox.item(i).text() for i in range(self.listbox.count())]
-        self.reorder_articles_requested.emit(titles)
-
     @Slot()
     def _on_delete_all_clicked(self):
         # QMessageBox question to confirm delete
@@ -157,31 +142,23 @@ class ArticleManagementWidget(QWidget):
         if confirmation == QMessageBox.StandardButton.Yes:
             self.delete_all_requested.emit()
 
-    def populate_list(self, articles):
+    def set_model(self, model):
         """
-        Displays the list of article titles in the ListWidget.
-        
-        @param articles: list of Article objects.
-        """
-        # Clear preview pane
-        self.preview_pane.clear_display()
-
-        # Clear listbox
-        self.listbox.clear()
+        Binds the listbox to an article list model.
+        The model keeps the list in sync with the collection, so selection survives edits and reorders.
 
-        for article in articles:
-            # Create a list item
-            title_item = QListWidgetItem(article.title)
-            
-            # Set the Article object as hidden data on the title
-            title_item.setData(Qt.ItemDataRole.UserRole, article)
-
-            # Add the item to the list widget
-            self.listbox.addItem(title_item)
+        @param model: ArticleListModel bound to the ArticleManager.
+        """
+        self.listbox.setModel(model)
 
-    def update_preview(self, article):
+    def update_preview(self, article, content):
         """Public method to update preview content"""
-        self.preview_pane.display_article(article)
+        self.preview_pane.display_article(article, content)
+
+    def clear_preview_if_showing(self, article):
+        """Clears the preview pane if it is showing the given article (e.g. after it was deleted)."""
+        if self.preview_pane.article and self.preview_pane.article.id == article.id:
+            self.preview_pane.clear_display()
 
     def reset_view(self):
         """Resets the state of the article management widget."""
@@ -9,6 +9,7 @@ class MainMenuWidget(QWidget):
     search_requested = Signal()
     search_results_page_requested = Signal()
     articles_page_requested = Signal()
+    stats_requested = Signal()
     # Potential addition: settings page
 
     def __init__(self):
@@ -35,12 +36,16 @@ class MainMenuWidget(QWidget):
         self.articles_button = QPushButton("Manage Articles")
         self.articles_button.clicked.connect(self.articles_page_requested.emit)
 
+        self.stats_button = QPushButton("View Performance Stats")
+        self.stats_button.clicked.connect(self.stats_requested.emit)
+
         # Add components to main layout
         self.main_layout.addWidget(self.page_header)
         self.main_layout.addWidget(self.page_subheader)
         self.main_layout.addWidget(self.search_button)
         self.main_layout.addWidget(self.search_results_button)
         self.main_layout.addWidget(self.articles_button)
+        self.main_layout.addWidget(self.stats_button)
 
         # Set layout for this widget
         self.setLayout(self.main_layout)
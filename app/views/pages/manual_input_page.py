@@ -168,10 +168,11 @@ class ManualInputWidget(QWidget):
         self.submit_btn.setText("Add Article")
         self.header.setText("<h2>Enter Article Details</h2>")
 
-    def set_article_data(self, article: Article):
+    def set_article_data(self, article: Article, content: str):
         """
         Populates the form with data from an Article object for editing.
         @param article: Article object to populate the form with.
+        @param content: The article's HTML content.
         """
         # Set flags
         self.is_editing_mode = True
@@ -186,4 +187,4 @@ class ManualInputWidget(QWidget):
         self.lead_input.setText(article.lead if article.lead else "")
         self.author_input.setText(", ".join(article.author) if article.author else "")
         self.source_input.setText(article.source)
-        self.content_input.setHtml(article.content)
\ No newline at end of file
+        self.content_input.setHtml(content)
\ No newline at end of file
@@ -1,8 +1,10 @@
 import webbrowser
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QTableWidgetItem, QHBoxLayout, 
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
                                QPushButton, QAbstractItemView, QLabel, QSizePolicy)
+from app.models.search_results_model import SearchResultsModel, SearchResultsFilterProxy
 from ..widgets.search_table_widget import SearchTableWidget
+from ..widgets.add_button_delegate import AddButtonDelegate
 
 class SearchResultsWidget(QWidget):
     """
@@ -12,6 +14,7 @@ class SearchResultsWidget(QWidget):
     rerun_search_requested = Signal()
     main_menu_requested = Signal()
     article_addition_requested = Signal(dict)
+    articles_addition_requested = Signal(list)
     articles_page_requested = Signal()
 
     def __init__(self):
@@ -35,26 +38,59 @@ class SearchResultsWidget(QWidget):
         self.rerun_search_btn = QPushButton("Rerun Search")
         self.rerun_search_btn.clicked.connect(self.rerun_search_requested.emit)
         self.main_layout.addWidget(self.rerun_search_btn)
-    
+
+        # Filter box for narrowing results by source or keyword
+        self.filter_layout = QHBoxLayout()
+        self.filter_label = QLabel("Filter: ")
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by source or keyword")
+        self.filter_input.setClearButtonEnabled(True)
+        self.filter_layout.addWidget(self.filter_label)
+        self.filter_layout.addWidget(self.filter_input)
+        self.main_layout.addLayout(self.filter_layout)
+
+        # Results live in a model; the proxy handles sorting and filtering
+        self.results_model = SearchResultsModel(self)
+        self.proxy_model = SearchResultsFilterProxy(self)
+        self.proxy_model.setSourceModel(self.results_model)
+        self.filter_input.textChanged.connect(self.proxy_model.set_filter_text)
+
         # Create search results table using SearchTableWidget
         self.table = SearchTableWidget()
-        
-        # Disable editing
+        self.table.setModel(self.proxy_model)
+
+        # Paint the "Add to Email" buttons instead of creating a widget per row
+        self.add_button_delegate = AddButtonDelegate(self.table)
+        self.add_button_delegate.clicked.connect(self._on_add_clicked)
+        self.table.setItemDelegateForColumn(SearchResultsModel.ACTION_COLUMN, self.add_button_delegate)
+
+        # Disable editing; rows can be multi-selected and added together
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.main_layout.addWidget(self.table)
 
+        # Progress of a multi-article add, hidden when nothing is being scraped
+        self.scrape_status_label = QLabel()
+        self.scrape_status_label.setWordWrap(True)
+        self.scrape_status_label.hide()
+        self.main_layout.addWidget(self.scrape_status_label)
+
         # Action buttons
         self.action_btns = QHBoxLayout()
         self.main_menu_btn = QPushButton("Back to Main Menu")
         self.main_menu_btn.clicked.connect(self.main_menu_requested.emit)
         self.articles_page_btn= QPushButton("Proceed to Manage Articles")
         self.articles_page_btn.clicked.connect(self.articles_page_requested.emit)
+        self.add_selected_btn = QPushButton("Add Selected to Email")
+        self.add_selected_btn.clicked.connect(self._on_add_selected_clicked)
         self.action_btns.addWidget(self.main_menu_btn)
+        self.action_btns.addWidget(self.add_selected_btn)
         self.action_btns.addWidget(self.articles_page_btn)
         self.main_layout.addLayout(self.action_btns)
 
-        # Connect the item clicked signal to a method that opens the URL
-        self.table.itemClicked.connect(self._on_title_clicked)
+        # Connect the clicked signal to a method that opens the URL
+        self.table.clicked.connect(self._on_title_clicked)
 
         # Set layout
         self.setLayout(self.main_layout)
@@ -62,41 +98,71 @@ class SearchResultsWidget(QWidget):
 
     def display_results(self, results):
         """
-        Displays the search results in the table.
+        Displays the search results in the table, replacing any previous results.
         
         @param results: List of dictionaries containing article information.
         """
-        self.table.setRowCount(len(results))
-        for row, article in enumerate(results):
-            # Create a table item for the title
-            title_item = QTableWidgetItem(article['title'])
-            # Set the URL as hidden data on the title item
-            title_item.setData(Qt.ItemDataRole.UserRole, article['url'])
-
-            # Create "Add to Email" button for each article
-            add_btn = QPushButton("Add to Email")
-            add_btn.setStyleSheet("""
-                QPushButton {
-                    padding: 2px 4px;
-                    margin: 0px
-                }
-            """)
-            # Use a lambda function to to pass specific article from the loop when clicked
-            add_btn.clicked.connect(
-                lambda _=False, # Catch boolean value from click
-                article=article: (self.article_addition_requested.emit(article))
-            )
-
-            # Set the items in the table
-            self.table.setItem(row, 0, title_item)
-            self.table.setItem(row, 1, QTableWidgetItem(article['source']))
-            self.table.setItem(row, 2, QTableWidgetItem(article['keyword']))
-            self.table.setCellWidget(row, 3, add_btn)
-
-    def _on_title_clicked(self, item):
-        """
-        Opens the URL associated with the clicked title item.
-        """
-        url = item.data(Qt.ItemDataRole.UserRole)
-        if url:
-            webbrowser.open(url)
\ No newline at end of file
+        self.results_model.set_results(results)
+
+    def append_results(self, results):
+        """
+        Adds more search results to the end of the table, keeping the rows already shown.
+
+        @param results: List of dictionaries containing article information.
+        """
+        self.results_model.append_results(results)
+
+    def set_flagged_domains(self, flagged_domains):
+        """
+        Highlights results from sites whose scrapes keep failing, so they can be added manually instead.
+
+        @param flagged_domains (dict): {domain: description of the failure}
+        """
+        self.results_model.set_flagged_domains(flagged_domains)
+
+    def _on_add_clicked(self, index):
+        """
+        Passes the article of the clicked "Add to Email" button on to the controller.
+        """
+        article = index.data(Qt.ItemDataRole.UserRole)
+        if article:
+            self.article_addition_requested.emit(article)
+
+    def _on_add_selected_clicked(self):
+        """
+        Passes the articles of all selected rows on to the controller, in table order.
+        """
+        rows = sorted(self.table.selectionModel().selectedRows(), key=lambda index: index.row())
+        articles = [index.data(Qt.ItemDataRole.UserRole) for index in rows]
+        articles = [article for article in articles if article]
+        if articles:
+            self.articles_addition_requested.emit(articles)
+
+    def show_scrape_progress(self, done, total, queue_depths=None):
+        """
+        Shows how far a multi-article add has got. Hides the status line once everything is done.
+
+        @param done (int): Articles finished so far (added or failed).
+        @param total (int): Articles in the batch.
+        @param queue_depths (dict): {site: articles still waiting} from the scrape scheduler.
+        """
+        if done >= total:
+            self.scrape_status_label.hide()
+            return
+
+        text = f"Adding articles: {done} of {total} done"
+        if queue_depths:
+            waiting = ", ".join(f"{host} ({count})" for host, count in sorted(queue_depths.items()))
+            text += f". Waiting on: {waiting}"
+        self.scrape_status_label.setText(text)
+        self.scrape_status_label.show()
+
+    def _on_title_clicked(self, index):
+        """
+        Opens the URL associated with the clicked title cell.
+        """
+        if index.column() != SearchResultsModel.TITLE_COLUMN:
+            return
+        article = index.data(Qt.ItemDataRole.UserRole)
+        if article and article.get('url'):
+            webbrowser.open(article['url'])
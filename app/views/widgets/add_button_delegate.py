@@ -0,0 +1,31 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionButton, QStyle, QApplication
+from PySide6.QtCore import Qt, Signal, QEvent, QModelIndex
+
+class AddButtonDelegate(QStyledItemDelegate):
+    """
+    Paints a push button in a table cell and emits clicked(index) when it is pressed.
+    Unlike setCellWidget, no QPushButton is created per row, so large tables stay cheap.
+    """
+    clicked = Signal(QModelIndex)
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = index.data(Qt.ItemDataRole.DisplayRole)
+        button.state = QStyle.StateFlag.State_Enabled
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            button.state |= QStyle.StateFlag.State_MouseOver
+
+        # Draw with the view's style so the button matches the rest of the UI
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+
+    def editorEvent(self, event, model, option, index):
+        # Treat a left-button release inside the cell as a click
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and option.rect.contains(event.position().toPoint())):
+            self.clicked.emit(index)
+            return True
+        return super().editorEvent(event, model, option, index)
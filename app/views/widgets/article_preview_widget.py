@@ -65,9 +65,11 @@ class ArticlePreviewWidget(QWidget):
 
         self.clear_display()
 
-    def display_article(self, article: 'Article'):
+    def display_article(self, article: 'Article', content: str):
         """
         Populates the preview pane with article details
+        @param article: Article to display.
+        @param content: The article's HTML content, loaded on demand by the controller.
         """
         self.article = article
 
@@ -79,7 +81,7 @@ class ArticlePreviewWidget(QWidget):
         self.source_label.setText(f"<b>Source:</b> {self.article.source}")
 
         # Set content
-        self.content_text.setHtml(self.article.content)
+        self.content_text.setHtml(content)
 
         # Set visibility for widgets
         self.title_label.setVisible(True)
@@ -0,0 +1,15 @@
+from PySide6.QtWidgets import QListView, QAbstractItemView
+from PySide6.QtCore import Qt
+
+class ReorderableListView(QListView):
+    """
+    List view whose rows can be reordered by drag-and-drop.
+    The model performs the move, so the view only needs to be configured for internal moves.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setDefaultDropAction(Qt.DropAction.MoveAction)
+        self.setDropIndicatorShown(True)
+        self.setUniformItemSizes(True)
@@ -1,27 +1,64 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QSpinBox, QDialogButtonBox, QPushButton
+from PySide6.QtCore import Signal
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QSpinBox, QDialogButtonBox, QPushButton, QCheckBox,
+                               QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
 
 class SearchDialog(QDialog):
     """
-    Dialog for searching articles with a date range.
+    Dialog for searching articles with a date range. Also shows today's Custom Search quota use
+    and which keywords the search will query.
     """
-    def __init__(self, parent=None):
+    # The days or batching option changed, so the planned queries need to be shown again
+    plan_changed = Signal()
+
+    def __init__(self, parent=None, batched=False, incremental=False):
         super().__init__(parent)
         self.setWindowTitle("Search Articles")
-        self.initUI()
-        
-    def initUI(self):
+        self.initUI(batched, incremental)
+
+    def initUI(self, batched, incremental):
         # Define layout and components
         self.main_layout = QVBoxLayout()
-        
+
         self.label = QLabel("Select the number of days back to search:")
         self.main_layout.addWidget(self.label)
-        
+
         # Add a spinbox for selecting number of days back
         self.days_back_spinbox = QSpinBox()
         self.days_back_spinbox.setRange(1, 7)  # Allow up to 7 days
         self.days_back_spinbox.setValue(1)  # Default to 1 day
+        self.days_back_spinbox.valueChanged.connect(self.plan_changed.emit)
         self.main_layout.addWidget(self.days_back_spinbox)
-        
+
+        # Batched mode: several keywords per query, each result's keyword worked out locally
+        self.batch_checkbox = QCheckBox("Combine keywords into fewer queries")
+        self.batch_checkbox.setToolTip("Uses less search quota when keywords have few results. Each query "
+                                       "returns 10 results per page, so keywords with many results need as "
+                                       "many calls as before.")
+        self.batch_checkbox.setChecked(batched)
+        self.batch_checkbox.toggled.connect(self.plan_changed.emit)
+        self.main_layout.addWidget(self.batch_checkbox)
+
+        # Incremental mode: leave out results already shown by an earlier search
+        self.incremental_checkbox = QCheckBox("Only show results new since the last search")
+        self.incremental_checkbox.setToolTip("Results shown before are hidden, and each keyword stops paging "
+                                             "once it reaches results shown before.")
+        self.incremental_checkbox.setChecked(incremental)
+        self.main_layout.addWidget(self.incremental_checkbox)
+
+        # Quota ledger: usage today and the planned keyword order
+        self.quota_label = QLabel()
+        self.quota_label.setWordWrap(True)
+        self.main_layout.addWidget(self.quota_label)
+
+        self.quota_table = QTableWidget(0, 4)
+        self.quota_table.setHorizontalHeaderLabels(["Keyword", "Plan", "Calls today", "Yield"])
+        self.quota_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.quota_table.verticalHeader().setVisible(False)
+        self.quota_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.quota_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.quota_table.setMinimumWidth(520)
+        self.main_layout.addWidget(self.quota_table)
+
         # Add buttons to run search or cancel
         self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel)
         self.run_search_button = QPushButton("Run Search")
@@ -35,4 +72,34 @@ class SearchDialog(QDialog):
 
     def get_selected_days(self):
         """Returns the number of days selected in the spinbox."""
-        return self.days_back_spinbox.value()
\ No newline at end of file
+        return self.days_back_spinbox.value()
+
+    def is_batched(self):
+        """Returns whether keywords should be combined into OR queries."""
+        return self.batch_checkbox.isChecked()
+
+    def is_incremental(self):
+        """Returns whether results shown by earlier searches should be hidden."""
+        return self.incremental_checkbox.isChecked()
+
+    def display_quota(self, summary):
+        """
+        Shows the quota ledger.
+        @param summary (dict): From QuotaLedger.summary: "used", "quota", "remaining", "exhausted", "queries" and "rows".
+        """
+        if summary["exhausted"]:
+            text = f"Custom Search quota: used up for today ({summary['used']} queries made)."
+        else:
+            text = (f"Custom Search quota: {summary['used']} of {summary['quota']} queries used today, "
+                    f"{summary['remaining']} left. This search will make {summary['queries']}.")
+        self.quota_label.setText(text)
+
+        rows = summary["rows"]
+        self.quota_table.setRowCount(len(rows))
+        for row, entry in enumerate(rows):
+            cells = [entry["keyword"], entry["status"], entry["calls_today"], f"{entry['yield']:.0%}"]
+            for column, value in enumerate(cells):
+                item = QTableWidgetItem(str(value))
+                if entry["last_searched"]:
+                    item.setToolTip(f"Last searched {entry['last_searched']}")
+                self.quota_table.setItem(row, column, item)
@@ -1,48 +1,62 @@
-from PySide6.QtWidgets import QTableWidget, QHeaderView
+from PySide6.QtWidgets import QTableView, QHeaderView
+from PySide6.QtCore import Qt
 
-class SearchTableWidget(QTableWidget):
+class SearchTableWidget(QTableView):
     def __init__(self, parent=None):
         super(SearchTableWidget, self).__init__(parent)
-        
-        # Set up the table
-        self.setColumnCount(4)
-        self.setHorizontalHeaderLabels(["Title", "Source", "Keyword", ""])
-        
-        # Set initial column widths proportionally
+
+        # Fixed row heights and no word wrap let the view skip per-row size calculations
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setVisible(False)
+        self.setWordWrap(False)
+
+        # Needed for the hover state of the delegate-painted buttons
+        self.setMouseTracking(True)
+
+        # Start unsorted (in ranked order); clicking a header sorts by that column
+        self.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.setSortingEnabled(True)
+
+        # Store the old width for scaling
         total_width = self.width()
         if total_width == 0:
             total_width = 800  # Default width if not yet set
-        self.setColumnWidth(0, int(0.45 * total_width))  # Title: 60%
-        self.setColumnWidth(1, int(0.20 * total_width))  # Source: 15%
-        self.setColumnWidth(2, int(0.20 * total_width))  # Keyword: 15%
-        self.setColumnWidth(3, int(0.13 * total_width))  # Button: 10%
-        
+        self.old_width = total_width
+
+    def setModel(self, model):
+        super(SearchTableWidget, self).setModel(model)
+
+        # Columns only exist once a model is set, so size them here
+        total_width = self.old_width
+        self.setColumnWidth(0, int(0.42 * total_width))  # Title
+        self.setColumnWidth(1, int(0.17 * total_width))  # Source
+        self.setColumnWidth(2, int(0.17 * total_width))  # Keyword
+        self.setColumnWidth(3, int(0.08 * total_width))  # Score
+        self.setColumnWidth(4, int(0.13 * total_width))  # Button
+
         # Make all columns interactive (user-resizable)
         header = self.horizontalHeader()
-        for i in range(4):
+        for i in range(header.count()):
             header.setSectionResizeMode(i, QHeaderView.Interactive)
-        
-        # Store the old width for scaling
-        self.old_width = total_width
 
     def resizeEvent(self, event):
         # Call the parent's resizeEvent
         super(SearchTableWidget, self).resizeEvent(event)
-        
+
         # Get the new width
         new_width = self.width()
-        
+
         # Calculate the scale factor
         if hasattr(self, 'old_width') and self.old_width > 0:
             scale = new_width / self.old_width
         else:
             scale = 1
-        
+
         # Scale each column proportionally
-        for i in range(4):
+        for i in range(self.horizontalHeader().count()):
             current_width = self.columnWidth(i)
             new_col_width = int(current_width * scale)
             self.setColumnWidth(i, new_col_width)
-        
+
         # Update the old width
-        self.old_width = new_width
\ No newline at end of file
+        self.old_width = new_width
@@ -0,0 +1,59 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+                               QDialogButtonBox, QHeaderView, QAbstractItemView)
+
+class StatsDialog(QDialog):
+    """
+    Dialog showing p50/p95 timings per pipeline stage and per stage and domain.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Performance Stats")
+        self.setMinimumSize(600, 500)
+        self.initUI()
+
+    def initUI(self):
+        self.main_layout = QVBoxLayout()
+
+        # Per-stage table
+        self.stage_label = QLabel("<b>Per stage</b>")
+        self.main_layout.addWidget(self.stage_label)
+        self.stage_table = self._create_table(["Stage", "Count", "p50 (ms)", "p95 (ms)"])
+        self.main_layout.addWidget(self.stage_table)
+
+        # Per-domain table
+        self.domain_label = QLabel("<b>Per stage and domain</b>")
+        self.main_layout.addWidget(self.domain_label)
+        self.domain_table = self._create_table(["Stage", "Domain", "Count", "p50 (ms)", "p95 (ms)"])
+        self.main_layout.addWidget(self.domain_table)
+
+        # Close button
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.button_box.rejected.connect(self.reject)
+        self.main_layout.addWidget(self.button_box)
+
+        self.setLayout(self.main_layout)
+
+    def _create_table(self, headers):
+        """Creates a read-only table with the given column headers."""
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        return table
+
+    def display_stats(self, stage_stats, domain_stats):
+        """
+        Fills the tables.
+        @param stage_stats (dict): {(stage,): {"count", "p50", "p95"}} from MetricsRecorder.summarize.
+        @param domain_stats (dict): {(stage, domain): {"count", "p50", "p95"}}.
+        """
+        self._fill_table(self.stage_table, stage_stats)
+        self._fill_table(self.domain_table, domain_stats)
+
+    def _fill_table(self, table, stats):
+        table.setRowCount(len(stats))
+        for row, (key, values) in enumerate(stats.items()):
+            cells = [*key, values["count"], f"{values['p50']:.1f}", f"{values['p95']:.1f}"]
+            for column, value in enumerate(cells):
+                table.setItem(row, column, QTableWidgetItem(str(value)))
@@ -0,0 +1,99 @@
+"""
+Memory benchmark: resident size of 10k articles, before and after the compact Article record.
+
+Compares:
+- "dict-backed, content in memory": a non-slotted dataclass holding every article's HTML (the old layout).
+- "slotted, content on disk": the current Article with content moved to a ContentStore.
+
+Usage: python benchmarks/bench_article_memory.py [--count N] [--content-kb K]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+import uuid
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.article import Article
+from app.models.content_store import ContentStore
+
+SOURCES = ["Associated Press", "New York Times", "POLITICO", "Financial Times", "CNBC", "Reuters"]
+KEYWORDS = ["\"export control\"", "\"semiconductor export\"", "chip war", "\"Bureau of Industry and Security\""]
+
+
+@dataclass
+class LegacyArticle:
+    """The Article layout before the compact record: no slots, content always resident."""
+    title: str
+    content: str
+    source: str
+    keyword: str = "Manual"
+    author: List[str] = field(default_factory=list)
+    url: Optional[str] = None
+    lead: Optional[str] = None
+    id: Optional[str] = None
+
+
+def make_rows(count, content_kb):
+    """Builds article field dictionaries with freshly allocated strings, like rows parsed from a file."""
+    paragraph = "Export controls on advanced chips were tightened again this week. " * 16
+    content = "<br><br>".join([paragraph] * max(1, (content_kb * 1024) // len(paragraph)))
+    for i in range(count):
+        yield {
+            "title": f"Article Number {i} About Export Controls",
+            "content": content + str(i), # Unique string per article
+            # Build new string objects so interning (not literal sharing) is what dedupes them
+            "source": "".join(SOURCES[i % len(SOURCES)]),
+            "keyword": "".join(KEYWORDS[i % len(KEYWORDS)]),
+            "author": [f"Reporter {i % 50}"],
+            "url": f"https://www.example.com/2025/07/{i}/export-controls",
+            "id": str(uuid.uuid4()),
+        }
+
+
+def measure(build):
+    """Returns (result, bytes allocated and still alive) for a builder function."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--count", type=int, default=10_000, help="number of articles")
+    arg_parser.add_argument("--content-kb", type=int, default=8, help="approximate HTML size per article")
+    args = arg_parser.parse_args()
+
+    legacy, legacy_bytes = measure(lambda: [LegacyArticle(**row) for row in make_rows(args.count, args.content_kb)])
+    del legacy
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ContentStore(directory)
+
+        def build_compact():
+            articles = []
+            for row in make_rows(args.count, args.content_kb):
+                article = Article(**row)
+                store.put(article.id, article.content)
+                article.content = None
+                articles.append(article)
+            return articles
+
+        compact, compact_bytes = measure(build_compact)
+        disk_bytes = sum(entry.stat().st_size for entry in os.scandir(directory))
+        del compact
+
+    print(f"{args.count} articles, ~{args.content_kb} KB content each")
+    print(f"  dict-backed, content in memory: {legacy_bytes / 1_048_576:8.1f} MB resident")
+    print(f"  slotted, content on disk:       {compact_bytes / 1_048_576:8.1f} MB resident, "
+          f"{disk_bytes / 1_048_576:.1f} MB on disk (compressed={store.compress})")
+
+
+if __name__ == "__main__":
+    main()
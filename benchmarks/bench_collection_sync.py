@@ -0,0 +1,274 @@
+"""
+Shared collection benchmark: several clients changing one collection server at once, all on localhost.
+
+Starts a collection server in-process on a temporary directory. Writer clients add articles and edit articles
+other writers added, all at the same time; watcher clients long-poll for changes as the app does and replay them.
+Reports:
+- propagation: from the moment a writer sends an article to the moment each watcher has it, p50/p95/max
+- edits refused because someone else changed the article first (optimistic versioning at work)
+- whether every watcher ended up with exactly the server's collection, in the same order
+
+--check runs two of the app's RemoteArticleManagers against the server instead. It checks that articles added,
+moved, reordered and deleted through one show up the same way in the other, and that an edit made from an
+outdated copy is refused with 409. It exits with 1 if a check fails.
+
+Usage: python benchmarks/bench_collection_sync.py [--check] [--writers 4] [--watchers 4] [--articles 50]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the test articles out of the app's real sent registry
+os.environ.setdefault("NEWS_SENT_REGISTRY_FILE", os.path.join(tempfile.mkdtemp(prefix="collection-sync-"),
+                                                              "sent_registry.json"))
+os.environ.setdefault("NEWS_METRICS", "0")
+
+from app.services.collection_client import CollectionClient, CollectionConflict
+
+
+class Watcher:
+    """A client that follows the collection through change requests, like RemoteArticleManager."""
+    def __init__(self, base):
+        self.client = CollectionClient(base)
+        self.ids = []
+        self.arrivals = {} # Article id -> perf_counter when this watcher got it
+        self.version = 0
+        self.server_id = None
+        self.stopping = threading.Event()
+
+    def run(self):
+        while not self.stopping.is_set():
+            response = self.client.changes(self.version, self.server_id, wait=1)
+            now = time.perf_counter()
+            self.version, self.server_id = response["version"], response["server"]
+            if "reset" in response:
+                self.ids = [article["id"] for article in response["reset"]]
+                continue
+            for change in response["changes"]:
+                if change["kind"] == "added":
+                    self.ids.append(change["article"]["id"])
+                    self.arrivals[change["article"]["id"]] = now
+                elif change["kind"] == "removed":
+                    self.ids.remove(change["id"])
+                elif change["kind"] == "moved":
+                    self.ids.insert(change["to"], self.ids.pop(self.ids.index(change["id"])))
+                elif change["kind"] == "reset":
+                    self.ids = [article["id"] for article in change["articles"]]
+
+
+def run_writer(base, writer, count, sent_at, counts, lock):
+    """Adds count articles, then edits one article from the collection after each add."""
+    client = CollectionClient(base)
+    rng = random.Random(writer)
+    for i in range(count):
+        article = {
+            "id": f"w{writer}-{i}",
+            "title": f"Writer {writer} Article {i} On Export Controls",
+            "content": "<p>The Commerce Department tightened export controls on Tuesday.</p>" * 20,
+            "source": "POLITICO",
+            "url": f"https://www.politico.com/news/2025/08/05/writer-{writer}-article-{i}",
+            "keyword": "\"export control\"",
+        }
+        sent_at[article["id"]] = time.perf_counter()
+        client.add([article])
+
+        # Edit some article with the rev it had when listed; another writer may get there first
+        listed = client.articles()["articles"]
+        target = rng.choice(listed)
+        try:
+            client.edit(dict(target, lead=f"Edited by writer {writer}"), target["rev"])
+            outcome = "edits"
+        except CollectionConflict:
+            outcome = "conflicts"
+        with lock:
+            counts[outcome] += 1
+
+
+def start_server():
+    """
+    Starts a collection server on a free localhost port, keeping its collection in a temporary directory.
+    @return tuple: (server, its base URL)
+    """
+    from app.models.article_manager import ArticleManager
+    from app.models.content_store import ContentStore
+    from app.services.collection_server import SharedCollection, make_server
+
+    data_dir = tempfile.mkdtemp(prefix="collection-sync-")
+    manager = ArticleManager(os.path.join(data_dir, "articles.csv"), ContentStore(os.path.join(data_dir, "content")))
+    server = make_server(SharedCollection(manager), port=0)
+    threading.Thread(target=server.serve_forever, name="collection-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def check():
+    """
+    Two RemoteArticleManagers on one server: changes made through the first must reach the second through its
+    watcher thread, as in the app, and an edit from a copy that missed a change must be refused.
+    @return bool: True if every check passed.
+    """
+    from PySide6.QtCore import QCoreApplication
+    from app.models.article import Article
+    from app.models.content_store import ContentStore
+    from app.models.remote_article_manager import RemoteArticleManager
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+    server, base = start_server()
+
+    def open_manager():
+        # Its own local copy, as each user of the app has
+        data_dir = tempfile.mkdtemp(prefix="collection-sync-")
+        return RemoteArticleManager(base, os.path.join(data_dir, "articles.csv"),
+                                    ContentStore(os.path.join(data_dir, "content")), tagger=lambda content: {})
+
+    def ids(manager):
+        return [article.id for article in manager.get_all_articles()]
+
+    def server_ids():
+        return [article["id"] for article in CollectionClient(base).articles()["articles"]]
+
+    def delivered(condition, timeout_s=5):
+        # The watcher hands changes to the main thread, which applies them while processing events
+        deadline = time.perf_counter() + timeout_s
+        while not condition() and time.perf_counter() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        return condition()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        first, second = open_manager(), open_manager()
+    results = []
+
+    def expect(name, passed):
+        results.append(passed)
+        print(f"{'ok  ' if passed else 'FAIL'}  {name}")
+
+    def finish():
+        first.stop()
+        second.stop()
+        server.shutdown()
+        server.server_close()
+        failures = results.count(False)
+        print(f"{failures} failure(s)")
+        return failures == 0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        added = [first.add_article(Article(title=f"Check Article {i} On Export Controls",
+                                           content=f"<p>Paragraph {i} about export controls.</p>",
+                                           source="POLITICO", url=f"https://www.politico.com/news/check-{i}"))
+                 for i in range(3)]
+    expect("add", all(added) and len(server_ids()) == 3
+           and delivered(lambda: ids(second) == ids(first) == server_ids())
+           and all(second.get_content(article) == first.get_content(article) for article in first.get_all_articles()))
+
+    if not results[-1]:
+        # The other checks need the articles in both managers
+        return finish()
+
+    order = ids(first)
+    with contextlib.redirect_stdout(io.StringIO()):
+        moved = first.move_article(0, 2)
+    order = order[1:] + order[:1]
+    expect("move", moved and server_ids() == order and delivered(lambda: ids(second) == ids(first) == order))
+
+    # The second manager applies changes only while events are processed, so it still has the article's old rev
+    # when it sends its own edit
+    article = second.get_all_articles()[0]
+    with contextlib.redirect_stdout(io.StringIO()):
+        first_edit = first.edit_article(Article(**dict(first.get_single_article(article.id).to_dict(),
+                                                       content="<p>First edit.</p>", lead="First edit")))
+        stale_rev = second._revisions[article.id]
+        second_edit = second.edit_article(Article(**dict(article.to_dict(), content="<p>Second edit.</p>",
+                                                         lead="Second edit")))
+    try:
+        CollectionClient(base).edit(dict(article.to_dict(), content="<p>Second edit.</p>"), stale_rev)
+        refused = False
+    except CollectionConflict:
+        refused = True
+    expect("stale edit refused with 409", first_edit and not second_edit and refused
+           and second.get_single_article(article.id).lead == "First edit")
+
+    # Titles aren't unique: an edit can give an article another's title, and a reorder must keep both
+    order = ids(first)
+    twin, other = first.get_single_article(order[0]), first.get_single_article(order[1])
+    with contextlib.redirect_stdout(io.StringIO()):
+        renamed = first.edit_article(Article(**dict(other.to_dict(), content=first.get_content(other),
+                                                    title=twin.title)))
+        first.reorder_articles([article.title for article in reversed(first.get_all_articles())])
+    expect("reorder with a duplicate title", renamed and sorted(server_ids()) == sorted(order)
+           and server_ids() != order and delivered(lambda: ids(second) == ids(first) == server_ids()))
+
+    order = ids(first)
+    with contextlib.redirect_stdout(io.StringIO()):
+        deleted = first.delete_article(first.get_all_articles()[-1])
+    order = order[:-1]
+    expect("delete", deleted and server_ids() == order and delivered(lambda: ids(second) == ids(first) == order))
+
+    return finish()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--writers", type=int, default=4, help="clients adding and editing at once")
+    arg_parser.add_argument("--watchers", type=int, default=4, help="clients following the changes")
+    arg_parser.add_argument("--articles", type=int, default=50, help="articles added per writer")
+    arg_parser.add_argument("--verbose", action="store_true", help="show the server's own output")
+    arg_parser.add_argument("--check", action="store_true",
+                            help="check that two RemoteArticleManagers stay in step instead of benchmarking")
+    args = arg_parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check() else 1)
+
+    from app.metrics import percentile
+    server, base = start_server()
+
+    watchers = [Watcher(base) for _ in range(args.watchers)]
+    watcher_threads = [threading.Thread(target=watcher.run, daemon=True) for watcher in watchers]
+    for thread in watcher_threads:
+        thread.start()
+
+    print(f"{args.writers} writers adding {args.articles} articles each, {args.watchers} watchers...")
+    sent_at, counts, lock = {}, {"edits": 0, "conflicts": 0}, threading.Lock()
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output:
+        writers = [threading.Thread(target=run_writer, args=(base, writer, args.articles, sent_at, counts, lock))
+                   for writer in range(args.writers)]
+        for thread in writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+    elapsed_s = time.perf_counter() - start
+
+    # Let the watchers catch up with the last changes, then compare with the server
+    final = CollectionClient(base).articles()
+    deadline = time.perf_counter() + 5
+    while time.perf_counter() < deadline and any(watcher.version < final["version"] for watcher in watchers):
+        time.sleep(0.05)
+    for watcher in watchers:
+        watcher.stopping.set()
+
+    server_ids = [article["id"] for article in final["articles"]]
+    delays = [(watcher.arrivals[article_id] - sent_at[article_id]) * 1000
+              for watcher in watchers for article_id in server_ids if article_id in watcher.arrivals]
+    print(f"\nCompleted in {elapsed_s:.1f} s: {len(server_ids)} articles, version {final['version']}")
+    print(f"  propagation  p50 {percentile(delays, 50):7.1f} ms   p95 {percentile(delays, 95):7.1f} ms   "
+          f"max {max(delays):7.1f} ms   ({len(delays)} deliveries)")
+    print(f"  edits        {counts['edits']} applied, {counts['conflicts']} refused as stale")
+    converged = sum(watcher.ids == server_ids for watcher in watchers)
+    print(f"  watchers     {converged} of {len(watchers)} hold the server's collection in the server's order")
+
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Measures what batched search (several keywords per OR query) costs in recall, against per-keyword search.
+
+Runs over fixtures/search_corpus/corpus.json, a simulated search engine: every item carries its rank for each
+keyword whose query returns it. A query for several keywords returns their items merged by best rank,
+10 per page, as the shared result slots of a real OR query would. Both modes go through the app's own
+build_query_batches and extract_results, and the report compares them:
+
+- calls: API calls made (what the quota is spent on)
+- recall: share of the per-keyword mode's result URLs that the mode also found
+- attribution: share of results credited to a keyword whose own query returns the item
+- agreement: share of results credited to the same keyword as in per-keyword mode
+
+The first batched row uses the app's settings (CSE_BATCH_SIZE, CSE_BATCH_PAGES); the rest try others.
+
+Usage: python benchmarks/bench_query_batching.py [--pages 1 2 3] [--batch-size 2 4 8]
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+os.environ.setdefault("NEWS_METRICS", "0")
+
+from app.config import CSE_BATCH_SIZE, CSE_BATCH_PAGES
+from app.services.google_searcher import extract_results
+from app.utils import build_query_batches
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "search_corpus", "corpus.json")
+PAGE_SIZE = 10
+
+
+class SimulatedEngine:
+    """Answers queries from the corpus and counts the calls."""
+    def __init__(self, items):
+        self.items = items
+        self.calls = 0
+
+    def search(self, keywords, page):
+        self.calls += 1
+        matches = [item for item in self.items if any(keyword in item["ranks"] for keyword in keywords)]
+        matches.sort(key=lambda item: (min(item["ranks"][k] for k in keywords if k in item["ranks"]), item["link"]))
+        return {"items": matches[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]}
+
+
+def run_per_keyword(engine, keywords):
+    results, seen_urls = [], set()
+    for keyword in keywords:
+        results.extend(extract_results(engine.search([keyword], 0), keyword, seen_urls))
+    return results
+
+
+def run_batched(engine, keywords, pages=CSE_BATCH_PAGES, batch_size=CSE_BATCH_SIZE):
+    # Same paging rule as search_articles: extra pages only for batched queries, stopping at a short page
+    results, seen_urls = [], set()
+    for group in build_query_batches(keywords, max_keywords=batch_size):
+        for page in range(pages if len(group) > 1 else 1):
+            response = engine.search(group, page)
+            results.extend(extract_results(response, group if len(group) > 1 else group[0], seen_urls))
+            if len(response["items"]) < PAGE_SIZE:
+                break
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 3], help="pages per batched query to try")
+    arg_parser.add_argument("--batch-size", type=int, nargs="+", default=[2, 4, 8], help="keywords per query to try")
+    args = arg_parser.parse_args()
+
+    with open(CORPUS_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    keywords, items = corpus["keywords"], corpus["items"]
+    ranks_by_url = {item["link"]: item["ranks"] for item in items}
+
+    engine = SimulatedEngine(items)
+    baseline = run_per_keyword(engine, keywords)
+    baseline_keyword = {result["url"]: result["keyword"] for result in baseline}
+
+    print(f"{len(keywords)} keywords, {len(items)} corpus items\n")
+    print(f"{'mode':<24} {'calls':>6} {'results':>8} {'recall':>8} {'attribution':>12} {'agreement':>10}")
+
+    def report(label, results, calls):
+        found = {result["url"] for result in results}
+        recall = len(found & set(baseline_keyword)) / len(baseline_keyword)
+        attributed = sum(result["keyword"] in ranks_by_url[result["url"]] for result in results) / len(results)
+        compared = [result for result in results if result["url"] in baseline_keyword]
+        agreement = sum(result["keyword"] == baseline_keyword[result["url"]] for result in compared) / len(compared)
+        print(f"{label:<24} {calls:6d} {len(results):8d} {recall:8.1%} {attributed:12.1%} {agreement:10.1%}")
+
+    report("per keyword", baseline, engine.calls)
+    engine = SimulatedEngine(items)
+    results = run_batched(engine, keywords)
+    report(f"app: x{CSE_BATCH_SIZE}, {CSE_BATCH_PAGES} page(s)", results, engine.calls)
+    for batch_size in args.batch_size:
+        for pages in args.pages:
+            if (batch_size, pages) == (CSE_BATCH_SIZE, CSE_BATCH_PAGES):
+                continue
+            engine = SimulatedEngine(items)
+            results = run_batched(engine, keywords, pages, batch_size)
+            report(f"batched x{batch_size}, {pages} page(s)", results, engine.calls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Sanitizer benchmark and golden-file check for utils.clean_and_format_html.
+
+- Default: times the sanitizer on generated QTextEdit pastes from 64 KB to 1 MB and prints the time per KB,
+  which stays flat when the sanitizer scales linearly. If bs4 is installed, the earlier BeautifulSoup
+  implementation is timed alongside it for comparison.
+- --check: runs every input in fixtures/sanitizer/ and compares the result with its .expected.html file.
+- --regenerate: rewrites the .expected.html files with the earlier BeautifulSoup implementation (needs bs4),
+  which is the reference the streaming sanitizer must match.
+
+Usage: python benchmarks/bench_sanitizer.py [--check | --regenerate] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("NEWS_METRICS", "0")
+
+from app.utils import clean_and_format_html
+from record_fixtures import make_qtextedit_paste
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sanitizer")
+SIZES_KB = [64, 128, 256, 512, 1024]
+
+
+def reference_clean_and_format_html(dirty_html):
+    """The BeautifulSoup implementation that clean_and_format_html replaced, kept as the reference output."""
+    if not isinstance(dirty_html, str) or not dirty_html.strip():
+        return ""
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(dirty_html, 'html.parser')
+
+    # Completely remove unwanted tags whose content is also unwanted
+    tags_to_discard = [
+        'script', 'style', 'head', 'meta', 'link', 'svg', 'canvas', 'math', 'table',
+        'form', 'input', 'textarea', 'select', 'option', 'button', 'iframe'
+    ]
+    for tag in soup.find_all(tags_to_discard):
+        tag.decompose()
+
+    allowed_tags = {'b', 'strong', 'i', 'em', 'a', 'p', 'br'}
+    allowed_attributes = {'a': ['href']}
+
+    for tag in soup.find_all(True):
+        if tag.name not in allowed_tags:
+            tag.unwrap()
+        else:
+            attrs = dict(tag.attrs)
+            for attr_name, _ in attrs.items():
+                if tag.name in allowed_attributes and attr_name in allowed_attributes[tag.name]:
+                    continue
+                del tag[attr_name]
+
+    if soup.body:
+        body_content = ''.join(str(c) for c in soup.body.contents)
+    else:
+        body_content = str(soup)
+
+    cleaned_html = re.sub(r'<p.*?>', '', body_content, flags=re.IGNORECASE)
+    cleaned_html = re.sub(r'</p>', '<br><br>', cleaned_html, flags=re.IGNORECASE)
+    cleaned_html = re.sub(r'^(<br\s*/?>\s*)+|(<br\s*/?>\s*)+$', '', cleaned_html)
+    return cleaned_html.strip()
+
+
+def golden_inputs():
+    for name in sorted(os.listdir(GOLDEN_DIR)):
+        if name.endswith(".html") and not name.endswith(".expected.html"):
+            yield name, os.path.join(GOLDEN_DIR, name), os.path.join(GOLDEN_DIR, name[:-len(".html")] + ".expected.html")
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def check():
+    failures = 0
+    for name, input_path, expected_path in golden_inputs():
+        if read(expected_path) == clean_and_format_html(read(input_path)):
+            print(f"ok    {name}")
+        else:
+            failures += 1
+            print(f"FAIL  {name}")
+    print(f"{failures} failure(s)")
+    return failures == 0
+
+
+def regenerate():
+    for name, input_path, expected_path in golden_inputs():
+        with open(expected_path, "w", encoding="utf-8", newline="") as f:
+            f.write(reference_clean_and_format_html(read(input_path)))
+        print(f"Wrote {os.path.relpath(expected_path)}")
+
+
+def make_input(size_kb):
+    """A QTextEdit paste of roughly the given size."""
+    html = make_qtextedit_paste(random.Random(size_kb), paragraphs=max(1, size_kb * 1024 // 750))
+    return html
+
+
+def best_time(func, html, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def bench(repeat):
+    implementations = [("streaming", clean_and_format_html)]
+    try:
+        import bs4 # noqa: F401
+        implementations.append(("bs4 reference", reference_clean_and_format_html))
+    except ImportError:
+        print("bs4 not installed; timing the streaming sanitizer only")
+
+    for label, func in implementations:
+        print(f"\n{label}:")
+        for size_kb in SIZES_KB:
+            html = make_input(size_kb)
+            seconds = best_time(func, html, repeat)
+            actual_kb = len(html.encode("utf-8")) / 1024
+            print(f"  {actual_kb:8.0f} KB  {seconds * 1000:9.1f} ms  {seconds * 1e6 / actual_kb:7.1f} us/KB")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = arg_parser.add_mutually_exclusive_group()
+    mode.add_argument("--check", action="store_true", help="compare with the golden files")
+    mode.add_argument("--regenerate", action="store_true", help="rewrite the golden files with the bs4 reference")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="timed runs per size (best is reported)")
+    args = arg_parser.parse_args()
+
+    if args.check:
+        sys.exit(0 if check() else 1)
+    elif args.regenerate:
+        regenerate()
+    else:
+        bench(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
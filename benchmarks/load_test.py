@@ -0,0 +1,171 @@
+"""
+End-to-end load test: runs full search-and-scrape sessions against the local replay server.
+
+A session does what a user does in the app: search every keyword in keywords.json, then scrape each
+result one after another. Many sessions run at once from a thread pool, using the real service code
+(search_articles and scrape_url) pointed at the replay server. The report gives throughput and
+p50/p95/p99 latency for searches, scrapes and whole sessions, plus a count of scrape failures by cause.
+
+With --scheduled, sessions hand their scrapes to one shared ScrapeScheduler instead, as "Add Selected"
+does in the app, so the per-site limits and Retry-After handling are exercised under load.
+
+By default the replay server is started in-process with the latency and fault options given here.
+Pass --server http://host:port to use one that is already running.
+
+Usage: python benchmarks/load_test.py [--sessions 50] [--concurrency 8] [--scheduled] [--latency-ms 80] [--rate-429 0.02] ...
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay_server import make_server, base_url, environment_for, add_profile_arguments, profile_from_args
+
+
+class LoadStats:
+    """Latencies and failures collected from all sessions."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.search_ms = []
+        self.scrape_ms = []
+        self.session_ms = []
+        self.failures = {}
+
+    def add(self, kind, duration_ms):
+        with self.lock:
+            getattr(self, f"{kind}_ms").append(duration_ms)
+
+    def fail(self, reason):
+        with self.lock:
+            self.failures[reason] = self.failures.get(reason, 0) + 1
+
+
+def failure_reason(error):
+    """Short label for a scrape failure, based on the messages scrape_url raises."""
+    message = str(error).lower()
+    for code in ("401", "403", "404", "429"):
+        if code in message:
+            return code
+    if "paywalled" in message:
+        return "401"
+    if "does not allow" in message:
+        return "403"
+    if "timed out" in message or "timeout" in message:
+        return "timeout"
+    return type(error).__name__
+
+
+def run_session(keywords, stats, scheduler=None):
+    """One search-and-scrape session. Scrapes go through scheduler when one is given."""
+    from app.services.google_searcher import search_articles
+    from app.services.web_scraper import scrape_url
+
+    session_start = time.perf_counter()
+
+    start = time.perf_counter()
+    results = search_articles("replay-key", "replay-cse", keywords, days_back=1)
+    stats.add("search", (time.perf_counter() - start) * 1000)
+
+    if scheduler is not None:
+        # Scrape time here includes the wait in the scheduler's queue
+        start = time.perf_counter()
+        futures = [scheduler.submit(result["url"]) for result in results]
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                stats.fail(failure_reason(e))
+            stats.add("scrape", (time.perf_counter() - start) * 1000)
+    else:
+        for result in results:
+            start = time.perf_counter()
+            try:
+                scrape_url(result["url"])
+            except Exception as e:
+                stats.fail(failure_reason(e))
+            stats.add("scrape", (time.perf_counter() - start) * 1000)
+
+    stats.add("session", (time.perf_counter() - session_start) * 1000)
+
+
+def report(stats, elapsed_s, server_stats):
+    from app.metrics import percentile
+
+    print(f"\nCompleted in {elapsed_s:.1f} s")
+    for kind in ("session", "search", "scrape"):
+        durations = getattr(stats, f"{kind}_ms")
+        if not durations:
+            continue
+        print(f"  {kind:<8} {len(durations):6d} done  {len(durations) / elapsed_s:8.1f}/s   "
+              f"p50 {percentile(durations, 50):8.1f} ms   p95 {percentile(durations, 95):8.1f} ms   "
+              f"p99 {percentile(durations, 99):8.1f} ms   max {max(durations):8.1f} ms")
+    if stats.failures:
+        print(f"  scrape failures: {dict(sorted(stats.failures.items()))}")
+    if server_stats is not None:
+        print(f"  server responses: {dict(sorted(server_stats.items()))}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--sessions", type=int, default=50, help="number of search-and-scrape sessions")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="sessions running at once")
+    arg_parser.add_argument("--server", help="base URL of an already running replay server")
+    arg_parser.add_argument("--scheduled", action="store_true", help="scrape through a shared ScrapeScheduler")
+    arg_parser.add_argument("--verbose", action="store_true", help="show the services' own output")
+    add_profile_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    server = None
+    if args.server:
+        environment = environment_for(args.server)
+    else:
+        server = make_server(port=0, profile=profile_from_args(args))
+        threading.Thread(target=server.serve_forever, name="replay-server", daemon=True).start()
+        environment = environment_for(base_url(server))
+
+    # The endpoints are read from the environment when app.config is imported, so set them first
+    os.environ.update(environment)
+    os.environ.setdefault("NEWS_METRICS", "0")
+    # Keep the simulated 401/403s out of the app's real per-site failure memory
+    os.environ.setdefault("NEWS_DOMAIN_HEALTH_FILE", os.path.join(tempfile.mkdtemp(prefix="load-test-"), "domain_health.json"))
+
+    with open(os.path.join(ROOT_DIR, "keywords.json"), "r", encoding="utf-8") as f:
+        keywords = json.load(f)["keywords"]
+
+    scheduler = None
+    if args.scheduled:
+        from app.services.scrape_scheduler import ScrapeScheduler
+        scheduler = ScrapeScheduler()
+
+    print(f"Running {args.sessions} sessions ({len(keywords)} keywords each), {args.concurrency} at a time...")
+    stats = LoadStats()
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    start = time.perf_counter()
+    with output, ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(run_session, keywords, stats, scheduler) for _ in range(args.sessions)]
+        for future in futures:
+            future.result()
+    elapsed_s = time.perf_counter() - start
+
+    if scheduler is not None:
+        print(f"  scheduler requests per site: {scheduler.stats()['requests_per_host']}")
+        scheduler.shutdown()
+
+    report(stats, elapsed_s, server.stats if server else None)
+    if server:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+Writes the fixtures used by run_benchmarks.py into benchmarks/fixtures/.
+
+By default the fixtures are synthetic stand-ins, generated deterministically so the files in the repo
+can be rebuilt byte-for-byte. With --live, the congress pages are fetched from senate.gov and
+majorityleader.gov and any --article OUTLET=URL pages are fetched and saved over the stand-ins, so the
+suite can be run against real markup. Live pages are only as stable as the sites, so commit them
+deliberately: benchmark numbers are only comparable across runs that used the same fixtures.
+
+Usage: python benchmarks/record_fixtures.py [--live] [--article politico=https://...]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Date the congress fixtures describe; the benchmarks pass it as "now" so the parsers take the "in session" path
+CONGRESS_DATE = "2025-08-06"
+
+KEYWORDS = ["\"export control\"", "\"semiconductor export\"", "\"Bureau of Industry and Security\""]
+
+# One article URL per SOURCE_MAP outlet
+ARTICLE_URLS = {
+    "apnews": "https://apnews.com/article/chips-export-controls-commerce-2f1c0d9a",
+    "nytimes": "https://www.nytimes.com/2025/08/05/us/politics/chip-export-controls.html",
+    "wsj": "https://www.wsj.com/politics/policy/chip-export-rules-tighten-2025-8c3b1e2f",
+    "politico": "https://www.politico.com/news/2025/08/05/export-controls-semiconductors-00123456",
+    "ft": "https://www.ft.com/content/5d8b1c2e-export-controls-chips",
+    "cnbc": "https://www.cnbc.com/2025/08/05/commerce-department-export-controls-chips.html",
+    "scmp": "https://www.scmp.com/tech/article/3321234/us-export-controls-chips",
+    "foxnews": "https://www.foxnews.com/politics/commerce-export-controls-chips-china",
+    "washingtonpost": "https://www.washingtonpost.com/technology/2025/08/05/export-controls-chips/",
+    "cnn": "https://www.cnn.com/2025/08/05/tech/export-controls-chips/index.html",
+    "bloomberglaw": "https://news.bloomberglaw.com/international-trade/export-controls-chips-2025",
+}
+
+# Keywords for the simulated search corpus: quoted phrases, and keywords of several terms like in keywords.json
+CORPUS_KEYWORDS = [
+    "\"Bureau of Industry and Security\"", "\"export control\"", "\"Jeffrey Kessler\" commerce department",
+    "\"semiconductor export\"", "\"Section 232\" commerce department", "chip location tracking", "chip war",
+    "\"Entity List\"", "\"chip smuggling\"", "\"CHIPS Act\"", "\"rare earth\"", "\"Howard Lutnick\" commerce department",
+]
+
+SENTENCES = [
+    "The Commerce Department tightened export controls on advanced semiconductors on Tuesday.",
+    "Officials said the rules close loopholes that let restricted buyers obtain chips through third countries.",
+    "The Bureau of Industry and Security added several dozen companies to the Entity List.",
+    "Industry groups warned that the measures could cost American suppliers billions in lost sales.",
+    "Lawmakers from both parties have pressed the administration to move faster on enforcement.",
+    "A spokesperson for the embassy called the decision an abuse of export control measures.",
+    "Analysts expect allies in Europe and Asia to face pressure to adopt matching restrictions.",
+    "The new licensing requirements take effect in thirty days, according to the filing.",
+]
+
+
+def _paragraphs(rng, count):
+    return [" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 6))) for _ in range(count)]
+
+
+def make_cse_response(rng, keyword, index):
+    """A Custom Search API response with a mix of articles, non-articles and duplicates."""
+    items = []
+    for n in range(10):
+        outlet, url = list(ARTICLE_URLS.items())[(index * 10 + n) % len(ARTICLE_URLS)]
+        if n == 3:
+            url = f"https://www.{outlet}.com/video/export-controls-explained"
+        elif n == 6:
+            url = f"https://www.{outlet}.com/author/jane-reporter"
+        elif n == 8:
+            url = url + "?utm_source=newsletter" # Duplicate of an earlier item once normalized
+        items.append({
+            "kind": "customsearch#result",
+            "title": f"{rng.choice(SENTENCES)[:60]} | {outlet}",
+            "htmlTitle": f"<b>{keyword}</b> {outlet}",
+            "link": url,
+            "displayLink": url.split("/")[2],
+            "snippet": rng.choice(SENTENCES),
+        })
+    return {
+        "kind": "customsearch#search",
+        "queries": {"request": [{"searchTerms": keyword, "count": 10, "startIndex": 1}]},
+        "searchInformation": {"totalResults": "1240"},
+        "items": items,
+    }
+
+
+def make_article_html(rng, outlet, url):
+    """A news article page with the meta tags and markup newspaper3k looks for, plus page chrome."""
+    title = f"U.S. Tightens Export Controls on Advanced Chips ({outlet})"
+    body = "\n".join(f"      <p>{p}</p>" for p in _paragraphs(rng, 14))
+    nav = "\n".join(f'      <li><a href="/section/{n}">Section {n}</a></li>' for n in range(40))
+    related = "\n".join(f'      <li><a href="/2025/08/0{n % 9 + 1}/related-{n}">Related story {n}</a></li>' for n in range(20))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8">
+  <title>{title}</title>
+  <meta property="og:title" content="{title}">
+  <meta property="og:url" content="{url}">
+  <meta name="author" content="Jane Reporter, John Correspondent">
+  <meta property="article:published_time" content="2025-08-05T14:30:00Z">
+  <script>window.dataLayer = window.dataLayer || []; {"var x = 1;" * 200}</script>
+  <style>{".nav li {{ display: inline; }} " * 100}</style>
+</head>
+<body>
+  <header><nav><ul>
+{nav}
+  </ul></nav></header>
+  <main>
+    <article>
+      <h1>{title}</h1>
+      <div class="byline">By Jane Reporter and John Correspondent Updated On Aug. 5, 2025</div>
+{body}
+    </article>
+    <aside><ul>
+{related}
+    </ul></aside>
+  </main>
+  <footer><p>Copyright 2025 {outlet}. All rights reserved.</p></footer>
+</body>
+</html>
+"""
+
+
+def make_senate_html(rng):
+    """The senate.gov home page: proceedings schedule among a lot of unrelated markup."""
+    filler = "\n".join(f'  <div class="card"><a href="/news/{n}">{rng.choice(SENTENCES)}</a></div>' for n in range(150))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>U.S. Senate</title></head>
+<body>
+{filler}
+  <article id="proceedings_schedule">
+    <h3>Wednesday, Aug 6, 2025</h3>
+    <p>Schedule: <span class="floor-schedule">Convene at 10:00 a.m.</span></p>
+  </article>
+{filler}
+</body>
+</html>
+"""
+
+
+def make_majorityleader_html(rng):
+    """The House Majority Leader schedule page."""
+    filler = "\n".join(f'  <div class="item"><a href="/news/{n}">{rng.choice(SENTENCES)}</a></div>' for n in range(150))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Schedule | Majority Leader</title></head>
+<body>
+{filler}
+  <span id="ctl00_ctl23_ctl00_Text">
+    <p>WEDNESDAY, AUGUST 6TH</p>
+    <p>On Wednesday, the House will meet at 10:00 a.m. for morning hour and 12:00 p.m. for legislative business.</p>
+    <p>First votes expected: 1:30 p.m. Last votes expected: 3:00 p.m.</p>
+    <p>Legislation Considered Pursuant to a Rule:</p>
+    <p>H.R. 1234 - Export Control Reform Act (Sponsored by Rep. Smith / Foreign Affairs Committee)</p>
+  </span>
+{filler}
+</body>
+</html>
+"""
+
+
+def make_qtextedit_paste(rng, paragraphs=400):
+    """HTML in the shape QTextEdit.toHtml() produces after a large paste from a browser."""
+    style = "margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0; text-indent:0px;"
+    blocks = []
+    for n, paragraph in enumerate(_paragraphs(rng, paragraphs)):
+        if n % 25 == 0:
+            blocks.append(f'<p style="{style}"><span style=" font-family:\'Georgia\'; font-size:16pt; font-weight:700;">Section {n // 25 + 1}</span></p>')
+        if n % 7 == 0:
+            blocks.append(f'<p style="-qt-paragraph-type:empty; {style}"><br /></p>')
+        blocks.append(f'<p style="{style}"><span style=" font-family:\'Georgia\'; font-size:12pt; color:#1a1a1a;">{paragraph} '
+                      f'<a href="https://example.com/{n}"><span style=" text-decoration: underline; color:#0000ff;">link</span></a></span></p>')
+    body = "\n".join(blocks)
+    return f"""<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">
+<html><head><meta name="qrichtext" content="1" /><meta charset="utf-8" /><style type="text/css">
+p, li {{ white-space: pre-wrap; }}
+hr {{ height: 1px; border-width: 0; }}
+</style></head><body style=" font-family:'Segoe UI'; font-size:9pt; font-weight:400; font-style:normal;">
+{body}
+</body></html>
+"""
+
+
+def make_search_corpus(rng, results_per_keyword=15):
+    """
+    Ranked results for each of CORPUS_KEYWORDS, as a search engine would return them, for bench_query_batching.py.
+
+    Like real results, the keyword shows up in the title of most items, in only the snippet or URL of some,
+    and nowhere visible in others (the engine matched the article body). Some items rank for two keywords.
+    """
+    outlets = list(ARTICLE_URLS)
+    items = []
+    for keyword in CORPUS_KEYWORDS:
+        text = keyword.replace('"', "")
+        slug_words = text.lower().split()
+        for rank in range(1, results_per_keyword + 1):
+            outlet = rng.choice(outlets)
+            n = len(items)
+            # Plurals, which the engine matches too ("export controls")
+            mention = text + ("s" if rng.random() < 0.3 else "")
+            title, snippet = rng.choice(SENTENCES)[:70], rng.choice(SENTENCES)
+            slug = f"story-{n:04d}"
+
+            placement = rng.random()
+            if placement < 0.55:
+                title = f"{mention.title()}: {title}"
+            elif placement < 0.75:
+                snippet = f"{snippet} The {mention} rules were cited."
+            elif placement < 0.85:
+                slug = "-".join(slug_words) + f"-{n:04d}"
+            # Otherwise the keyword is nowhere in the title, snippet or URL
+
+            ranks = {keyword: rank}
+            if rng.random() < 0.1:
+                other = rng.choice([k for k in CORPUS_KEYWORDS if k != keyword])
+                ranks[other] = rng.randint(1, results_per_keyword)
+                snippet = f"{snippet} It also touched on {other.replace(chr(34), '')}."
+
+            items.append({
+                "title": title,
+                "link": f"https://www.{outlet}.com/2025/08/05/{slug}",
+                "displayLink": f"www.{outlet}.com",
+                "snippet": snippet,
+                "ranks": ranks,
+            })
+    return {"keywords": CORPUS_KEYWORDS, "items": items}
+
+
+def make_feed(rng, atom=False, entries=60):
+    """An RSS 2.0 or Atom section feed; some entries mention a keyword, like a politics or business feed."""
+    from email.utils import format_datetime
+    from datetime import datetime, timedelta, timezone
+    from xml.sax.saxutils import escape
+
+    newest = datetime(2025, 8, 6, 12, 0, tzinfo=timezone.utc)
+    outlet = "politico"
+    items = []
+    for n in range(entries):
+        title = rng.choice(SENTENCES)[:80]
+        if rng.random() < 0.25:
+            title = f"{rng.choice(CORPUS_KEYWORDS).replace(chr(34), '').title()}: {title}"
+        url = f"https://www.{outlet}.com/news/2025/08/{6 - n // 20:02d}/story-{n:04d}"
+        summary = escape(f"<p>{' '.join(rng.choice(SENTENCES) for _ in range(3))}</p>")
+        published = newest - timedelta(hours=n * 2)
+        if atom:
+            items.append(f"""  <entry>
+    <id>tag:{outlet}.com,2025:{n}</id>
+    <title>{escape(title)}</title>
+    <link rel="alternate" href="{url}"/>
+    <published>{published.isoformat()}</published>
+    <summary type="html">{summary}</summary>
+  </entry>""")
+        else:
+            items.append(f"""    <item>
+      <title>{escape(title)}</title>
+      <link>{url}</link>
+      <guid isPermaLink="true">{url}</guid>
+      <pubDate>{format_datetime(published)}</pubDate>
+      <description>{summary}</description>
+    </item>""")
+
+    body = "\n".join(items)
+    if atom:
+        return f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>{outlet} - Politics</title>
+  <id>tag:{outlet}.com,2025:politics</id>
+  <updated>{newest.isoformat()}</updated>
+{body}
+</feed>
+"""
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>{outlet} - Politics</title>
+    <link>https://www.{outlet}.com/politics</link>
+    <description>Politics news</description>
+{body}
+  </channel>
+</rss>
+"""
+
+
+def make_news_sitemap(rng, entries=500):
+    """A Google News sitemap of an outlet's last two days; some titles mention a keyword."""
+    from datetime import datetime, timedelta, timezone
+    from xml.sax.saxutils import escape
+
+    newest = datetime(2025, 8, 6, 12, 0, tzinfo=timezone.utc)
+    outlet = "politico"
+    urls = []
+    for n in range(entries):
+        title = rng.choice(SENTENCES)[:80]
+        if rng.random() < 0.1:
+            title = f"{rng.choice(CORPUS_KEYWORDS).replace(chr(34), '').title()}: {title}"
+        published = newest - timedelta(minutes=n * 5)
+        urls.append(f"""  <url>
+    <loc>https://www.{outlet}.com/news/2025/08/{published.day:02d}/story-{n:04d}</loc>
+    <news:news>
+      <news:publication>
+        <news:name>{outlet.title()}</news:name>
+        <news:language>en</news:language>
+      </news:publication>
+      <news:publication_date>{published.isoformat()}</news:publication_date>
+      <news:title>{escape(title)}</news:title>
+    </news:news>
+  </url>""")
+
+    body = "\n".join(urls)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">
+{body}
+</urlset>
+"""
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    print(f"Wrote {os.path.relpath(path)} ({len(text.encode('utf-8')) / 1024:.1f} KB)")
+
+
+def write_synthetic():
+    """Regenerates every synthetic fixture."""
+    rng = random.Random(2025)
+
+    for index, keyword in enumerate(KEYWORDS):
+        response = make_cse_response(rng, keyword, index)
+        _write(os.path.join(FIXTURES_DIR, "cse", f"response_{index}.json"), json.dumps(response, indent=2) + "\n")
+
+    for outlet, url in ARTICLE_URLS.items():
+        _write(os.path.join(FIXTURES_DIR, "articles", f"{outlet}.html"), make_article_html(rng, outlet, url))
+    _write(os.path.join(FIXTURES_DIR, "articles", "urls.json"), json.dumps(ARTICLE_URLS, indent=2) + "\n")
+
+    _write(os.path.join(FIXTURES_DIR, "congress", "senate.html"), make_senate_html(rng))
+    _write(os.path.join(FIXTURES_DIR, "congress", "majorityleader.html"), make_majorityleader_html(rng))
+    _write(os.path.join(FIXTURES_DIR, "congress", "date.txt"), CONGRESS_DATE + "\n")
+
+    _write(os.path.join(FIXTURES_DIR, "qtextedit", "paste_large.html"), make_qtextedit_paste(rng))
+
+    # Own generator, so adding it didn't change the fixtures above
+    corpus = make_search_corpus(random.Random(42))
+    _write(os.path.join(FIXTURES_DIR, "search_corpus", "corpus.json"), json.dumps(corpus, indent=1) + "\n")
+
+    feed_rng = random.Random(43)
+    _write(os.path.join(FIXTURES_DIR, "feeds", "rss.xml"), make_feed(feed_rng))
+    _write(os.path.join(FIXTURES_DIR, "feeds", "atom.xml"), make_feed(feed_rng, atom=True))
+
+    _write(os.path.join(FIXTURES_DIR, "sitemaps", "news.xml"), make_news_sitemap(random.Random(44)))
+
+
+def write_live(article_urls):
+    """Fetches real pages over the synthetic stand-ins."""
+    from datetime import date
+    import requests
+
+    pages = {
+        os.path.join("congress", "senate.html"): "https://www.senate.gov/",
+        os.path.join("congress", "majorityleader.html"): "https://www.majorityleader.gov/schedule/default.aspx",
+    }
+    for outlet, url in article_urls.items():
+        pages[os.path.join("articles", f"{outlet}.html")] = url
+
+    for relative_path, url in pages.items():
+        try:
+            response = requests.get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
+            response.raise_for_status()
+        except Exception as e:
+            print(f"Could not record {url}: {e}")
+            continue
+        _write(os.path.join(FIXTURES_DIR, relative_path), response.text)
+
+    # Recorded congress pages describe today
+    _write(os.path.join(FIXTURES_DIR, "congress", "date.txt"), date.today().isoformat() + "\n")
+
+    if article_urls:
+        urls_path = os.path.join(FIXTURES_DIR, "articles", "urls.json")
+        with open(urls_path, "r", encoding="utf-8") as f:
+            urls = json.load(f)
+        urls.update(article_urls)
+        _write(urls_path, json.dumps(urls, indent=2) + "\n")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--live", action="store_true", help="fetch real pages over the synthetic ones")
+    arg_parser.add_argument("--article", action="append", default=[], metavar="OUTLET=URL",
+                            help="article page to record with --live (repeatable)")
+    args = arg_parser.parse_args()
+
+    if args.live:
+        article_urls = dict(pair.split("=", 1) for pair in args.article)
+        write_live(article_urls)
+    else:
+        write_synthetic()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Local stand-in for the remote sites the app talks to, replaying the files in benchmarks/fixtures/.
+
+Every request path starts with the host it stands in for, so one server covers every site:
+
+    /www.googleapis.com/customsearch/v1?q=...    a recorded CSE response (chosen by query)
+    /www.senate.gov/                             congress/senate.html
+    /www.majorityleader.gov/schedule/...         congress/majorityleader.html
+    /<outlet host>/<path>                        the outlet's article page from articles/
+
+Point the app at it with the environment variables printed on startup. Responses can be slowed and broken
+on purpose: fixed latency plus jitter, a bandwidth cap, and error rates for 401, 403, 429 (with Retry-After)
+and timeouts (the connection is held open without a reply).
+
+Usage: python benchmarks/replay_server.py [--port 8765] [--latency-ms 80] [--jitter-ms 40]
+                                          [--bandwidth-kbps 512] [--rate-403 0.05] [--rate-timeout 0.01] ...
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@dataclass
+class ReplayProfile:
+    """How the replay server delays and fails responses."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    bandwidth_kbps: float = 0.0 # 0 means unlimited
+    rate_401: float = 0.0
+    rate_403: float = 0.0
+    rate_429: float = 0.0
+    rate_timeout: float = 0.0
+    timeout_hold_s: float = 20.0 # How long a "timed out" request is held before the connection is dropped
+    retry_after_s: int = 2
+    seed: int = None
+
+
+class FixtureSet:
+    """The recorded responses, loaded once and indexed by host."""
+    def __init__(self, directory=FIXTURES_DIR):
+        cse_dir = os.path.join(directory, "cse")
+        self.cse_responses = []
+        for name in sorted(os.listdir(cse_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(cse_dir, name), "rb") as f:
+                    self.cse_responses.append(f.read())
+
+        with open(os.path.join(directory, "articles", "urls.json"), "r", encoding="utf-8") as f:
+            urls = json.load(f)
+        self.articles_by_host = {}
+        for outlet, url in urls.items():
+            with open(os.path.join(directory, "articles", f"{outlet}.html"), "rb") as f:
+                self.articles_by_host[urlsplit(url).netloc.lower().removeprefix("www.")] = f.read()
+        self.articles = list(self.articles_by_host.values())
+
+        with open(os.path.join(directory, "congress", "senate.html"), "rb") as f:
+            self.senate = f.read()
+        with open(os.path.join(directory, "congress", "majorityleader.html"), "rb") as f:
+            self.majorityleader = f.read()
+
+    def lookup(self, host, path, query):
+        """Returns (content type, body) for a request, or None if nothing matches."""
+        host = host.lower().removeprefix("www.")
+        if host == "googleapis.com":
+            keyword = parse_qs(query).get("q", [""])[0]
+            return "application/json", self.cse_responses[_stable_index(keyword, len(self.cse_responses))]
+        if host == "senate.gov":
+            return "text/html; charset=utf-8", self.senate
+        if host == "majorityleader.gov":
+            return "text/html; charset=utf-8", self.majorityleader
+        if host in self.articles_by_host:
+            return "text/html; charset=utf-8", self.articles_by_host[host]
+        if "." in host:
+            # Any other site gets some article page, always the same one for the same path
+            return "text/html; charset=utf-8", self.articles[_stable_index(host + path, len(self.articles))]
+        return None
+
+
+def _stable_index(text, count):
+    """Maps text to an index that is the same on every run (unlike hash())."""
+    return int.from_bytes(hashlib.md5(text.encode("utf-8")).digest()[:4], "big") % count
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Set on the server: server.fixtures, server.profile, server.rng, server.rng_lock, server.stats
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        profile = self.server.profile
+        with self.server.rng_lock:
+            roll = self.server.rng.random()
+            delay_s = max(0.0, profile.latency_ms + self.server.rng.uniform(-profile.jitter_ms, profile.jitter_ms)) / 1000
+
+        # Path looks like /<host>/<rest>
+        parts = urlsplit(self.path)
+        host, _, rest = parts.path.lstrip("/").partition("/")
+        time.sleep(delay_s)
+
+        # Faults, decided by one roll against the cumulative rates
+        threshold = profile.rate_timeout
+        if roll < threshold:
+            self._count("timeout")
+            time.sleep(profile.timeout_hold_s)
+            self.close_connection = True
+            return
+        for status, rate in ((401, profile.rate_401), (403, profile.rate_403), (429, profile.rate_429)):
+            threshold += rate
+            if roll < threshold:
+                self._count(str(status))
+                headers = {"Retry-After": str(profile.retry_after_s)} if status == 429 else {}
+                self._send(status, "text/plain", f"Replay server: simulated {status}\n".encode(), headers)
+                return
+
+        match = self.server.fixtures.lookup(host, "/" + rest, parts.query)
+        if match is None:
+            self._count("404")
+            self._send(404, "text/plain", b"Replay server: no fixture for this path\n")
+            return
+        self._count("200")
+        content_type, body = match
+        self._send(200, content_type, body)
+
+    def _count(self, outcome):
+        with self.server.rng_lock:
+            self.server.stats[outcome] = self.server.stats.get(outcome, 0) + 1
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        bandwidth = self.server.profile.bandwidth_kbps
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+
+        # Trickle the body out in 4 KB chunks to honour the bandwidth cap
+        chunk_size = 4096
+        seconds_per_chunk = chunk_size / (bandwidth * 1024)
+        for start in range(0, len(body), chunk_size):
+            self.wfile.write(body[start:start + chunk_size])
+            time.sleep(seconds_per_chunk)
+
+
+def make_server(host="127.0.0.1", port=8765, profile=None, fixtures=None, verbose=False):
+    """
+    Creates a replay server. Call serve_forever() on it, usually from a daemon thread.
+    @param port (int): Port to listen on; 0 picks a free one (read it back from server.server_address).
+    @param profile (ReplayProfile): Latency and fault settings.
+    """
+    server = ThreadingHTTPServer((host, port), ReplayHandler)
+    server.daemon_threads = True
+    server.profile = profile or ReplayProfile()
+    server.fixtures = fixtures or FixtureSet()
+    server.rng = random.Random(server.profile.seed)
+    server.rng_lock = threading.Lock()
+    server.stats = {}
+    server.verbose = verbose
+    return server
+
+
+def base_url(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def environment_for(base):
+    """The environment variables that point the app's services at a replay server running at base."""
+    base = base.rstrip("/")
+    return {
+        "NEWS_CSE_ENDPOINT": f"{base}/www.googleapis.com/customsearch/v1",
+        "NEWS_HOUSE_SCHEDULE_URL": f"{base}/www.majorityleader.gov/schedule/default.aspx",
+        "NEWS_SENATE_URL": f"{base}/www.senate.gov/",
+        "NEWS_SCRAPE_BASE_URL": base,
+    }
+
+
+def add_profile_arguments(arg_parser):
+    """Adds the ReplayProfile options to an argument parser (shared with load_test.py)."""
+    arg_parser.add_argument("--latency-ms", type=float, default=0.0, help="base response delay")
+    arg_parser.add_argument("--jitter-ms", type=float, default=0.0, help="random +/- added to the delay")
+    arg_parser.add_argument("--bandwidth-kbps", type=float, default=0.0, help="per-response bandwidth cap in KB/s (0 = unlimited)")
+    arg_parser.add_argument("--rate-401", type=float, default=0.0, help="fraction of requests answered 401")
+    arg_parser.add_argument("--rate-403", type=float, default=0.0, help="fraction of requests answered 403")
+    arg_parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered 429 with Retry-After")
+    arg_parser.add_argument("--rate-timeout", type=float, default=0.0, help="fraction of requests never answered")
+    arg_parser.add_argument("--timeout-hold-s", type=float, default=20.0, help="how long an unanswered request is held")
+    arg_parser.add_argument("--seed", type=int, default=None, help="random seed for reproducible fault patterns")
+
+
+def profile_from_args(args):
+    return ReplayProfile(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, bandwidth_kbps=args.bandwidth_kbps,
+        rate_401=args.rate_401, rate_403=args.rate_403, rate_429=args.rate_429,
+        rate_timeout=args.rate_timeout, timeout_hold_s=args.timeout_hold_s, seed=args.seed,
+    )
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--verbose", action="store_true", help="log every request")
+    add_profile_arguments(arg_parser)
+    args = arg_parser.parse_args()
+
+    server = make_server(args.host, args.port, profile_from_args(args), verbose=args.verbose)
+    print("Replay server listening. Point the app at it with:")
+    for name, value in environment_for(base_url(server)).items():
+        print(f"  {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Responses: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
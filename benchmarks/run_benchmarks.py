@@ -0,0 +1,438 @@
+"""
+Offline micro-benchmarks for the parsing and rendering hot paths, run over the files in benchmarks/fixtures/.
+
+Each benchmark is timed with timeit over several repeats and the results are written to
+benchmarks/results/<label>.json (label defaults to the current git commit). The run is then compared with
+a previous results file, and any benchmark that got slower by more than the threshold is flagged, so
+regressions are visible between versions. A benchmark with a stated target (budget_s) is also flagged when its best
+time is over it.
+
+Benchmarks whose dependencies are not installed (newspaper3k, bs4, jinja2, ...) are reported as skipped.
+
+Usage: python benchmarks/run_benchmarks.py [--label NAME] [--compare NAME] [--filter TEXT]
+                                           [--repeat N] [--threshold 1.2] [--fail-on-regression]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import date, datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# Spans would add their own overhead and write metrics logs; benchmark the bare functions
+os.environ.setdefault("NEWS_METRICS", "0")
+
+BENCH_DIR = os.path.join(ROOT_DIR, "benchmarks")
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+# Registered benchmarks: name -> setup function returning the callable to time
+BENCHMARKS = {}
+BUDGETS = {} # Benchmark name -> the most seconds a call may take, for those with a stated target
+
+
+def benchmark(name, budget_s=None):
+    """
+    Registers a setup function. It is only called when the benchmark runs, so its imports can fail cleanly.
+    @param budget_s (float): Optional target; a best time above it is flagged like a regression.
+    """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        if budget_s is not None:
+            BUDGETS[name] = budget_s
+        return setup
+    return register
+
+
+def read_fixture(*parts):
+    with open(os.path.join(FIXTURES_DIR, *parts), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def load_cse_responses():
+    directory = os.path.join(FIXTURES_DIR, "cse")
+    return [json.loads(read_fixture("cse", name)) for name in sorted(os.listdir(directory)) if name.endswith(".json")]
+
+
+def load_article_pages():
+    urls = json.loads(read_fixture("articles", "urls.json"))
+    return [(url, read_fixture("articles", f"{outlet}.html")) for outlet, url in urls.items()]
+
+
+def congress_date():
+    return datetime.combine(date.fromisoformat(read_fixture("congress", "date.txt").strip()), datetime.min.time())
+
+
+# --- Benchmarks ---
+
+@benchmark("utils.is_article")
+def bench_is_article():
+    from app.utils import is_article
+    items = [(item["link"], item["title"]) for response in load_cse_responses() for item in response["items"]]
+
+    def run():
+        for url, title in items:
+            is_article(url, title)
+    return run
+
+
+@benchmark("utils.normalize_url")
+def bench_normalize_url():
+    from app.utils import normalize_url
+    urls = [item["link"] for response in load_cse_responses() for item in response["items"]]
+
+    def run():
+        for url in urls:
+            normalize_url(url)
+    return run
+
+
+@benchmark("google_searcher.extract_results")
+def bench_extract_results():
+    from app.services.google_searcher import extract_results
+    responses = load_cse_responses()
+
+    def run():
+        seen_urls, skipped = set(), []
+        for response in responses:
+            extract_results(response, response["queries"]["request"][0]["searchTerms"], seen_urls, skipped)
+    return run
+
+
+@benchmark("feed_reader.parse_feed[rss+atom]")
+def bench_parse_feed():
+    from app.services.feed_reader import parse_feed
+    feeds = [read_fixture("feeds", name).encode("utf-8") for name in ("rss.xml", "atom.xml")]
+
+    def run():
+        for feed in feeds:
+            parse_feed(feed, ())
+    return run
+
+
+@benchmark("feed_reader.parse_feed[all seen]")
+def bench_parse_feed_seen():
+    # A re-poll where every entry is already indexed: only ids are read
+    from app.services.feed_reader import parse_feed
+    feeds = [read_fixture("feeds", name).encode("utf-8") for name in ("rss.xml", "atom.xml")]
+    seen_ids = {entry_id for feed in feeds for entry_id, _ in parse_feed(feed, ())}
+
+    def run():
+        for feed in feeds:
+            parse_feed(feed, seen_ids)
+    return run
+
+
+@benchmark("sitemap_crawler.iter_sitemap[news]")
+def bench_iter_sitemap():
+    # The streaming parse of a news sitemap, as crawled from a plain .xml body
+    import io
+    from app.services.sitemap_crawler import iter_sitemap, sitemap_stream
+    sitemap = read_fixture("sitemaps", "news.xml").encode("utf-8")
+
+    def run():
+        for _ in iter_sitemap(sitemap_stream(io.BytesIO(sitemap)), ()):
+            pass
+    return run
+
+
+@benchmark("sitemap_crawler.iter_sitemap[news.xml.gz]")
+def bench_iter_sitemap_gzip():
+    # The same sitemap served as a .gz file without Content-Encoding, so it is gunzipped while parsing
+    import gzip
+    import io
+    from app.services.sitemap_crawler import iter_sitemap, sitemap_stream
+    sitemap = gzip.compress(read_fixture("sitemaps", "news.xml").encode("utf-8"))
+
+    def run():
+        for _ in iter_sitemap(sitemap_stream(io.BytesIO(sitemap)), ()):
+            pass
+    return run
+
+
+@benchmark("result_ranker.rank_results[3k]")
+def bench_rank_results():
+    # The search corpus repeated to a few thousand results, about what a long streaming search accumulates
+    from app.services.result_ranker import rank_results
+    corpus = json.loads(read_fixture("search_corpus", "corpus.json"))
+    results = [{"title": item["title"], "url": item["link"], "source": item["displayLink"],
+                "snippet": item["snippet"], "published": None} for item in corpus["items"]] * 17
+
+    def run():
+        rank_results(results, corpus["keywords"])
+    return run
+
+
+@benchmark("keyword_tagger.tag_content[100 articles]", budget_s=0.030)
+def bench_tag_content():
+    # 100 article bodies of search corpus snippets, each followed by the kind of footer outlets append
+    from app.services.keyword_tagger import KeywordTagger
+    from app.utils import text_to_html_paragraphs
+    corpus = json.loads(read_fixture("search_corpus", "corpus.json"))
+    snippets = [item["snippet"] for item in corpus["items"]]
+    footer = "\n\nRead more: chip war coverage\n\nSign up for our export control newsletter"
+    articles = [text_to_html_paragraphs("\n\n".join(" ".join(snippets[(i + j) % len(snippets)] for j in range(4))
+                                                     for i in range(start, start + 12)) + footer)
+                for start in range(100)]
+    tagger = KeywordTagger(corpus["keywords"])
+
+    def run():
+        for content in articles:
+            tagger.tag_content(content)
+    return run
+
+
+@benchmark("web_scraper.clean_author_string")
+def bench_clean_author_string():
+    from app.services.web_scraper import clean_author_string
+    raw_authors = [
+        ["By Jane Reporter", "John Correspondent, Jane Reporter", "Updated On Aug. 5"],
+        ["Jane Reporter John Correspondent", "Jane Reporter", "John Correspondent"],
+        ["By Alex Writer, Sam Editor, Alex Writer"],
+    ]
+
+    def run():
+        for authors in raw_authors:
+            clean_author_string(authors)
+    return run
+
+
+@benchmark("utils.text_to_html_paragraphs")
+def bench_text_to_html_paragraphs():
+    from app.utils import text_to_html_paragraphs
+    # Plain text the size of a long article, paragraphs separated by blank lines
+    paragraphs = [" ".join(["The Commerce Department tightened export controls on Tuesday."] * 5)] * 60
+    text = "\n\n".join(paragraphs)
+
+    def run():
+        text_to_html_paragraphs(text)
+    return run
+
+
+@benchmark("utils.clean_and_format_html[qtextedit_paste]")
+def bench_clean_and_format_html():
+    from app.utils import clean_and_format_html
+    html = read_fixture("qtextedit", "paste_large.html")
+
+    def run():
+        clean_and_format_html(html)
+    return run
+
+
+@benchmark("web_scraper.parse_article_html")
+def bench_parse_article_html():
+    from app.services.web_scraper import parse_article_html
+    pages = load_article_pages()
+
+    def run():
+        for url, html in pages:
+            parse_article_html(url, html)
+    return run
+
+
+@benchmark("congress_scraper.parse_house_schedule")
+def bench_parse_house_schedule():
+    from app.services.congress_scraper import parse_house_schedule
+    html = read_fixture("congress", "majorityleader.html")
+    now = congress_date()
+
+    def run():
+        parse_house_schedule(html, now)
+    return run
+
+
+@benchmark("congress_scraper.parse_senate_schedule")
+def bench_parse_senate_schedule():
+    from app.services.congress_scraper import parse_senate_schedule
+    html = read_fixture("congress", "senate.html")
+    now = congress_date()
+
+    def run():
+        parse_senate_schedule(html, now)
+    return run
+
+
+@benchmark("baseline.bs4_full_parse_find[majorityleader]")
+def bench_bs4_find_house():
+    # How the congress parsers found their element before moving to lxml, kept for comparison
+    from bs4 import BeautifulSoup
+    html = read_fixture("congress", "majorityleader.html")
+
+    def run():
+        BeautifulSoup(html, 'html.parser').find('span', id='ctl00_ctl23_ctl00_Text')
+    return run
+
+
+@benchmark("baseline.bs4_full_parse_find[senate]")
+def bench_bs4_find_senate():
+    from bs4 import BeautifulSoup
+    html = read_fixture("congress", "senate.html")
+
+    def run():
+        BeautifulSoup(html, 'html.parser').find('article', id='proceedings_schedule')
+    return run
+
+
+def email_fixture():
+    """Articles and congressional activity for a 25-article email."""
+    from app.utils import text_to_html_paragraphs
+    paragraph = "The Commerce Department tightened export controls on advanced semiconductors on Tuesday. " * 6
+    articles = [{
+        "title": f"U.S. Tightens Export Controls on Advanced Chips, Part {i}",
+        "content": text_to_html_paragraphs("\n\n".join([paragraph] * 12)),
+        "source": "POLITICO",
+        "keyword": "\"export control\"",
+        "author": ["Jane Reporter", "John Correspondent"],
+        "url": f"https://www.politico.com/news/2025/08/05/export-controls-{i}",
+        "lead": "Lead paragraph." if i % 3 == 0 else None,
+        "id": str(i),
+    } for i in range(25)]
+    congress_activity = {"senate": "The Senate will convene at 10:00 a.m.", "house": "The House will meet at noon."}
+    return articles, congress_activity
+
+
+@benchmark("email_builder.render_email")
+def bench_render_email():
+    from app.services.email_builder import render_email
+    articles, congress_activity = email_fixture()
+    now = congress_date()
+
+    def run():
+        render_email(articles, congress_activity, now)
+    return run
+
+
+@benchmark("email_optimizer.optimize_email")
+def bench_optimize_email():
+    from app.services.email_builder import render_email
+    from app.services.email_optimizer import optimize_email
+    articles, congress_activity = email_fixture()
+    html = render_email(articles, congress_activity, congress_date())
+
+    def run():
+        optimize_email(html)
+    return run
+
+
+# --- Runner ---
+
+def time_benchmark(func, repeat):
+    """Times a callable. Returns per-call seconds (min, median) and the number of calls per repeat."""
+    timer = timeit.Timer(func)
+    # Pick a call count that takes at least 0.2 s per repeat, like the timeit CLI
+    number, _ = timer.autorange()
+    timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return min(timings), statistics.median(timings), number
+
+
+def git_label():
+    """Short commit hash, with -dirty appended when the working tree has changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--", "app"], cwd=ROOT_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return datetime.now().strftime("run-%Y%m%d-%H%M%S")
+    return f"{commit}-dirty" if dirty else commit
+
+
+def previous_results(label):
+    """Returns the most recently written results file other than this label, or None."""
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    candidates = [os.path.join(RESULTS_DIR, name) for name in os.listdir(RESULTS_DIR)
+                  if name.endswith(".json") and name != f"{label}.json"]
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+
+def compare(results, baseline, threshold):
+    """Prints a comparison against a baseline results dict. Returns the names of regressed benchmarks."""
+    print(f"\nCompared with {baseline['label']} ({baseline['date']}):")
+    regressions = []
+    for name, entry in results["benchmarks"].items():
+        old_entry = baseline["benchmarks"].get(name)
+        if "min_s" not in entry or not old_entry or "min_s" not in old_entry:
+            continue
+        ratio = entry["min_s"] / old_entry["min_s"]
+        marker = ""
+        if ratio > threshold:
+            marker = "  <-- REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / threshold:
+            marker = "  (faster)"
+        print(f"  {name:<48} {ratio:6.2f}x{marker}")
+    return regressions
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--label", help="name for this run's results file (default: git commit)")
+    arg_parser.add_argument("--compare", help="label of the results file to compare with (default: the previous run)")
+    arg_parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="number of timed repeats per benchmark")
+    arg_parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio reported as a regression")
+    arg_parser.add_argument("--fail-on-regression", action="store_true",
+                            help="exit with status 1 on a regression or a benchmark over its budget")
+    args = arg_parser.parse_args()
+
+    # The email template is loaded relative to the working directory, as in the app
+    os.chdir(ROOT_DIR)
+
+    label = args.label or git_label()
+    results = {
+        "label": label,
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+    over_budget = []
+
+    for name, setup in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        try:
+            func = setup()
+            # Warm-up call; also surfaces dependencies that are imported lazily inside the function
+            func()
+        except ImportError as e:
+            print(f"{name:<50} skipped ({e})")
+            results["benchmarks"][name] = {"skipped": str(e)}
+            continue
+
+        best, median, number = time_benchmark(func, args.repeat)
+        print(f"{name:<50} min {best * 1e6:10.1f} us   median {median * 1e6:10.1f} us   ({number} calls x {args.repeat})")
+        if best > BUDGETS.get(name, float("inf")):
+            print(f"  <-- OVER BUDGET of {BUDGETS[name] * 1e6:.0f} us")
+            over_budget.append(name)
+        results["benchmarks"][name] = {"min_s": best, "median_s": median, "number": number, "repeat": args.repeat}
+
+    # Pick the baseline before writing, so a re-run of the same label still compares with the previous one
+    baseline_path = os.path.join(RESULTS_DIR, f"{args.compare}.json") if args.compare else previous_results(label)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    results_path = os.path.join(RESULTS_DIR, f"{label}.json")
+    with open(results_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {os.path.relpath(results_path)}")
+
+    regressions = []
+    if baseline_path and os.path.exists(baseline_path):
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    elif args.compare:
+        print(f"No results file found for {args.compare}")
+
+    if (regressions or over_budget) and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Measures application startup cost and writes a report to reports/startup_importtime.txt.
+
+Runs main.py twice in a subprocess with the offscreen Qt platform:
+1. With `-X importtime`, to list the modules that are most expensive to import at startup.
+2. With NEWS_STARTUP_TIMING=exit, to measure the time until the main window is visible.
+
+Usage: python tools/importtime_report.py [--top N]
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_FILE = os.path.join(BASE_DIR, "reports", "startup_importtime.txt")
+
+# Target from the startup work order: main window visible in under one second on a cold start
+TARGET_MS = 1000
+
+# Matches lines like "import time:       123 |       4567 |   pandas"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def _run_app(extra_args, extra_env):
+    """Runs main.py headlessly and returns the completed process."""
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    env["NEWS_STARTUP_TIMING"] = "exit"
+    env.update(extra_env)
+    return subprocess.run(
+        [sys.executable, *extra_args, "main.py"],
+        cwd=BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+
+
+def parse_importtime(stderr):
+    """
+    Parses `-X importtime` output into a list of (module, self_us, cumulative_us, depth) tuples.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            # Each nesting level is indented by two spaces
+            depth = (len(indent) - 1) // 2
+            entries.append((module, int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def build_report(entries, window_ms, top):
+    """Formats the startup report as plain text."""
+    lines = [
+        f"Startup report generated {datetime.now().isoformat(timespec='seconds')}",
+        f"Python {sys.version.split()[0]} on {sys.platform}",
+        ""
+    ]
+
+    if window_ms is not None:
+        status = "OK" if window_ms < TARGET_MS else "OVER TARGET"
+        lines.append(f"Main window visible after {window_ms:.0f} ms (target < {TARGET_MS} ms): {status}")
+    else:
+        lines.append("Main window timing unavailable (see stderr of the timing run).")
+
+    total_us = sum(cumulative for _, _, cumulative, depth in entries if depth == 0)
+    lines.append(f"Total import time of top-level imports: {total_us / 1000:.1f} ms")
+    lines.append("")
+
+    # Top-level packages give the clearest picture of what startup pulls in
+    lines.append(f"Top {top} top-level imports by cumulative time:")
+    top_level = sorted((e for e in entries if e[3] == 0), key=lambda e: e[2], reverse=True)
+    for module, _, cumulative, _ in top_level[:top]:
+        lines.append(f"  {cumulative / 1000:9.1f} ms  {module}")
+    lines.append("")
+
+    lines.append(f"Top {top} modules by self time:")
+    for module, self_us, _, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:top]:
+        lines.append(f"  {self_us / 1000:9.1f} ms  {module}")
+
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--top", type=int, default=20, help="number of modules to list")
+    args = arg_parser.parse_args()
+
+    # Run 1: import profile
+    importtime_run = _run_app(["-X", "importtime"], {})
+    entries = parse_importtime(importtime_run.stderr)
+
+    # Run 2: wall-clock time to a visible window, without importtime overhead
+    timing_run = _run_app([], {})
+    match = re.search(r"Main window visible after (\d+) ms", timing_run.stdout)
+    window_ms = float(match.group(1)) if match else None
+
+    report = build_report(entries, window_ms, args.top)
+
+    os.makedirs(os.path.dirname(REPORT_FILE), exist_ok=True)
+    with open(REPORT_FILE, "w", encoding="utf-8") as f:
+        f.write(report)
+
+    print(report)
+    print(f"Report written to {REPORT_FILE}")
+
+
+if __name__ == "__main__":
+    main()